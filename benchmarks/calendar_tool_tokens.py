@@ -0,0 +1,47 @@
+"""
+Compares the tokens added to the conversation by `search_calendars` with the raw
+component dump it used to send and with the compact table.
+
+    python -m benchmarks.calendar_tool_tokens
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import icalendar
+import recurring_ical_events
+
+from benchmarks.feeds import generate_feed
+from src.calendar_manager.service.compact_events import compact_event, format_events
+from src.common import count_tokens, load_encoding
+from src.config import env
+
+WINDOWS = {"day": 1, "week": 7, "month": 30}
+
+
+def main() -> None:
+    load_encoding()
+    calendar = icalendar.Calendar.from_ical(generate_feed())
+    today = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    print(f"{'window':<8}{'events':>8}{'raw':>10}{'compact':>10}{'budgeted':>10}")
+    for name, days in WINDOWS.items():
+        events = {
+            "work": recurring_ical_events.of(calendar).between(
+                today, today + timedelta(days=days)
+            )
+        }
+        compact = {
+            calendar_name: [compact_event(event) for event in calendar_events]
+            for calendar_name, calendar_events in events.items()
+        }
+
+        # What ToolData(data=events) rendered before
+        raw = count_tokens(str(events))
+        full = count_tokens(format_events(compact))
+        budgeted = count_tokens(format_events(compact, env.CALENDAR_TOOL_TOKEN_BUDGET))
+
+        print(f"{name:<8}{len(events['work']):>8}{raw:>10}{full:>10}{budgeted:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Synthetic ICS feeds shaped like real Google Calendar exports, used by the
+benchmarks. They are generated with a fixed seed so results are comparable.
+"""
+
+import random
+from datetime import UTC, datetime, timedelta
+
+TIMEZONE = """BEGIN:VTIMEZONE
+TZID:America/Sao_Paulo
+X-LIC-LOCATION:America/Sao_Paulo
+BEGIN:STANDARD
+TZOFFSETFROM:-0300
+TZOFFSETTO:-0300
+TZNAME:-03
+DTSTART:19700101T000000
+END:STANDARD
+END:VTIMEZONE"""
+
+TOPICS = [
+    "Roadmap review",
+    "Customer call",
+    "Design critique",
+    "Hiring interview",
+    "Incident retro",
+    "Budget sync",
+    "Vendor demo",
+    "Architecture deep dive",
+    "Sprint planning",
+    "Quarterly business review",
+]
+PEOPLE = [
+    "ana.souza",
+    "bruno.lima",
+    "carla.mendes",
+    "diego.alves",
+    "elisa.rocha",
+    "felipe.costa",
+    "gabriela.nunes",
+    "henrique.dias",
+    "isabela.martins",
+    "joao.pereira",
+]
+
+
+def _ics_time(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%S")
+
+
+def _event(
+    rng: random.Random,
+    uid: str,
+    summary: str,
+    start: datetime,
+    minutes: int,
+    rrule: str | None = None,
+) -> str:
+    attendees = rng.sample(PEOPLE, rng.randint(2, 7))
+    lines = [
+        "BEGIN:VEVENT",
+        f"DTSTART;TZID=America/Sao_Paulo:{_ics_time(start)}",
+        f"DTEND;TZID=America/Sao_Paulo:{_ics_time(start + timedelta(minutes=minutes))}",
+    ]
+    if rrule:
+        lines.append(f"RRULE:{rrule}")
+    lines += [
+        f"DTSTAMP:{_ics_time(start)}Z",
+        f"ORGANIZER;CN={attendees[0]}:mailto:{attendees[0]}@example.com",
+        f"UID:{uid}@google.com",
+        *(
+            f"ATTENDEE;CUTYPE=INDIVIDUAL;ROLE=REQ-PARTICIPANT;PARTSTAT=ACCEPTED;CN={person}@example.com;X-NUM-GUESTS=0:mailto:{person}@example.com"
+            for person in attendees
+        ),
+        f"X-GOOGLE-CONFERENCE:https://meet.google.com/{uid[:3]}-{uid[3:7]}-{uid[7:10]}",
+        f"CREATED:{_ics_time(start - timedelta(days=14))}Z",
+        f"DESCRIPTION:{summary} with {', '.join(attendees)}.\\nAgenda: status\\, risks and next steps.\\nJoin with Google Meet: https://meet.google.com/{uid[:3]}-{uid[3:7]}-{uid[7:10]}",
+        f"LAST-MODIFIED:{_ics_time(start - timedelta(days=7))}Z",
+        f"LOCATION:{rng.choice(['', 'Room 4B', 'Main office, 3rd floor', 'https://meet.google.com'])}",
+        "SEQUENCE:0",
+        "STATUS:CONFIRMED",
+        f"SUMMARY:{summary}",
+        "TRANSP:OPAQUE",
+        "BEGIN:VALARM",
+        "ACTION:DISPLAY",
+        "DESCRIPTION:This is an event reminder",
+        "TRIGGER:-P0DT0H10M0S",
+        "END:VALARM",
+        "END:VEVENT",
+    ]
+    return "\n".join(lines)
+
+
+def generate_feed(
+    start: datetime | None = None,
+    days: int = 365,
+    meetings_per_day: int = 3,
+    seed: int = 7,
+) -> str:
+    """
+    Returns a work calendar with daily standups, weekly one-on-ones, biweekly
+    planning and `meetings_per_day` one-off meetings per working day.
+    """
+    rng = random.Random(seed)
+    start = (start or datetime.now(UTC)).replace(
+        hour=0, minute=0, second=0, microsecond=0, tzinfo=None
+    ) - timedelta(days=30)
+
+    events = [
+        _event(
+            rng,
+            "standup0001",
+            "Daily standup",
+            start + timedelta(hours=9),
+            15,
+            "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR",
+        ),
+        _event(
+            rng,
+            "oneonone001",
+            "1:1 with manager",
+            start + timedelta(hours=14),
+            30,
+            "FREQ=WEEKLY;BYDAY=TH",
+        ),
+        _event(
+            rng,
+            "planning001",
+            "Sprint planning",
+            start + timedelta(hours=10),
+            90,
+            "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO",
+        ),
+    ]
+    for day in range(days):
+        current = start + timedelta(days=day)
+        if current.weekday() >= 5:
+            continue
+        for meeting in range(meetings_per_day):
+            hour = rng.choice([10, 11, 13, 15, 16, 17])
+            events.append(
+                _event(
+                    rng,
+                    f"{day:05d}{meeting:02d}{rng.randrange(16**6):06x}",
+                    rng.choice(TOPICS),
+                    current + timedelta(hours=hour, minutes=rng.choice([0, 30])),
+                    rng.choice([30, 45, 60]),
+                )
+            )
+
+    body = "\n".join(events)
+    return (
+        "BEGIN:VCALENDAR\nPRODID:-//Google Inc//Google Calendar 70.9054//EN\n"
+        "VERSION:2.0\nCALSCALE:GREGORIAN\nMETHOD:PUBLISH\n"
+        "X-WR-CALNAME:Work\nX-WR-TIMEZONE:America/Sao_Paulo\n"
+        f"{TIMEZONE}\n{body}\nEND:VCALENDAR\n"
+    )
@@ -0,0 +1,50 @@
+"""
+Compares the peak memory and time of parsing a large feed at once with the
+streaming parser, with and without a window.
+
+    python -m benchmarks.ics_parsing
+"""
+
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+import icalendar
+
+from benchmarks.feeds import generate_feed
+from src.calendar_manager.service.ics_stream import ICS_CHUNK_SIZE, parse_ics_stream
+
+
+def measure(parse: Callable[[], icalendar.Calendar]) -> tuple[float, float, int]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    calendar = parse()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20, len(calendar.walk("VEVENT"))
+
+
+def main() -> None:
+    data = generate_feed(days=365, meetings_per_day=10).encode("utf-8")
+    chunks = [data[i : i + ICS_CHUNK_SIZE] for i in range(0, len(data), ICS_CHUNK_SIZE)]
+    today = datetime.now(UTC)
+
+    cases = {
+        "from_ical": lambda: icalendar.Calendar.from_ical(data.decode("utf-8")),
+        "stream": lambda: parse_ics_stream(iter(chunks)),
+        "stream (week)": lambda: parse_ics_stream(
+            iter(chunks), today, today + timedelta(days=7)
+        ),
+    }
+
+    print(f"feed: {len(data) / 2**20:.1f} MiB")
+    print(f"{'parser':<16}{'seconds':>10}{'peak MiB':>10}{'events':>8}")
+    for name, parse in cases.items():
+        elapsed, peak, events = measure(parse)
+        print(f"{name:<16}{elapsed:>10.2f}{peak:>10.1f}{events:>8}")
+
+
+if __name__ == "__main__":
+    main()
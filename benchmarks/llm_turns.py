@@ -0,0 +1,85 @@
+"""
+Compares the LLM calls, prompt tokens and time per turn of the agent when every
+turn decides and then answers, when tools can be marked as final, and with the
+single-call combined mode. Models are scripted, with a fixed latency per call.
+
+    python -m benchmarks.llm_turns
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from src.agent.model.graph_state import GraphState
+from src.common import count_tokens, load_encoding
+from src.config import env
+from tests.fake_chat_model import FakeChatModel
+from tests.fake_workflow import REPLY, build_workflow
+
+# Seconds per LLM call
+LATENCY = 0.2
+TURNS = {"small talk": "Thanks!", "one tool": "What's on tomorrow?"}
+MODES = {"decide + respond": False, "final tools": False, "combined": True}
+
+
+def evaluator(mode: str):
+    tomorrow = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    tomorrow += timedelta(days=1)
+
+    def decide(prompt: str) -> dict:
+        known = "Thanks" in prompt or "All events scheduled between" in prompt
+        if known:
+            if mode == "combined":
+                return {"answer": REPLY}
+            return {"tool": "generate_response", "reason": "Nothing to retrieve"}
+        search = {
+            "tool": "search_calendars",
+            "search_calendars": {
+                "start_time": tomorrow.isoformat(),
+                "end_time": (tomorrow + timedelta(days=1)).isoformat(),
+            },
+            "final": mode == "final tools",
+            "reason": "The user asks for their meetings",
+        }
+        return {"tool_request": search} if mode == "combined" else search
+
+    return decide
+
+
+def run_turn(mode: str, text: str) -> tuple[int, int, float]:
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(env, "COMBINED_RESPONSE_ENABLED", MODES[mode])
+        models = [
+            FakeChatModel(reply=evaluator(mode), latency=LATENCY),
+            FakeChatModel(reply=REPLY, latency=LATENCY),
+        ]
+        workflow = build_workflow(monkeypatch, *models)
+
+        async def run():
+            config = {"configurable": {"thread_id": str(uuid.uuid4())}}
+            state = GraphState(input=[HumanMessage(content=text)], top_k=5)
+            await workflow.compiled_graph.ainvoke(state.model_dump(), config)
+
+        started = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - started
+
+    calls = [prompt for model in models for prompt in model.calls]
+    return len(calls), sum(count_tokens(prompt) for prompt in calls), elapsed
+
+
+def main() -> None:
+    load_encoding()
+    print(f"{'turn':<12}{'mode':<18}{'calls':>6}{'tokens':>8}{'seconds':>9}")
+    for name, text in TURNS.items():
+        for mode in MODES:
+            calls, tokens, elapsed = run_turn(mode, text)
+            print(f"{name:<12}{mode:<18}{calls:>6}{tokens:>8}{elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,3 +4,4 @@ from .steps import *
 from .tool_payloads import *
 from .tool_data import *
 from .input import *
+from .prefetch_stats import *
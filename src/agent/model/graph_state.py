@@ -21,6 +21,14 @@ class GraphState(BaseModel):
     loop_threshold: int = 3
 
     tool_payloads: ToolPayloads = ToolPayloads()
+    planned_tools: list[Steps] = Field(
+        default_factory=list,
+        description="Independent tools chosen together, run at the same time by `run_tools`.",
+    )
+    final_tools: bool = Field(
+        default=False,
+        description="Whether the results of the tools chosen go straight to `generate_response`, without another decision.",
+    )
 
     function: Literal["context_incrementer", "response_generator"] = Field(
         default="response_generator",
@@ -28,6 +36,10 @@ class GraphState(BaseModel):
     )
 
     error: str | None = None
+    decision_rejected: bool = Field(
+        default=False,
+        description="Whether the error was caused by the decision itself (a missing payload, refused calendar modifications), which is then made again instead of being replayed.",
+    )
     current_retries: int = 0
     max_retries: int = 0
 
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+
+
+class PrefetchStats(BaseModel):
+    started: int = Field(
+        default=0, description="Tool calls started while the next step was decided."
+    )
+    hits: int = Field(
+        default=0, description="Prefetched results used by the tool chosen."
+    )
+    misses: int = Field(
+        default=0,
+        description="Prefetched results discarded, another tool or payload was chosen.",
+    )
+    failed: int = Field(
+        default=0, description="Prefetches that raised an error, the tool ran again."
+    )
+    hit_rate: float = Field(
+        default=0.0, description="Share of the finished prefetches that were used."
+    )
+    time_saved: float = Field(
+        default=0.0, description="Seconds of tool calls not waited on, in total."
+    )
+    time_saved_avg: float = Field(
+        default=0.0, description="Average seconds not waited on per hit."
+    )
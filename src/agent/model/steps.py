@@ -13,10 +13,12 @@ class Steps(Enum):
     search_calendars = (
         "search_calendars"  # Search the calendar for the requested information.
     )
+    find_free_slots = "find_free_slots"  # Finds free time across every calendar.
     get_current_date = (
         "get_current_date"  # Get the current date to search the calendar.
     )
     rag = "rag"  # Enhances the response by searching other sources.
+    run_tools = "run_tools"  # Runs several independent tools at the same time.
     generate_response = (
         "generate_response"  # Generates response for the given chat interface.
     )
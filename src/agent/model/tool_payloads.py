@@ -1,8 +1,10 @@
 from pydantic import BaseModel
 
+from src.calendar_manager.model.find_free_slots import FindFreeSlots
 from src.calendar_manager.model.retrieve_events import RetrieveEvents
 
 
 class ToolPayloads(BaseModel):
     search_calendars: RetrieveEvents | None = None
+    find_free_slots: FindFreeSlots | None = None
     rag_query: str | None = None
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import re
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from src.agent.model.prefetch_stats import PrefetchStats
+from src.agent.model.steps import Steps
+from src.calendar_manager.model.calendar_search_result import CalendarSearchResult
+from src.calendar_manager.model.retrieve_events import RetrieveEvents
+from src.calendar_manager.service.compact_events import cap_occurrences
+from src.calendar_manager.service.relative_dates import resolve_relative_dates
+from src.common import to_timestamp
+
+logger = logging.getLogger(__name__)
+
+_SCHEDULING = re.compile(
+    r"\b(calendars?|schedul\w*|agenda|meetings?|appointments?|events?|busy|free"
+    r"|available|availability|plans|booked|reschedul\w*|cancel\w*)\b",
+    re.IGNORECASE,
+)
+_QUESTION = re.compile(
+    r"\?|^\s*(what|who|whom|which|where|when|why|how|is|are|can|could|does|do|tell)\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class _Prefetch:
+    key: Any
+    task: asyncio.Future
+    started: float
+    finished: float | None = None
+
+
+class ToolPrefetcher:
+    """
+    Tool calls started speculatively while the tool evaluator decides, kept per
+    thread until the decision is known.
+
+    The tool chosen takes the prefetched result when its payload matches, the other
+    prefetches are dropped. Dropped calls are left to finish: they still warm the
+    caches the real calls read.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[str, dict[Steps, _Prefetch]] = {}
+        self._stats = PrefetchStats()
+
+    def start(self, thread_id: str, step: Steps, key: Any, work: Awaitable) -> None:
+        """
+        Starts `work` for `step` of the thread, described by `key` for matching.
+        """
+        pending = self._pending.setdefault(thread_id, {})
+        # Left over by an earlier turn
+        if pending.pop(step, None) is not None:
+            self._stats.misses += 1
+        prefetch = _Prefetch(key, asyncio.ensure_future(work), time.perf_counter())
+        prefetch.task.add_done_callback(lambda task: _finished(prefetch, task))
+        pending[step] = prefetch
+        self._stats.started += 1
+
+    def discard(self, thread_id: str, keep: set[Steps] | None = None) -> None:
+        """
+        Drops the prefetches of the thread for the steps not in `keep`.
+        """
+        pending = self._pending.get(thread_id, {})
+        for step in [step for step in pending if step not in (keep or set())]:
+            del pending[step]
+            self._stats.misses += 1
+            logger.debug(f"Prefetched {step} discarded for thread {thread_id}")
+        if not pending:
+            self._pending.pop(thread_id, None)
+
+    async def take(
+        self,
+        thread_id: str,
+        step: Steps,
+        accept: Callable[[Any], bool],
+        use: Callable[[Any], Any | None] = lambda result: result,
+    ) -> Any | None:
+        """
+        Returns the prefetched result of `step` when `accept` matches its key and
+        `use` can answer from it, None when the tool has to run.
+        """
+        pending = self._pending.get(thread_id, {})
+        prefetch = pending.pop(step, None)
+        if not pending:
+            self._pending.pop(thread_id, None)
+        if prefetch is None:
+            return None
+        if not accept(prefetch.key):
+            self._stats.misses += 1
+            return None
+
+        taken = time.perf_counter()
+        try:
+            result = use(await prefetch.task)
+        except Exception as e:
+            self._stats.failed += 1
+            logger.warning(f"Prefetched {step} failed, running it again: {e}")
+            return None
+        if result is None:
+            self._stats.misses += 1
+            return None
+
+        # A call made now would have taken as long as the prefetch did
+        finished = prefetch.finished or time.perf_counter()
+        self._stats.hits += 1
+        self._stats.time_saved += (finished - prefetch.started) - max(
+            0.0, finished - taken
+        )
+        logger.info(f"Prefetched {step} used for thread {thread_id}")
+        return result
+
+    def stats(self) -> PrefetchStats:
+        stats = self._stats
+        done = stats.hits + stats.misses + stats.failed
+        return stats.model_copy(
+            update={
+                "hit_rate": stats.hits / done if done else 0.0,
+                "time_saved_avg": stats.time_saved / stats.hits if stats.hits else 0.0,
+            }
+        )
+
+
+def prefetch_window(text: str, now: datetime, days: float) -> RetrieveEvents | None:
+    """
+    Returns the calendar search a message is likely to lead to: from today over
+    `days`, widened to the relative dates it mentions. None when the message does
+    not look like a scheduling question.
+    """
+    ranges = resolve_relative_dates(text, now)
+    if not ranges and not _SCHEDULING.search(text):
+        return None
+    start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    end = start + timedelta(days=days)
+    for relative in ranges:
+        start, end = min(start, relative.start), max(end, relative.end)
+    return RetrieveEvents(start_time=start, end_time=end)
+
+
+def is_knowledge_question(text: str) -> bool:
+    """
+    Whether a message looks like a question for the knowledge base rather than the
+    calendars.
+    """
+    return bool(_QUESTION.search(text)) and not _SCHEDULING.search(text)
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(text.casefold().split()).strip(" ?!.")
+
+
+def covers(prefetched: RetrieveEvents, payload: RetrieveEvents) -> bool:
+    return (
+        prefetched.start_time <= payload.start_time
+        and payload.end_time <= prefetched.end_time
+    )
+
+
+def narrow_search_result(
+    result: CalendarSearchResult,
+    payload: RetrieveEvents,
+    series_limit: int | None = None,
+) -> CalendarSearchResult | None:
+    """
+    Returns the occurrences of a wider search within the window of `payload`, capped
+    as a search of that window would be. None when the wider search is incomplete.
+    """
+    if result.truncated or result.errors:
+        return None
+    start, end = payload.start_time.timestamp(), payload.end_time.timestamp()
+    return CalendarSearchResult(
+        events={
+            name: cap_occurrences(
+                (
+                    event
+                    for event in events
+                    if to_timestamp(event.end) > start
+                    and to_timestamp(event.start) < end
+                ),
+                series_limit=series_limit,
+            )
+            for name, events in result.events.items()
+        }
+    )
+
+
+def _finished(prefetch: _Prefetch, task: asyncio.Future) -> None:
+    prefetch.finished = time.perf_counter()
+    # Dropped prefetches are never awaited
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug(f"Prefetch failed: {task.exception()}")
@@ -1,7 +1,10 @@
+import asyncio
 import logging
 from collections import Counter
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import partial
 from typing import cast
+from zoneinfo import ZoneInfo
 
 from fastapi import HTTPException
 from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
@@ -18,13 +21,38 @@ from src.agent.model.chat_interface import ChatInterface
 from src.agent.model.graph_state import GraphState
 from src.agent.model.steps import Steps
 from src.agent.model.tool_data import ToolData
+from src.agent.prefetch import (
+    ToolPrefetcher,
+    covers,
+    is_knowledge_question,
+    narrow_search_result,
+    normalize_query,
+    prefetch_window,
+)
 from src.calendar_manager.main import CalendarManager
+from src.calendar_manager.model.calendar_mutation_result import (
+    CalendarMutationResult,
+)
+from src.calendar_manager.model.calendar_preflight_problem import (
+    CalendarPreflightProblem,
+)
 from src.calendar_manager.model.retrieve_events import RetrieveEvents
+from src.calendar_manager.service.compact_events import format_events, page_events
+from src.calendar_manager.service.free_busy import find_free_slots, format_free_busy
+from src.calendar_manager.service.relative_dates import (
+    format_temporal_context,
+    resolve_relative_dates,
+)
+from src.calendar_outbox import CalendarOutbox, describe_outbox_entry, outbox_key
+from src.calendar_outbox.model import CalendarOutboxEntry
 from src.config import env
 from src.error_handler import ErrorHandler
 from src.evaluate_tools.main import EvaluateTools
+from src.evaluate_tools.model import ToolConfig
 from src.generate_response import ResponseGenerator
 from src.generate_response.model.response import BaseLLMResponse
+from src.intent_router import IntentRouter
+from src.intent_router.model import Intent
 from src.summarize.main import Summarizer
 from src.system_prompt.main import SystemPromptBuilder
 from src.vector_manager.main import VectorManager
@@ -43,20 +71,31 @@ class Workflow(SystemPromptBuilder):
     tool_evaluator: EvaluateTools
     response_generator: ResponseGenerator
     calendar_manager: CalendarManager
+    calendar_outbox: CalendarOutbox | None
     graph: StateGraph
     compiled_graph: CompiledStateGraph | None
     memory: BaseCheckpointSaver | None
     vector_manager: VectorManager
     summarizer: Summarizer
+    prefetcher: ToolPrefetcher
+    intent_router: IntentRouter
 
     def __init__(self) -> None:
         super().__init__()
         self.tool_evaluator = EvaluateTools()
         self.response_generator = ResponseGenerator()
         self.calendar_manager = CalendarManager()
+        self.calendar_outbox = None
+        if env.CALENDAR_OUTBOX_ENABLED:
+            self.calendar_outbox = CalendarOutbox(
+                env.CALENDAR_OUTBOX_PATH, self.calendar_manager
+            )
+            self.calendar_outbox.on_finished = self.report_outbox_entry
         self.vector_manager = VectorManager()
         self.error_handler = ErrorHandler()
         self.summarizer = Summarizer()
+        self.prefetcher = ToolPrefetcher()
+        self.intent_router = IntentRouter()
 
         self.graph = self._load_graph()
         self.memory = None
@@ -72,7 +111,7 @@ class Workflow(SystemPromptBuilder):
         self.memory = await self._load_memory()
         self.compiled_graph = self.graph.compile(checkpointer=self.memory)
 
-    def context_incrementer(self, state: GraphState) -> GraphState:
+    async def context_incrementer(self, state: GraphState) -> GraphState:
         state.step_history.append(Steps.context_incrementer)
         state.messages = state.input
 
@@ -84,15 +123,28 @@ class Workflow(SystemPromptBuilder):
         return state
 
     # Build the context for the AI.
-    def context_builder(self, state: GraphState) -> GraphState:
+    async def context_builder(self, state: GraphState) -> GraphState:
         state.step_history.append(Steps.context_builder)
 
+        context: list[BaseMessage] = []
+
         # Check if the universal context have been passed
-        if len(state.messages) > 2:
-            return state
+        if len(state.messages) <= 2:
+            context.append(SystemMessage(content=self.prompt))
+
+        # The date and the windows of "tomorrow", "next Monday"... come with every
+        # turn, so calendars can be searched without asking for the date first
+        if env.TEMPORAL_CONTEXT_ENABLED:
+            now = datetime.now(ZoneInfo(env.USER_TIMEZONE))
+            ranges = resolve_relative_dates(self._input_text(state.input), now)
+            context.append(
+                BaseMessage(
+                    content=format_temporal_context(now, ranges), type="calendar"
+                )
+            )
 
-        agent_context = SystemMessage(content=self.prompt)
-        state.messages = [agent_context]
+        if context:
+            state.messages = context
 
         return state
 
@@ -107,7 +159,7 @@ class Workflow(SystemPromptBuilder):
             raise ValueError("Graph config unavailable.")
 
         try:
-            self.summarizer.summarize_conditionally(state, config)
+            await self.summarizer.asummarize_conditionally(state, config)
         except Exception as e:
             state.error = str(e)
             state.next_step = Steps.error_handler
@@ -115,14 +167,16 @@ class Workflow(SystemPromptBuilder):
         return state
 
     # Build the context for the AI.
-    def get_current_date(self, state: GraphState) -> GraphState:
+    async def get_current_date(self, state: GraphState) -> GraphState:
         state.step_history.append(Steps.get_current_date)
 
+        now = datetime.now(ZoneInfo(env.USER_TIMEZONE))
         date_context = BaseMessage(
-            content=f"Current date is: {str(datetime.now())}", type="calendar"
+            content=format_temporal_context(now, []), type="calendar"
         )
 
         state.messages = [date_context]
+        state.next_step = self._after_tools(state)
 
         return state
 
@@ -139,14 +193,16 @@ class Workflow(SystemPromptBuilder):
         try:
             match state.chat_interface:
                 case ChatInterface.api:
-                    response = self.response_generator.generate_response(
+                    response = await self.response_generator.agenerate_response(
                         config,
                         state.messages,
                     )
                 case ChatInterface.whatsapp:
-                    response = self.response_generator.generate_whatsapp_response(
-                        config,
-                        state.messages,
+                    response = (
+                        await self.response_generator.agenerate_whatsapp_response(
+                            config,
+                            state.messages,
+                        )
                     )
                 case ChatInterface.websocket:
                     # Retrieve websocket from the config you passed earlier
@@ -163,23 +219,20 @@ class Workflow(SystemPromptBuilder):
                         )
                     )
 
-            state.next_step = Steps(response.next_step)
-
-            ai_message = AIMessage(content=[response.model_dump()])
-            state.response = ai_message
-            state.messages = [ai_message]
+            self._set_response(state, response)
         except Exception as e:
             state.error = str(e)
             state.next_step = Steps.error_handler
 
         return state
 
-    def decide_next_step(
+    async def decide_next_step(
         self,
         state: GraphState,
         config: RunnableConfig | None = None,
     ) -> GraphState:
         state.step_history.append(Steps.evaluate_tools)
+        thread_id = self._thread_id(config)
         try:
             # Preventing double injection of context and loops
             if self._is_looping(
@@ -194,67 +247,211 @@ class Workflow(SystemPromptBuilder):
             #     state.previous_step = Steps.evaluate_tools
             #     raise ValueError("Loop detected: Tool already used.")
 
-            response = self.tool_evaluator.decide_next_step(
-                config,
-                state.messages,  # Verify need
-            )
-
-            reasoning_message = BaseMessage(
-                type="reasoning", content=[response.model_dump()]
-            )
-            state.messages = [reasoning_message]
+            # A decision that caused the error is made again, a failed tool is retried
+            if (
+                state.step_history[-2:-1] == [Steps.error_handler]
+                and state.decision_rejected
+            ):
+                self.tool_evaluator.forget_decision(state.messages)
+            state.decision_rejected = False
+
+            first_decision = state.step_history.count(Steps.evaluate_tools) == 1
+            # Greetings, thanks and confirmations need no tool
+            routed = None
+            if first_decision and (
+                env.INTENT_ROUTER_ENABLED or env.INTENT_ROUTER_LOG_ONLY
+            ):
+                routed = self._route_intent(state)
+                if not env.INTENT_ROUTER_ENABLED:
+                    # Only logged until the router is tuned
+                    routed = None
+
+            # The likely tool starts while the model decides, on the first decision
+            if (
+                env.TOOL_PREFETCH_ENABLED
+                and thread_id is not None
+                and first_decision
+                and routed is None
+            ):
+                self._prefetch(thread_id, state)
 
-            state.next_step = Steps(response.tool)
-            calendar_manager_payload = response.search_calendars
-            if calendar_manager_payload is not None:
-                retrieve_events_obj = RetrieveEvents.model_validate(
-                    calendar_manager_payload
+            if routed is not None:
+                self._plan_tools(state, routed)
+            elif (
+                env.COMBINED_RESPONSE_ENABLED
+                and state.chat_interface == ChatInterface.api
+            ):
+                decision = await self.tool_evaluator.adecide_or_respond(
+                    config,
+                    state.messages,
+                )
+                if decision.answer is not None:
+                    # Answered in the same call, no response generation needed
+                    self._set_response(state, decision.answer)
+                else:
+                    self._plan_tools(state, cast(ToolConfig, decision.tool_request))
+            else:
+                response = await self.tool_evaluator.adecide_next_step(
+                    config,
+                    state.messages,  # Verify need
                 )
-                state.tool_payloads.search_calendars = retrieve_events_obj
-            rag_query = response.rag_query
-            if rag_query is not None:
-                state.tool_payloads.rag_query = rag_query
+                self._plan_tools(state, response)
 
         except Exception as e:
             state.error = str(e)
             state.next_step = Steps.error_handler
 
+        if thread_id is not None:
+            self.prefetcher.discard(
+                thread_id, keep={*state.planned_tools, state.next_step}
+            )
+
         return state
 
-    def search_calendars(self, state: GraphState) -> GraphState:
+    async def search_calendars(
+        self,
+        state: GraphState,
+        config: RunnableConfig | None = None,
+    ) -> GraphState:
         state.step_history.append(Steps.search_calendars)
         try:
             payload = state.tool_payloads.search_calendars
             if not payload:
+                state.decision_rejected = True
                 raise ValueError("No payload provided for calendar manager.")
 
-            events = self.calendar_manager.retrieve_events(payload)
+            result = None
+            if (thread_id := self._thread_id(config)) is not None:
+                result = await self.prefetcher.take(
+                    thread_id,
+                    Steps.search_calendars,
+                    partial(covers, payload=payload),
+                    partial(
+                        narrow_search_result,
+                        payload=payload,
+                        series_limit=env.CALENDAR_SERIES_MAX_OCCURRENCES,
+                    ),
+                )
+            if result is None:
+                result = await self.calendar_manager.aretrieve_events(
+                    payload, series_limit=env.CALENDAR_SERIES_MAX_OCCURRENCES
+                )
+            if result.errors and not result.events:
+                raise RuntimeError(f"Could not retrieve any calendar: {result.errors}")
+
+            # Wide windows list every series once, and come back one page at a time
+            result = page_events(
+                result,
+                payload.page,
+                env.CALENDAR_PAGE_SIZE,
+                collapse_after=timedelta(days=env.CALENDAR_SERIES_COLLAPSE_DAYS),
+                window=payload.end_time - payload.start_time,
+            )
+
+            # The LLM only gets a compact table, within the token budget
+            events = format_events(result.events, env.CALENDAR_TOOL_TOKEN_BUDGET)
+            label = f"All events scheduled between {payload.start_time} and {payload.end_time} retrieved at {Steps.search_calendars}"
+            if result.pages > 1:
+                label += f", page {result.page} of {result.pages}"
+                if result.page < result.pages:
+                    label += (
+                        f". Search again with page {result.page + 1} for more events"
+                    )
 
-            calendar_response = BaseMessage(
-                content=[
-                    # This are the different ways I tested to attach the calendar data. Most of them give serialization errors.
-                    # "Data retrieved from the calendar", events,
-                    # {"data": events, "label": "Data retrieved from the calendar"},
-                    # f"Data retrieved from the calendar: {events}", # This one works
+            content = [
+                # This are the different ways I tested to attach the calendar data. Most of them give serialization errors.
+                # "Data retrieved from the calendar", events,
+                # {"data": events, "label": "Data retrieved from the calendar"},
+                # f"Data retrieved from the calendar: {events}", # This one works
+                str(
+                    ToolData(
+                        data=events,
+                        label=label,
+                    )
+                ),
+            ]
+            if result.truncated:
+                content.append(
                     str(
                         ToolData(
-                            data=events,
-                            label=f"All events scheduled between {payload.start_time} and {payload.end_time} retrieved at {Steps.search_calendars}",
+                            data=result.truncated,
+                            label="Calendars with too many events in this window, only the earliest are listed. Search a shorter window for the rest",
                         )
-                    ),
-                ],
-                type="calendar",
-            )
+                    )
+                )
+            if result.errors:
+                content.append(
+                    str(
+                        ToolData(
+                            data=result.errors,
+                            label="Calendars that could not be retrieved, their events are missing",
+                        )
+                    )
+                )
+
+            calendar_response = BaseMessage(content=content, type="calendar")
             state.messages = [calendar_response]
 
-            state.next_step = Steps.evaluate_tools
+            # The next page needs another decision
+            state.next_step = (
+                Steps.evaluate_tools
+                if result.page < result.pages
+                else self._after_tools(state)
+            )
         except Exception as e:
             state.error = str(e)
             state.next_step = Steps.error_handler
 
         return state
 
-    def modify_calendar(self, state: GraphState) -> GraphState:
+    async def find_free_slots(self, state: GraphState) -> GraphState:
+        state.step_history.append(Steps.find_free_slots)
+        try:
+            payload = state.tool_payloads.find_free_slots
+            if not payload:
+                state.decision_rejected = True
+                raise ValueError("No payload provided for the free slots finder.")
+
+            result = await self.calendar_manager.aretrieve_events(
+                RetrieveEvents(start_time=payload.start_time, end_time=payload.end_time)
+            )
+            if result.errors and not result.events:
+                raise RuntimeError(f"Could not retrieve any calendar: {result.errors}")
+
+            # The LLM gets a handful of slots instead of every event
+            free_busy = find_free_slots(result.events, payload)
+
+            content = [
+                str(
+                    ToolData(
+                        data=format_free_busy(free_busy, payload.duration_minutes),
+                        label=f"Free time between {payload.start_time} and {payload.end_time} ({payload.timezone}, working hours {payload.work_day_start}-{payload.work_day_end}) retrieved at {Steps.find_free_slots}",
+                    )
+                ),
+            ]
+            if result.errors:
+                content.append(
+                    str(
+                        ToolData(
+                            data=result.errors,
+                            label="Calendars that could not be retrieved, their events are not considered",
+                        )
+                    )
+                )
+
+            state.messages = [BaseMessage(content=content, type="calendar")]
+            state.next_step = self._after_tools(state)
+        except Exception as e:
+            state.error = str(e)
+            state.next_step = Steps.error_handler
+
+        return state
+
+    async def modify_calendar(
+        self,
+        state: GraphState,
+        config: RunnableConfig | None = None,
+    ) -> GraphState:
         state.step_history.append(Steps.modify_calendar)
         try:
             state.next_step = Steps.end
@@ -269,12 +466,65 @@ class Workflow(SystemPromptBuilder):
             if payloads is None:
                 return state
 
+            problems: list[CalendarPreflightProblem] = []
+            if env.CALENDAR_PREFLIGHT_ENABLED:
+                # Checked against the local copies, nothing is sent to the provider
+                problems = await asyncio.to_thread(
+                    self.calendar_manager.preflight,
+                    payloads.create_events or [],
+                    payloads.update_events or [],
+                    payloads.delete_events or [],
+                )
+                if any(
+                    problem.kind != "overlap" or env.CALENDAR_REJECT_OVERLAPS
+                    for problem in problems
+                ):
+                    logger.info(f"Calendar modifications refused: {problems}")
+                    # Re-planned with the problems in hand
+                    state.messages = [
+                        self._preflight_message(
+                            problems, "Calendar modifications not applied"
+                        )
+                    ]
+                    state.error = "Calendar modifications refused: " + " ".join(
+                        problem.message for problem in problems
+                    )
+                    state.decision_rejected = True
+                    state.next_step = Steps.error_handler
+                    return state
+
+            if self.calendar_outbox is not None:
+                # Applied in the background, the outcome is added to the thread later
+                if config is None:
+                    raise ValueError("Graph config unavailable.")
+                thread_id = config["configurable"]["thread_id"]
+                entry = await asyncio.to_thread(
+                    self.calendar_outbox.enqueue,
+                    thread_id,
+                    payloads,
+                    outbox_key(thread_id, message.id, payloads),
+                )
+                state.messages = [
+                    BaseMessage(
+                        content=f"Calendar modifications queued as {entry.key}, "
+                        f"their outcome will follow.",
+                        type="calendar",
+                    )
+                ]
+                if problems:
+                    state.messages.append(self._preflight_message(problems, "Warnings"))
+                return state
+
             modification_logs: list[BaseMessage] = []
+            results: list[CalendarMutationResult] = []
             # confirmations = llm_response.action_confirmations
 
             # Execute create
             if payloads.create_events:  # and confirmations.create_events:
-                created = self.calendar_manager.create_events(payloads.create_events)
+                created = await self.calendar_manager.acreate_events(
+                    payloads.create_events
+                )
+                results.extend(created)
                 calendar_message = BaseMessage(
                     content=f"Created events: {created}",
                     type="calendar",
@@ -283,7 +533,10 @@ class Workflow(SystemPromptBuilder):
 
             # Execute update
             if payloads.update_events:  # and confirmations.update_events:
-                updated = self.calendar_manager.update_events(payloads.update_events)
+                updated = await self.calendar_manager.aupdate_events(
+                    payloads.update_events
+                )
+                results.extend(updated)
                 calendar_message = BaseMessage(
                     content=f"Updated events: {updated}",
                     type="calendar",
@@ -292,32 +545,82 @@ class Workflow(SystemPromptBuilder):
 
             # Execute delete
             if payloads.delete_events:  # and confirmations.delete_events:
-                self.calendar_manager.delete_events(payloads.delete_events)
+                deleted = await self.calendar_manager.adelete_events(
+                    payloads.delete_events
+                )
+                results.extend(deleted)
                 calendar_message = BaseMessage(
-                    content=f"Deleted events: {payloads.delete_events}",
+                    content=f"Deleted events: {deleted}",
                     type="calendar",
                 )
                 modification_logs.append(calendar_message)
 
+            if problems:
+                modification_logs.append(self._preflight_message(problems, "Warnings"))
+
             if len(modification_logs) > 0:
                 state.messages = modification_logs
+
+            # The logs keep the modifications that succeeded, so they are not repeated
+            failed = [result for result in results if not result.ok]
+            if failed:
+                state.error = "Calendar modifications failed: " + "; ".join(
+                    f"{result.action} of '{result.event_id or 'a new event'}': {result.error}"
+                    for result in failed
+                )
+                state.next_step = Steps.error_handler
         except Exception as e:
             state.error = str(e)
             state.next_step = Steps.error_handler
 
         return state
 
-    def rag(self, state: GraphState) -> GraphState:
+    async def report_outbox_entry(self, entry: CalendarOutboxEntry) -> bool:
+        """
+        Adds the outcome of queued calendar modifications to their thread. Waits
+        while a turn of the thread is running, so the history stays linear.
+        """
+        if self.compiled_graph is None:
+            return False
+        config = RunnableConfig(configurable={"thread_id": entry.thread_id})
+        snapshot = await self.compiled_graph.aget_state(config)
+        if snapshot.next:
+            return False
+        await self.compiled_graph.aupdate_state(
+            config,
+            {
+                "messages": [
+                    BaseMessage(content=describe_outbox_entry(entry), type="calendar")
+                ]
+            },
+            as_node=str(Steps.summarize),
+        )
+        return True
+
+    async def rag(
+        self,
+        state: GraphState,
+        config: RunnableConfig | None = None,
+    ) -> GraphState:
         state.step_history.append(Steps.rag)
         try:
             query = state.tool_payloads.rag_query
             if not isinstance(query, str):
+                state.decision_rejected = True
                 raise ValueError("Expected the query to be a string.")
 
             # Retrieve relevant documents from the vectorstore
-            retrieved_docs = self.vector_manager.retrieve(
-                query=query, top_k=state.top_k
-            )
+            retrieved_docs = None
+            if (thread_id := self._thread_id(config)) is not None:
+                retrieved_docs = await self.prefetcher.take(
+                    thread_id,
+                    Steps.rag,
+                    lambda key: key == (normalize_query(query), state.top_k),
+                )
+            if retrieved_docs is None:
+                retrieved_docs = await self.vector_manager.aretrieve(
+                    query=query, top_k=state.top_k
+                )
 
             # Create a new Rag Message with the retrieved documents
             documents_message = BaseMessage(
@@ -334,7 +637,7 @@ class Workflow(SystemPromptBuilder):
 
             # Update the messages in state
             state.messages = [documents_message]
-            state.next_step = Steps.evaluate_tools
+            state.next_step = self._after_tools(state)
 
         except Exception as e:
             logger.error(f"Error during RAG retrieval: {str(e)}", exc_info=True)
@@ -343,7 +646,57 @@ class Workflow(SystemPromptBuilder):
 
         return state
 
-    def handle_error(self, state: GraphState) -> GraphState:
+    async def run_tools(
+        self,
+        state: GraphState,
+        config: RunnableConfig | None = None,
+    ) -> GraphState:
+        """
+        Runs the planned tools concurrently, each on its own copy of the state, and
+        joins their messages. A tool that fails does not discard the results of the
+        others.
+        """
+        state.step_history.append(Steps.run_tools)
+        tools = {
+            Steps.search_calendars: partial(self.search_calendars, config=config),
+            Steps.find_free_slots: self.find_free_slots,
+            Steps.get_current_date: self.get_current_date,
+            Steps.rag: partial(self.rag, config=config),
+        }
+        planned = state.planned_tools
+        branches = await asyncio.gather(
+            *(
+                tools[step](
+                    state.model_copy(
+                        update={"messages": [], "step_history": [], "error": None}
+                    )
+                )
+                for step in planned
+            )
+        )
+
+        messages: list[BaseMessage] = []
+        errors: list[str] = []
+        for step, branch in zip(planned, branches, strict=True):
+            state.step_history.extend(branch.step_history)
+            if branch.error is not None:
+                errors.append(f"{step.value}: {branch.error}")
+                state.decision_rejected |= branch.decision_rejected
+            else:
+                messages.extend(branch.messages)
+
+        state.planned_tools = []
+        state.messages = messages
+        if errors:
+            state.error = "; ".join(errors)
+            state.next_step = Steps.error_handler
+        elif all(branch.next_step == Steps.generate_response for branch in branches):
+            state.next_step = Steps.generate_response
+        else:
+            state.next_step = Steps.evaluate_tools
+        return state
+
+    async def handle_error(self, state: GraphState) -> GraphState:
         state.step_history.append(Steps.error_handler)
         if state.error is None:
             raise ValueError("No error to handle.")
@@ -361,6 +714,136 @@ class Workflow(SystemPromptBuilder):
 
         return state
 
+    def _preflight_message(
+        self, problems: list[CalendarPreflightProblem], outcome: str
+    ) -> BaseMessage:
+        return BaseMessage(
+            content=[
+                str(
+                    ToolData(
+                        data=[problem.model_dump() for problem in problems],
+                        label=f"{outcome}, problems found in the calendar modifications at {Steps.modify_calendar}",
+                    )
+                )
+            ],
+            type="calendar",
+        )
+
+    def _plan_tools(self, state: GraphState, response: ToolConfig) -> None:
+        reasoning_message = BaseMessage(
+            type="reasoning", content=[response.model_dump()]
+        )
+        state.messages = [reasoning_message]
+
+        # The results of final tools are answered without another decision
+        state.final_tools = response.final
+        tools = list(dict.fromkeys(response.tools or []))
+        if len(tools) > 1:
+            # Independent tools run at the same time, then the next decision
+            state.planned_tools = [Steps(tool) for tool in tools]
+            state.next_step = Steps.run_tools
+        else:
+            state.next_step = Steps(response.tool)
+        calendar_manager_payload = response.search_calendars
+        if calendar_manager_payload is not None:
+            retrieve_events_obj = RetrieveEvents.model_validate(
+                calendar_manager_payload
+            )
+            state.tool_payloads.search_calendars = retrieve_events_obj
+        if response.find_free_slots is not None:
+            state.tool_payloads.find_free_slots = response.find_free_slots
+        rag_query = response.rag_query
+        if rag_query is not None:
+            state.tool_payloads.rag_query = rag_query
+
+    def _set_response(self, state: GraphState, response: BaseLLMResponse) -> None:
+        state.next_step = Steps(response.next_step)
+
+        ai_message = AIMessage(content=[response.model_dump()])
+        state.response = ai_message
+        state.messages = [ai_message]
+
+    def _route_intent(self, state: GraphState) -> ToolConfig | None:
+        route = self.intent_router.classify(self._input_text(state.input))
+        if route is None:
+            return None
+        # Without a proposed change, a "yes" may ask for something that needs tools
+        if route.intent == Intent.confirmation and not self._proposes_changes(
+            state.messages
+        ):
+            logger.info("Confirmation without proposed changes, left to the evaluator")
+            return None
+        # Answering a question of the last response may need a tool
+        if route.intent == Intent.acknowledgement and self._asks_question(
+            state.messages
+        ):
+            logger.info("Acknowledgement of a question, left to the evaluator")
+            return None
+        logger.info(
+            f"Route of {route.intent.value} ({route.confidence:.2f}, {route.source}): {Steps.generate_response}"
+        )
+        return ToolConfig(
+            tool="generate_response",
+            reason=f"Routed as {route.intent.value} by {route.source} with confidence {route.confidence:.2f}",
+        )
+
+    def _proposes_changes(self, messages: list[BaseMessage]) -> bool:
+        # Whether the last response planned calendar modifications
+        for message in reversed(messages):
+            if message.type != "ai":
+                continue
+            content = message.content[0] if message.content else {}
+            payloads = (
+                content.get("action_payloads") if isinstance(content, dict) else None
+            )
+            return bool(payloads) and any(payloads.values())
+        return False
+
+    def _asks_question(self, messages: list[BaseMessage]) -> bool:
+        # Whether the last response asked the user something
+        for message in reversed(messages):
+            if message.type != "ai":
+                continue
+            content = message.content[0] if message.content else {}
+            response = content.get("response") if isinstance(content, dict) else None
+            return isinstance(response, str) and "?" in response
+        return False
+
+    def _after_tools(self, state: GraphState) -> Steps:
+        if state.final_tools:
+            return Steps.generate_response
+        return Steps.evaluate_tools
+
+    def _prefetch(self, thread_id: str, state: GraphState) -> None:
+        text = self._input_text(state.input)
+        now = datetime.now(ZoneInfo(env.USER_TIMEZONE))
+        if payload := prefetch_window(text, now, env.TOOL_PREFETCH_DAYS):
+            # Every occurrence, the window is narrowed to the one chosen
+            self.prefetcher.start(
+                thread_id,
+                Steps.search_calendars,
+                payload,
+                self.calendar_manager.aretrieve_events(payload),
+            )
+        elif self.vector_manager is not None and is_knowledge_question(text):
+            self.prefetcher.start(
+                thread_id,
+                Steps.rag,
+                (normalize_query(text), state.top_k),
+                self.vector_manager.aretrieve(query=text, top_k=state.top_k),
+            )
+
+    def _thread_id(self, config: RunnableConfig | None) -> str | None:
+        if config is None:
+            return None
+        return config.get("configurable", {}).get("thread_id")
+
+    def _input_text(self, messages: list[BaseMessage]) -> str:
+        # Text written by the user in this turn
+        return "\n".join(
+            message.text() for message in messages if message.type == "human"
+        )
+
     def _is_looping(self, step_history: list[Steps], threshold: int) -> bool:
         counts = Counter(step_history)
         most_common_step, count = counts.most_common(1)[0]
@@ -377,9 +860,11 @@ class Workflow(SystemPromptBuilder):
         graph.add_node(str(Steps.generate_response), self.generate_response)
         graph.add_node(str(Steps.summarize), self.generate_summary)
         graph.add_node(str(Steps.search_calendars), self.search_calendars)
+        graph.add_node(str(Steps.find_free_slots), self.find_free_slots)
         graph.add_node(str(Steps.get_current_date), self.get_current_date)
         graph.add_node(str(Steps.modify_calendar), self.modify_calendar)
         graph.add_node(str(Steps.rag), self.rag)
+        graph.add_node(str(Steps.run_tools), self.run_tools)
         graph.add_node(str(Steps.error_handler), self.handle_error)
 
         # Setup edges
@@ -398,18 +883,40 @@ class Workflow(SystemPromptBuilder):
             lambda x: x.next_step,
             {
                 Steps.search_calendars: str(Steps.search_calendars),
+                Steps.find_free_slots: str(Steps.find_free_slots),
                 Steps.get_current_date: str(Steps.get_current_date),
                 Steps.rag: str(Steps.rag),
+                Steps.run_tools: str(Steps.run_tools),
                 Steps.generate_response: str(Steps.generate_response),
+                # Answered by the decision itself
+                Steps.modify_calendar: str(Steps.modify_calendar),
+                Steps.end: str(Steps.summarize),
                 Steps.error_handler: str(Steps.error_handler),
             },
         )
-        graph.add_edge(str(Steps.get_current_date), str(Steps.evaluate_tools))
+        graph.add_conditional_edges(
+            str(Steps.get_current_date),
+            lambda x: x.next_step,
+            {
+                Steps.evaluate_tools: str(Steps.evaluate_tools),
+                Steps.generate_response: str(Steps.generate_response),
+            },
+        )
         graph.add_conditional_edges(
             str(Steps.search_calendars),
             lambda x: x.next_step,
             {
                 Steps.evaluate_tools: str(Steps.evaluate_tools),
+                Steps.generate_response: str(Steps.generate_response),
+                Steps.error_handler: str(Steps.error_handler),
+            },
+        )
+        graph.add_conditional_edges(
+            str(Steps.find_free_slots),
+            lambda x: x.next_step,
+            {
+                Steps.evaluate_tools: str(Steps.evaluate_tools),
+                Steps.generate_response: str(Steps.generate_response),
                 Steps.error_handler: str(Steps.error_handler),
             },
         )
@@ -418,6 +925,16 @@ class Workflow(SystemPromptBuilder):
             lambda x: x.next_step,
             {
                 Steps.evaluate_tools: str(Steps.evaluate_tools),
+                Steps.generate_response: str(Steps.generate_response),
+                Steps.error_handler: str(Steps.error_handler),
+            },
+        )
+        graph.add_conditional_edges(
+            str(Steps.run_tools),
+            lambda x: x.next_step,
+            {
+                Steps.evaluate_tools: str(Steps.evaluate_tools),
+                Steps.generate_response: str(Steps.generate_response),
                 Steps.error_handler: str(Steps.error_handler),
             },
         )
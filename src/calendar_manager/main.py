@@ -1,17 +1,62 @@
+import asyncio
 import logging
+import threading
+from collections.abc import Mapping
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
+import httpx
 import icalendar
 import recurring_ical_events
 import requests
 from icalendar.cal import Component
 
-from src.calendar_manager.model import RetrieveEvents
+from src.calendar_manager.model import (
+    CalendarMutationResult,
+    CalendarPreflightProblem,
+    CalendarSearchResult,
+    CompactEvent,
+    RetrieveEvents,
+)
 from src.calendar_manager.model.create_google_event import CreateGoogleCalendarEvent
 from src.calendar_manager.model.delete_event import DeleteEvent
 from src.calendar_manager.model.update_event import UpdateEvent
-from src.calendar_manager.service import initialize_calendar
-from src.calendar_manager.service.main import create_event, delete_event, update_event
+from src.calendar_manager.service import (
+    initialize_async_calendar,
+    initialize_calendar,
+)
+from src.calendar_manager.service.caldav import CALDAV_SCHEME, caldav_calendar_query
+from src.calendar_manager.service.calendar_worker import expand_window
+from src.calendar_manager.service.event_index import EventIndex
+from src.calendar_manager.service.event_store import EventStore
+from src.calendar_manager.service.feed_cache import FeedCache
+from src.calendar_manager.service.google_sync import (
+    GOOGLE_SCHEME,
+    GoogleCalendarSync,
+    google_calendar_id,
+)
+from src.calendar_manager.service.google_watch import SYNC_STATE, GoogleCalendarWatch
+from src.calendar_manager.service.ics_stream import ICS_CHUNK_SIZE, parse_ics_stream
+from src.calendar_manager.service.main import (
+    acreate_events,
+    adelete_events,
+    aupdate_events,
+    create_events,
+    delete_events,
+    update_events,
+)
+from src.calendar_manager.service.preflight import (
+    feed_event_ids,
+    planned_window,
+    preflight_mutations,
+)
+from src.calendar_manager.service.worker_pool import CalendarWorkerPool
+from src.calendar_manager.service.write_through import (
+    changes_ics,
+    event_uids,
+    is_written_calendar,
+    written_changes,
+)
 from src.config import env
 from src.config.calendar import load_data
 
@@ -21,13 +66,58 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
 )
 
+# Seconds between two checks of the push notification channels
+_WATCH_CHECK_INTERVAL = 60
+
 
 class CalendarManager:
     calendars: dict[str, str]
+    http_client: httpx.AsyncClient | None
+    feed_cache: FeedCache
+    event_indexes: dict[str, EventIndex]
+    event_store: EventStore | None
+    google_syncs: dict[str, GoogleCalendarSync]
+    worker_pool: CalendarWorkerPool
+    calendar_watch: GoogleCalendarWatch | None
 
-    def __init__(self) -> None:
-        self.calendars: dict[str, str] = self._load_calendar_data()
-        self.client = initialize_calendar(env.CALENDAR_PROVIDER)
+    def __init__(
+        self,
+        calendars: dict[str, str] | None = None,
+        client: Any | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        event_store: EventStore | None = None,
+        async_client: Any | None = None,
+    ) -> None:
+        self.calendars: dict[str, str] = (
+            calendars if calendars is not None else self._load_calendar_data()
+        )
+        self.client = (
+            client if client is not None else initialize_calendar(env.CALENDAR_PROVIDER)
+        )
+        self.http_client = http_client
+        # Created on first use, it binds to the running event loop
+        self.async_client = async_client
+        self.feed_cache = FeedCache(env.CALENDAR_CACHE_TTL, env.CALENDAR_CACHE_DIR)
+        self.event_indexes = {}
+        self.event_store = (
+            event_store
+            if event_store is not None or not env.CALENDAR_MIRROR_ENABLED
+            else EventStore(env.CALENDAR_MIRROR_PATH)
+        )
+        self._mirror_task: asyncio.Task | None = None
+        self.google_syncs = {}
+        # The provider client is not thread-safe, every call made from worker
+        # threads goes through this lock
+        self._client_lock = threading.Lock()
+        self.worker_pool = CalendarWorkerPool(env.CALENDAR_PARSE_WORKERS)
+        self.calendar_watch = None
+        self._watch_task: asyncio.Task | None = None
+        # Calendars notified as changed, refreshed one task per URL
+        self._dirty: set[str] = set()
+        self._refreshes: dict[str, asyncio.Task] = {}
+        # Events written through Lis, the feeds list them once downloaded again
+        self._written_ids: set[str] = set()
+        self._deleted_ids: set[str] = set()
 
     def _load_calendar_data(self) -> dict[str, str]:
         return load_data()
@@ -49,55 +139,720 @@ class CalendarManager:
 
         return all_events
 
+    async def aretrieve_events(
+        self,
+        payload: RetrieveEvents,
+        series_limit: int | None = None,
+    ) -> CalendarSearchResult:
+        """
+        Fetches every configured calendar concurrently without blocking the event loop.
+
+        A calendar that fails or times out is reported in `errors` while the others
+        are still returned. At most CALENDAR_MAX_OCCURRENCES occurrences, and
+        `series_limit` per recurring series, are returned per calendar; calendars
+        with more occurrences are reported in `truncated`.
+        """
+        semaphore = asyncio.Semaphore(env.CALENDAR_FETCH_CONCURRENCY)
+        # One occurrence past the limit tells a truncated calendar from a full one
+        limit = env.CALENDAR_MAX_OCCURRENCES + 1
+
+        async def fetch(name: str, url: str) -> list[CompactEvent]:
+            mirrored = await self._read_mirror(name, payload, series_limit, limit)
+            if mirrored is not None:
+                return mirrored
+
+            async with semaphore:
+                return await asyncio.wait_for(
+                    self.afetch_events(url, payload, series_limit, limit),
+                    timeout=env.CALENDAR_FETCH_TIMEOUT,
+                )
+
+        names = list(self.calendars)
+        results = await asyncio.gather(
+            *(fetch(name, self.calendars[name]) for name in names),
+            return_exceptions=True,
+        )
+
+        search_result = CalendarSearchResult()
+        for name, result in zip(names, results, strict=True):
+            if isinstance(result, BaseException):
+                if isinstance(result, asyncio.TimeoutError):
+                    result = RuntimeError(
+                        f"Timed out after {env.CALENDAR_FETCH_TIMEOUT}s"
+                    )
+                logger.error(f"Could not retrieve calendar '{name}': {result}")
+                search_result.errors[name] = str(result)
+            else:
+                if len(result) > env.CALENDAR_MAX_OCCURRENCES:
+                    search_result.truncated.append(name)
+                    result = result[: env.CALENDAR_MAX_OCCURRENCES]
+                search_result.events[name] = result
+
+        logging.info(
+            f"retrieved events from {len(search_result.events)}/{len(names)} calendars within the time range: {payload.start_time} - {payload.end_time}"
+        )
+
+        return search_result
+
     def fetch_ics_events(
         self,
         calendar_url: str,
         payload: RetrieveEvents,
     ) -> list[Component]:
         try:
-            response = requests.get(calendar_url)
-            response.raise_for_status()
+            with requests.get(
+                calendar_url, timeout=env.CALENDAR_FETCH_TIMEOUT, stream=True
+            ) as response:
+                response.raise_for_status()
+                # Parsed while downloading, events outside the window are dropped
+                calendar = parse_ics_stream(
+                    response.iter_content(ICS_CHUNK_SIZE),
+                    payload.start_time,
+                    payload.end_time,
+                )
 
-            calendar = icalendar.Calendar.from_ical(response.text)
-            expanded_events = recurring_ical_events.of(calendar).between(
-                payload.start_time, payload.end_time
-            )
+            return self._expand_calendar(calendar, payload)
+
+        except Exception as e:
+            logger.error(f"Error fetching calendar from {calendar_url}: {str(e)}")
+            raise RuntimeError(f"Failed to fetch calendar: {str(e)}") from e
+
+    async def afetch_events(
+        self,
+        calendar_url: str,
+        payload: RetrieveEvents,
+        series_limit: int | None = None,
+        limit: int = env.CALENDAR_MAX_OCCURRENCES,
+    ) -> list[CompactEvent]:
+        try:
+            if calendar_url.startswith(CALDAV_SCHEME):
+                # The server filters by time-range, only the window crosses the wire
+                content = await caldav_calendar_query(
+                    self._get_http_client(),
+                    calendar_url,
+                    payload.start_time,
+                    payload.end_time,
+                )
+                return await self.worker_pool.arun(
+                    expand_window,
+                    content,
+                    payload.start_time,
+                    payload.end_time,
+                    limit,
+                    series_limit,
+                )
 
-            return expanded_events
+            content = await self._load_calendar(calendar_url)
+
+            # The index waits on the worker pool when the calendar changed
+            return await asyncio.to_thread(
+                self._get_index(calendar_url).query,
+                content,
+                payload.start_time,
+                payload.end_time,
+                limit,
+                series_limit,
+            )
 
         except Exception as e:
             logger.error(f"Error fetching calendar from {calendar_url}: {str(e)}")
             raise RuntimeError(f"Failed to fetch calendar: {str(e)}") from e
 
+    async def sync_mirror(self, names: list[str] | None = None) -> dict[str, str]:
+        """
+        Copies the occurrences of every calendar, or of the `names` ones, within the
+        indexed horizon into the local event store.
+
+        Returns the calendars that could not be synced with their errors.
+        """
+        if self.event_store is None:
+            raise ValueError("The calendar mirror is not enabled.")
+        semaphore = asyncio.Semaphore(env.CALENDAR_FETCH_CONCURRENCY)
+
+        async def sync(name: str, url: str) -> None:
+            async with semaphore:
+                content = await asyncio.wait_for(
+                    self._load_calendar(url),
+                    timeout=env.CALENDAR_FETCH_TIMEOUT,
+                )
+            await self._mirror_calendar(name, url, content)
+
+        names = list(self.calendars) if names is None else names
+        results = await asyncio.gather(
+            *(sync(name, self.calendars[name]) for name in names),
+            return_exceptions=True,
+        )
+
+        errors: dict[str, str] = {}
+        for name, result in zip(names, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(f"Could not mirror calendar '{name}': {result!r}")
+                errors[name] = repr(result)
+        return errors
+
+    def start_watch(self) -> None:
+        """
+        Starts the background worker that opens and renews the push notification
+        channels of the Google calendars.
+        """
+        if not env.CALENDAR_WATCH_ENABLED or self._watch_task is not None:
+            return
+        if self.calendar_watch is None:
+            self.calendar_watch = GoogleCalendarWatch(
+                self._get_async_client(), env.CALENDAR_WATCH_ADDRESS
+            )
+        self._watch_task = asyncio.create_task(self._run_watch())
+
+    async def watch_calendars(self) -> None:
+        """
+        Opens a channel for every Google calendar not watched yet and renews the
+        channels about to expire.
+        """
+        if self.calendar_watch is None:
+            raise ValueError("Calendar push notifications are not enabled.")
+        watched = self.calendar_watch.calendar_ids()
+        for url in self.calendars.values():
+            calendar_id = google_calendar_id(url)
+            if calendar_id is None or calendar_id in watched:
+                continue
+            try:
+                await self.calendar_watch.watch(calendar_id)
+                watched.add(calendar_id)
+            except Exception as e:
+                logger.error(f"Could not watch calendar '{calendar_id}': {e}")
+        await self.calendar_watch.renew()
+
+    async def handle_notification(self, headers: Mapping[str, str]) -> bool:
+        """
+        Marks the calendars of a push notification as changed, refreshing them in
+        the background. Returns False when the notification is not from a channel
+        opened by this process.
+        """
+        if self.calendar_watch is None:
+            return False
+        channel = self.calendar_watch.verify(headers)
+        if channel is None:
+            logger.warning(
+                f"Ignoring notification of unknown channel {headers.get('X-Goog-Channel-ID')}"
+            )
+            return False
+        if headers.get("X-Goog-Resource-State") == SYNC_STATE:
+            return True
+
+        for url in self.calendars.values():
+            if google_calendar_id(url) == channel.calendar_id:
+                self.mark_dirty(url)
+        return True
+
+    def mark_dirty(self, calendar_url: str) -> None:
+        """
+        Schedules a refresh of the calendar. Notifications arriving while it runs
+        are coalesced into one more refresh.
+        """
+        self._dirty.add(calendar_url)
+        if calendar_url not in self._refreshes:
+            self._refreshes[calendar_url] = asyncio.create_task(
+                self._refresh_dirty(calendar_url)
+            )
+
+    async def refresh_calendar(self, calendar_url: str) -> None:
+        """
+        Fetches the changes of a single calendar, without waiting for its copies to
+        expire, and updates its index and its mirrored occurrences.
+        """
+        calendar_id = google_calendar_id(calendar_url)
+        if calendar_url.startswith(GOOGLE_SCHEME) and calendar_id is not None:
+            # Incremental, only the changed events are listed
+            await asyncio.to_thread(self._get_google_sync(calendar_id).sync)
+        else:
+            self.feed_cache.expire(calendar_url)
+
+        content = await asyncio.wait_for(
+            self._load_calendar(calendar_url), timeout=env.CALENDAR_FETCH_TIMEOUT
+        )
+        names = [name for name, url in self.calendars.items() if url == calendar_url]
+        if self.event_store is not None:
+            for name in names:
+                await self._mirror_calendar(name, calendar_url, content)
+        else:
+            # Expanded now rather than by the next search
+            await asyncio.to_thread(
+                self._get_index(calendar_url).horizon_occurrences, content
+            )
+        logger.info(f"Refreshed calendar {', '.join(names)} after a notification")
+
+    def start_mirror(self) -> None:
+        """
+        Starts the background worker that keeps the local event store in sync.
+        """
+        if self.event_store is None or self._mirror_task is not None:
+            return
+        self._mirror_task = asyncio.create_task(self._run_mirror())
+
+    async def aclose(self) -> None:
+        """
+        Stops the mirror worker and the calendar worker processes, and closes the
+        pooled HTTP clients used to fetch calendar feeds and modify events.
+        """
+        for task in [self._mirror_task, self._watch_task, *self._refreshes.values()]:
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._mirror_task = None
+        self._watch_task = None
+
+        if self.calendar_watch is not None:
+            await self.calendar_watch.aclose()
+
+        self.worker_pool.shutdown()
+
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+
+        if self.async_client is not None:
+            await self.async_client.aclose()
+            self.async_client = None
+
     def create_events(
         self,
         events_data: list[
             CreateGoogleCalendarEvent
         ],  # Use Union[] when using more providers
-    ) -> list[dict[str, Any]]:
+    ) -> list[CalendarMutationResult]:
+        """
+        Creates multiple events in the calendar with batched requests.
+
+        Each event gets its own result, an event that fails does not fail the others.
+        """
+        with self._client_lock:
+            results = create_events(
+                self.client, env.CALENDAR_PROVIDER, env.CALENDAR_ID, events_data
+            )
+        self.apply_mutations(results)
+        return results
+
+    def delete_events(self, events: list[DeleteEvent]) -> list[CalendarMutationResult]:
+        """
+        Deletes multiple events from the calendar by their IDs with batched requests.
+        """
+        with self._client_lock:
+            results = delete_events(
+                self.client,
+                env.CALENDAR_PROVIDER,
+                env.CALENDAR_ID,
+                [data.id for data in events],
+            )
+        self.apply_mutations(results)
+        return results
+
+    def update_events(self, events: list[UpdateEvent]) -> list[CalendarMutationResult]:
+        """
+        Updates multiple events in the calendar with batched requests.
+        """
+        with self._client_lock:
+            results = update_events(
+                self.client, env.CALENDAR_PROVIDER, env.CALENDAR_ID, events
+            )
+        self.apply_mutations(results)
+        return results
+
+    async def acreate_events(
+        self,
+        events_data: list[
+            CreateGoogleCalendarEvent
+        ],  # Use Union[] when using more providers
+        event_ids: list[str] | None = None,
+    ) -> list[CalendarMutationResult]:
+        """
+        Creates multiple events concurrently through the async provider client.
+
+        Each event gets its own result, an event that fails does not fail the others.
+        Passing `event_ids` makes retrying the same creations safe.
+        """
+        results = await acreate_events(
+            self._get_async_client(),
+            env.CALENDAR_PROVIDER,
+            env.CALENDAR_ID,
+            events_data,
+            event_ids,
+        )
+        await asyncio.to_thread(self.apply_mutations, results)
+        return results
+
+    async def adelete_events(
+        self, events: list[DeleteEvent]
+    ) -> list[CalendarMutationResult]:
+        """
+        Deletes multiple events concurrently through the async provider client.
+        """
+        results = await adelete_events(
+            self._get_async_client(),
+            env.CALENDAR_PROVIDER,
+            env.CALENDAR_ID,
+            [data.id for data in events],
+        )
+        await asyncio.to_thread(self.apply_mutations, results)
+        return results
+
+    async def aupdate_events(
+        self, events: list[UpdateEvent]
+    ) -> list[CalendarMutationResult]:
+        """
+        Updates multiple events concurrently through the async provider client.
+        """
+        results = await aupdate_events(
+            self._get_async_client(), env.CALENDAR_PROVIDER, env.CALENDAR_ID, events
+        )
+        await asyncio.to_thread(self.apply_mutations, results)
+        return results
+
+    def apply_mutations(self, results: list[CalendarMutationResult]) -> None:
+        """
+        Writes the modifications that succeeded into the local copies of the calendar
+        they target: the Google mirror, the event index and the event store. Reading
+        it back then needs no fetch, the next sync or download of the calendar
+        replaces them with the provider's copy.
+        """
+        resources, deleted_ids = written_changes(results)
+        if not resources and not deleted_ids:
+            return
+        self._written_ids.update(resource["id"] for resource in resources)
+        self._written_ids.difference_update(deleted_ids)
+        self._deleted_ids.update(deleted_ids)
+
+        for name, url in self.calendars.items():
+            if not is_written_calendar(url, env.CALENDAR_ID):
+                continue
+            try:
+                if url.startswith(GOOGLE_SCHEME):
+                    patched = self._patch_google_sync(url, resources, deleted_ids)
+                else:
+                    patched = self._patch_index(url, resources, deleted_ids)
+
+                if (
+                    patched is not None
+                    and self.event_store is not None
+                    and self.event_store.sync_state(name) is not None
+                ):
+                    self.event_store.patch_events(name, *patched)
+            except Exception as e:
+                # The copies are still replaced on the next sync or download
+                logger.warning(
+                    f"Could not apply the modifications to calendar '{name}': {e}"
+                )
+
+    def preflight(
+        self,
+        create_events: list[CreateGoogleCalendarEvent],
+        update_events: list[UpdateEvent],
+        delete_events: list[DeleteEvent],
+    ) -> list[CalendarPreflightProblem]:
+        """
+        Checks calendar modifications against the local copies of the calendars,
+        without any request to the provider: the events to update or delete must
+        exist and the events created or moved must not overlap busy time.
+        """
+        window = planned_window(create_events, update_events)
+        occurrences = self.cached_occurrences(*window) if window is not None else []
+        return preflight_mutations(
+            create_events,
+            update_events,
+            delete_events,
+            self.cached_event_ids(),
+            occurrences,
+        )
+
+    def cached_event_ids(self) -> set[str] | None:
+        """
+        Returns the IDs of the events of the calendar written to (CALENDAR_ID) held by
+        the local copies, or None when no copy holds the whole calendar.
+        """
+        ids: set[str] | None = None
+        for url in self.calendars.values():
+            if not is_written_calendar(url, env.CALENDAR_ID):
+                continue
+            if url.startswith(GOOGLE_SCHEME):
+                google_sync = self.google_syncs.get(url.removeprefix(GOOGLE_SCHEME))
+                if google_sync is None or google_sync.synced_at is None:
+                    continue
+                # Cancelled instances are kept to exclude them from their series
+                known = {
+                    event_id
+                    for event_id, resource in list(google_sync.events.items())
+                    if resource.get("status") != "cancelled"
+                }
+            else:
+                feed = self.feed_cache.peek(url)
+                if feed is None:
+                    continue
+                known = feed_event_ids(feed.content)
+            ids = known if ids is None else ids | known
+
+        if ids is None:
+            return None
+        return (ids | self._written_ids) - self._deleted_ids
+
+    def cached_occurrences(self, start: datetime, end: datetime) -> list[CompactEvent]:
+        """
+        Returns the occurrences within [start, end) of every calendar held by its index
+        or by the event store. Calendars without a copy covering the window are left
+        out.
+        """
+        occurrences: list[CompactEvent] = []
+        for name, url in self.calendars.items():
+            index = self.event_indexes.get(url)
+            cached = index.cached(start, end) if index is not None else None
+            if cached is None and self.event_store is not None:
+                state = self.event_store.sync_state(name)
+                if state is not None and state.covers(start, end):
+                    cached = self.event_store.query(name, start, end)
+            occurrences.extend(cached or [])
+        return occurrences
+
+    def _get_async_client(self):
+        if self.async_client is None:
+            self.async_client = initialize_async_calendar(env.CALENDAR_PROVIDER)
+        return self.async_client
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        # Created lazily so that it binds to the running event loop
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(
+                timeout=env.CALENDAR_FETCH_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=env.CALENDAR_FETCH_CONCURRENCY,
+                    max_keepalive_connections=env.CALENDAR_FETCH_CONCURRENCY,
+                ),
+                follow_redirects=True,
+            )
+        return self.http_client
+
+    async def _load_calendar(self, calendar_url: str) -> bytes:
         """
-        Creates multiple events in the calendar.
+        Returns the ICS content of the whole calendar behind `calendar_url`; the
+        requested window is applied locally.
+
+        `google://<calendar id>` calendars are mirrored through the Google Calendar
+        API with incremental sync, `caldav+https://...` calendars are queried for
+        the indexed horizon and any other URL is read as an ICS feed.
         """
-        return [
-            create_event(self.client, env.CALENDAR_PROVIDER, env.CALENDAR_ID, data)
-            for data in events_data
-        ]
+        if calendar_url.startswith(GOOGLE_SCHEME):
+            google_sync = self._get_google_sync(
+                calendar_url.removeprefix(GOOGLE_SCHEME)
+            )
+            return await asyncio.to_thread(google_sync.ics, self._max_age(calendar_url))
 
-    def delete_events(self, events: list[DeleteEvent]) -> None:
+        if calendar_url.startswith(CALDAV_SCHEME):
+            now = datetime.now(UTC)
+            return await caldav_calendar_query(
+                self._get_http_client(),
+                calendar_url,
+                now - timedelta(days=env.CALENDAR_INDEX_PAST_DAYS),
+                now + timedelta(days=env.CALENDAR_INDEX_FUTURE_DAYS),
+            )
+
+        # The date parameters are not sent, static ICS exports ignore them anyway
+        feed = await self.feed_cache.get(
+            self._get_http_client(), calendar_url, self._max_age(calendar_url)
+        )
+        return feed.content
+
+    def _max_age(self, calendar_url: str) -> float:
         """
-        Deletes multiple events from the calendar by their IDs.
+        Seconds the local copy of a calendar is reused without asking its server.
+        Watched calendars are refreshed by their notifications instead.
         """
-        for data in events:
-            delete_event(self.client, env.CALENDAR_PROVIDER, env.CALENDAR_ID, data.id)
+        if self._is_watched(calendar_url):
+            return env.CALENDAR_WATCH_RESYNC_INTERVAL
+        return env.CALENDAR_CACHE_TTL
+
+    def _is_watched(self, calendar_url: str) -> bool:
+        return (
+            self.calendar_watch is not None
+            and google_calendar_id(calendar_url) in self.calendar_watch.calendar_ids()
+        )
+
+    async def _mirror_calendar(
+        self, name: str, calendar_url: str, content: bytes
+    ) -> None:
+        if self.event_store is None:
+            raise ValueError("The calendar mirror is not enabled.")
+        horizon_start, horizon_end, occurrences = await asyncio.to_thread(
+            self._get_index(calendar_url).horizon_occurrences, content
+        )
+        await asyncio.to_thread(
+            self.event_store.replace_events,
+            name,
+            calendar_url,
+            horizon_start,
+            horizon_end,
+            occurrences,
+        )
+
+    async def _refresh_dirty(self, calendar_url: str) -> None:
+        try:
+            while calendar_url in self._dirty:
+                self._dirty.discard(calendar_url)
+                try:
+                    await self.refresh_calendar(calendar_url)
+                except Exception as e:
+                    logger.error(f"Could not refresh calendar {calendar_url}: {e!r}")
+        finally:
+            self._refreshes.pop(calendar_url, None)
+
+    async def _run_watch(self) -> None:
+        while True:
+            try:
+                await self.watch_calendars()
+            except Exception as e:
+                logger.error(f"Calendar watch failed: {e}", exc_info=True)
+            await asyncio.sleep(_WATCH_CHECK_INTERVAL)
+
+    def _get_google_sync(self, calendar_id: str) -> GoogleCalendarSync:
+        google_sync = self.google_syncs.get(calendar_id)
+        if google_sync is None:
+            google_sync = GoogleCalendarSync(
+                self.client, calendar_id, self._client_lock
+            )
+            self.google_syncs[calendar_id] = google_sync
+        return google_sync
+
+    def _patch_google_sync(
+        self,
+        calendar_url: str,
+        resources: list[dict[str, Any]],
+        deleted_ids: list[str],
+    ) -> tuple[set[str], list[CompactEvent]] | None:
+        google_sync = self.google_syncs.get(calendar_url.removeprefix(GOOGLE_SCHEME))
+        if google_sync is None:
+            return None
+        uids = google_sync.apply(resources, deleted_ids)
+        if not uids or self.event_store is None:
+            # The index expands the changed events on the next read
+            return None
+
+        # The mirror stores occurrences, expand the changed series with the rest of
+        # the calendar as the index would
+        _, _, occurrences = self._get_index(calendar_url).horizon_occurrences(
+            google_sync.ics(float("inf"))
+        )
+        return uids, [o for o in occurrences if o.uid in uids]
 
-    def update_events(self, events: list[UpdateEvent]) -> list[dict[str, Any]]:
+    def _patch_index(
+        self,
+        calendar_url: str,
+        resources: list[dict[str, Any]],
+        deleted_ids: list[str],
+    ) -> tuple[set[str], list[CompactEvent]] | None:
+        index = self.event_indexes.get(calendar_url)
+        if index is None:
+            return None
+        instances = [r for r in resources if "recurringEventId" in r]
+        if instances:
+            # An instance can not be expanded without the rest of its series, the
+            # feed's next version brings it
+            logger.info(
+                f"{len(instances)} modified instances of a series are left to the next download of {calendar_url}"
+            )
+            resources = [r for r in resources if "recurringEventId" not in r]
+
+        uids = {uid for resource in resources for uid in event_uids(resource)}
+        uids.update(
+            uid for event_id in deleted_ids for uid in event_uids({"id": event_id})
+        )
+        occurrences = index.patch(changes_ics(resources), uids)
+        if occurrences is None:
+            return None
+        return uids, occurrences
+
+    def _get_index(self, calendar_url: str) -> EventIndex:
+        index = self.event_indexes.get(calendar_url)
+        if index is None:
+            index = EventIndex(
+                env.CALENDAR_INDEX_PAST_DAYS,
+                env.CALENDAR_INDEX_FUTURE_DAYS,
+                self.worker_pool,
+            )
+            self.event_indexes[calendar_url] = index
+        return index
+
+    async def _read_mirror(
+        self,
+        name: str,
+        payload: RetrieveEvents,
+        series_limit: int | None = None,
+        limit: int = env.CALENDAR_MAX_OCCURRENCES,
+    ) -> list[CompactEvent] | None:
         """
-        Updates multiple events in the calendar.
+        Reads the events from the local event store, or returns None when the mirror
+        is disabled, too old or does not cover the requested window.
         """
-        return [
-            update_event(self.client, env.CALENDAR_PROVIDER, env.CALENDAR_ID, data)
-            for data in events
-        ]
+        if self.event_store is None:
+            return None
+
+        state = await asyncio.to_thread(self.event_store.sync_state, name)
+        if state is None:
+            return None
+        max_staleness = env.CALENDAR_MIRROR_MAX_STALENESS
+        if self._is_watched(self.calendars[name]):
+            # Synced on notifications, and at least every resync interval
+            max_staleness += env.CALENDAR_WATCH_RESYNC_INTERVAL
+        if state.age() > max_staleness:
+            logger.warning(
+                f"Mirror of calendar '{name}' is {state.age():.0f}s old, fetching it live."
+            )
+            return None
+        if not state.covers(payload.start_time, payload.end_time):
+            return None
+
+        return await asyncio.to_thread(
+            self.event_store.query,
+            name,
+            payload.start_time,
+            payload.end_time,
+            limit,
+            series_limit,
+        )
+
+    async def _run_mirror(self) -> None:
+        while True:
+            try:
+                names = await asyncio.to_thread(self._mirror_due)
+                errors = await self.sync_mirror(names)
+                logger.info(
+                    f"Calendar mirror synced {len(names) - len(errors)}/{len(names)} calendars"
+                )
+            except Exception as e:
+                logger.error(f"Calendar mirror sync failed: {e}", exc_info=True)
+            await asyncio.sleep(env.CALENDAR_MIRROR_INTERVAL)
+
+    def _mirror_due(self) -> list[str]:
+        assert self.event_store is not None
+        names = []
+        for name, url in self.calendars.items():
+            if self._is_watched(url):
+                state = self.event_store.sync_state(name)
+                if (
+                    state is not None
+                    and state.age() < env.CALENDAR_WATCH_RESYNC_INTERVAL
+                ):
+                    continue
+            names.append(name)
+        return names
+
+    def _expand_calendar(
+        self,
+        calendar: icalendar.Calendar,
+        payload: RetrieveEvents,
+    ) -> list[Component]:
+        return recurring_ical_events.of(
+            calendar, keep_recurrence_attributes=True
+        ).between(payload.start_time, payload.end_time)
 
     def add_date_parameters(
         self,
@@ -3,3 +3,14 @@ from .delete_event import *
 from .update_event import *
 from .create_google_event import *
 from .update_google_event import *
+from .calendar_search_result import *
+from .cached_feed import *
+from .calendar_sync_state import *
+from .calendar_mutation_result import *
+from .compact_event import *
+from .find_free_slots import *
+from .calendar_expansion import *
+from .worker_pool_stats import *
+from .google_channel import *
+from .calendar_preflight_problem import *
+from .relative_date_range import *
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class CachedFeed(BaseModel):
+    url: str = Field(description="URL of the ICS feed.")
+    content: bytes = Field(
+        description="ICS content of the feed, parsed by the calendar workers."
+    )
+    etag: str | None = Field(
+        default=None, description="ETag returned by the server, used to revalidate."
+    )
+    last_modified: str | None = Field(
+        default=None,
+        description="Last-Modified header returned by the server, used to revalidate.",
+    )
+    fetched_at: datetime = Field(
+        description="When the feed was last downloaded or revalidated."
+    )
+
+
+class FeedCacheStats(BaseModel):
+    hits: int = Field(default=0, description="Feeds served from memory.")
+    misses: int = Field(default=0, description="Feeds downloaded in full.")
+    revalidations: int = Field(
+        default=0, description="Feeds confirmed unchanged by the server (304)."
+    )
+    shared: int = Field(
+        default=0, description="Requests that joined an in-flight download."
+    )
+    entries: int = Field(default=0, description="Feeds currently held in memory.")
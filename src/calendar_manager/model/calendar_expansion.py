@@ -0,0 +1,27 @@
+from pydantic import BaseModel, Field
+
+from src.calendar_manager.model.compact_event import CompactEvent
+
+
+class ExpandedEvent(BaseModel):
+    fingerprint: str = Field(
+        description="Hash of the VEVENTs sharing the UID, without DTSTAMP."
+    )
+    occurrences: list[tuple[float, float, CompactEvent]] = Field(
+        default_factory=list,
+        description="Occurrences within the horizon as (start, end, event), in seconds.",
+    )
+
+
+class CalendarExpansion(BaseModel):
+    timezones_fingerprint: str = Field(description="Hash of the VTIMEZONEs.")
+    reset: bool = Field(
+        description="Whether every event was expanded again, because the time zones changed."
+    )
+    uids: list[str] = Field(
+        default_factory=list, description="UIDs of every event within the horizon."
+    )
+    expanded: dict[str, ExpandedEvent] = Field(
+        default_factory=dict,
+        description="Events that changed since the fingerprints given, keyed by UID.",
+    )
@@ -0,0 +1,28 @@
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+
+class CalendarMutationResult(BaseModel):
+    action: Literal["create", "update", "delete"] = Field(
+        description="Modification applied to the calendar."
+    )
+    event_id: str | None = Field(
+        default=None,
+        description="ID of the event modified, unknown when a creation fails.",
+    )
+    event: dict[str, Any] | None = Field(
+        default=None,
+        description="Event resource returned by the provider, empty for deletions.",
+    )
+    error: str | None = Field(
+        default=None, description="Why the modification failed, if it did."
+    )
+    status_code: int | None = Field(
+        default=None,
+        description="HTTP status of a failed modification, unknown when the provider could not be reached.",
+    )
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
@@ -0,0 +1,23 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class CalendarPreflightProblem(BaseModel):
+    action: Literal["create", "update", "delete"] = Field(
+        description="Modification the problem was found in."
+    )
+    index: int = Field(
+        description="Position of the modification among the ones of its action."
+    )
+    kind: Literal["unknown_event", "overlap"] = Field(
+        description="`unknown_event` when the event to modify is not in the calendar, `overlap` when the event would overlap busy time."
+    )
+    event_id: str | None = Field(
+        default=None, description="ID of the event to modify, empty for creations."
+    )
+    conflicts: list[str] = Field(
+        default_factory=list,
+        description="Events overlapped, as 'summary (start - end)'.",
+    )
+    message: str = Field(description="Description of the problem.")
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+
+from src.calendar_manager.model.compact_event import CompactEvent
+
+
+class CalendarSearchResult(BaseModel):
+    events: dict[str, list[CompactEvent]] = Field(
+        default_factory=dict,
+        description="Occurrences retrieved, keyed by calendar name.",
+    )
+    errors: dict[str, str] = Field(
+        default_factory=dict,
+        description="Calendars that could not be retrieved, keyed by calendar name.",
+    )
+    truncated: list[str] = Field(
+        default_factory=list,
+        description="Calendars with more occurrences than a single search returns.",
+    )
+    page: int = Field(default=1, description="Page of the events returned.")
+    pages: int = Field(default=1, description="Number of pages of events.")
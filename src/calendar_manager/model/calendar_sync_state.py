@@ -0,0 +1,21 @@
+from datetime import UTC, datetime
+
+from pydantic import BaseModel, Field
+
+from src.common import to_timestamp
+
+
+class CalendarSyncState(BaseModel):
+    horizon_start: datetime = Field(description="Start of the mirrored time range.")
+    horizon_end: datetime = Field(description="End of the mirrored time range.")
+    last_synced_at: datetime = Field(description="When the calendar was last synced.")
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        """Whether the window lies within the mirrored time range."""
+        horizon_start = to_timestamp(self.horizon_start)
+        horizon_end = to_timestamp(self.horizon_end)
+        return horizon_start <= to_timestamp(start) and to_timestamp(end) <= horizon_end
+
+    def age(self) -> float:
+        """Seconds since the calendar was last synced."""
+        return (datetime.now(UTC) - self.last_synced_at).total_seconds()
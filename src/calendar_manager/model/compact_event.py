@@ -0,0 +1,25 @@
+from datetime import date, datetime
+
+from pydantic import BaseModel, Field
+
+
+class CompactEvent(BaseModel):
+    uid: str = Field(description="UID of the event, used to update or delete it.")
+    summary: str = Field(default="", description="Title of the event.")
+    start: datetime | date = Field(description="Start of the occurrence.")
+    end: datetime | date = Field(description="End of the occurrence.")
+    location: str | None = Field(default=None, description="Location of the event.")
+    recurring: bool = Field(
+        default=False, description="Whether the occurrence belongs to a series."
+    )
+    rrule: str | None = Field(
+        default=None, description="Recurrence rule of the series, if any."
+    )
+    repeats: str | None = Field(
+        default=None,
+        description="How the series repeats, set when its occurrences are listed as this single record.",
+    )
+    busy: bool = Field(
+        default=True,
+        description="Whether the occurrence blocks time, false when it is cancelled or marked as free.",
+    )
@@ -0,0 +1,50 @@
+from datetime import datetime, time
+
+from pydantic import BaseModel, Field
+
+
+class FindFreeSlots(BaseModel):
+    start_time: datetime = Field(
+        description="Start of the period to search for free time. Must be in ISO format.",
+    )
+    end_time: datetime = Field(
+        description="End of the period to search for free time. Must be in ISO format.",
+    )
+    duration_minutes: int = Field(
+        default=30, gt=0, description="Minimum length of a free slot, in minutes."
+    )
+    timezone: str = Field(
+        default="UTC",
+        description="IANA time zone of the user (e.g., 'America/Sao_Paulo'), working hours are in this zone.",
+    )
+    work_day_start: time = Field(
+        default=time(9), description="Start of the working hours (e.g., '09:00')."
+    )
+    work_day_end: time = Field(
+        default=time(18), description="End of the working hours (e.g., '18:00')."
+    )
+    include_weekends: bool = Field(
+        default=False, description="Whether Saturdays and Sundays can be used."
+    )
+    max_slots: int = Field(
+        default=10, gt=0, description="Maximum number of free slots to return."
+    )
+
+
+class TimeBlock(BaseModel):
+    start: datetime = Field(description="Start of the block.")
+    end: datetime = Field(description="End of the block.")
+
+
+class FreeBusy(BaseModel):
+    busy: list[TimeBlock] = Field(
+        default_factory=list,
+        description="Busy blocks of all calendars merged, within the working hours.",
+    )
+    free_slots: list[TimeBlock] = Field(
+        default_factory=list,
+        description="Free gaps within the working hours at least as long as requested.",
+    )
+    omitted_slots: int = Field(
+        default=0, description="Free slots found beyond `max_slots`."
+    )
@@ -0,0 +1,15 @@
+from datetime import UTC, datetime, timedelta
+
+from pydantic import BaseModel, Field
+
+
+class GoogleChannel(BaseModel):
+    id: str = Field(description="ID of the notification channel, chosen by Lis.")
+    calendar_id: str = Field(description="Google calendar whose events are watched.")
+    resource_id: str = Field(description="ID Google gives to the watched resource.")
+    token: str = Field(description="Secret echoed by Google in every notification.")
+    expiration: datetime = Field(description="When Google stops the channel.")
+
+    def expires_within(self, seconds: float) -> bool:
+        """Whether the channel stops in less than `seconds`."""
+        return self.expiration - datetime.now(UTC) < timedelta(seconds=seconds)
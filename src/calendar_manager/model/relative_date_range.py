@@ -0,0 +1,11 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class RelativeDateRange(BaseModel):
+    expression: str = Field(
+        description="Relative time reference as written by the user (e.g., 'next Monday afternoon')."
+    )
+    start: datetime = Field(description="Start of the window, inclusive.")
+    end: datetime = Field(description="End of the window, exclusive.")
@@ -10,3 +10,8 @@ class RetrieveEvents(BaseModel):
     end_time: datetime = Field(
         description="The end time for the event retrieval. Must be in ISO format.",
     )
+    page: int = Field(
+        default=1,
+        ge=1,
+        description="Page of the events to return, starting at 1. Request the next page only when the previous one says more events are available.",
+    )
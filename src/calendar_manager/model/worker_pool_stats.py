@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+
+
+class WorkerPoolStats(BaseModel):
+    workers: int = Field(
+        description="Worker processes, 0 when the tasks run in threads instead."
+    )
+    tasks: int = Field(default=0, description="Tasks completed.")
+    failed: int = Field(default=0, description="Tasks that raised an error.")
+    queue_wait_avg: float = Field(
+        default=0.0,
+        description="Average seconds a task waited for a free worker.",
+    )
+    queue_wait_max: float = Field(
+        default=0.0, description="Longest wait for a free worker, in seconds."
+    )
+    run_time_avg: float = Field(
+        default=0.0,
+        description="Average seconds spent parsing and expanding per task.",
+    )
+    run_time_max: float = Field(default=0.0, description="Longest task, in seconds.")
@@ -1,2 +1,17 @@
 from .google import *
+from .google_async import *
 from .main import *
+from .feed_cache import *
+from .event_index import *
+from .event_store import *
+from .google_sync import *
+from .compact_events import *
+from .free_busy import *
+from .caldav import *
+from .ics_stream import *
+from .calendar_worker import *
+from .worker_pool import *
+from .write_through import *
+from .google_watch import *
+from .preflight import *
+from .relative_dates import *
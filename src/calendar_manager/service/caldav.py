@@ -0,0 +1,79 @@
+import logging
+import xml.etree.ElementTree as ET
+from datetime import UTC, datetime
+
+import httpx
+
+from src.common import to_timestamp
+
+logger = logging.getLogger(__name__)
+
+CALDAV_SCHEME = "caldav+"
+
+_NAMESPACES = {"D": "DAV:", "C": "urn:ietf:params:xml:ns:caldav"}
+
+_CALENDAR_QUERY = """<?xml version="1.0" encoding="utf-8"?>
+<C:calendar-query xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">
+  <D:prop>
+    <C:calendar-data/>
+  </D:prop>
+  <C:filter>
+    <C:comp-filter name="VCALENDAR">
+      <C:comp-filter name="VEVENT">
+        <C:time-range start="{start}" end="{end}"/>
+      </C:comp-filter>
+    </C:comp-filter>
+  </C:filter>
+</C:calendar-query>"""
+
+
+def caldav_collection_url(calendar_url: str) -> str:
+    """
+    Converts a `caldav+https://...` calendar URL into the URL of its collection.
+    """
+    return calendar_url.removeprefix(CALDAV_SCHEME)
+
+
+async def caldav_calendar_query(
+    client: httpx.AsyncClient,
+    calendar_url: str,
+    start: datetime,
+    end: datetime,
+) -> bytes:
+    """
+    Sends a `REPORT calendar-query` with a `time-range` filter, so the server only
+    returns the events overlapping the window (RFC 4791, section 7.8).
+
+    Recurring events come back as their whole series, they must still be expanded
+    to the window. Returns the VCALENDAR of every resource one after the other,
+    read as a single calendar by `IcsStreamParser`.
+    """
+    url = caldav_collection_url(calendar_url)
+    body = _CALENDAR_QUERY.format(start=_caldav_time(start), end=_caldav_time(end))
+    response = await client.request(
+        "REPORT",
+        url,
+        content=body.encode("utf-8"),
+        headers={"Depth": "1", "Content-Type": "application/xml; charset=utf-8"},
+    )
+    response.raise_for_status()
+    if response.status_code != 207:
+        raise RuntimeError(
+            f"Expected a multistatus response from {url}, got {response.status_code}"
+        )
+
+    documents: list[bytes] = []
+    for data in ET.fromstring(response.content).iterfind(
+        ".//D:response/D:propstat/D:prop/C:calendar-data", _NAMESPACES
+    ):
+        if data.text:
+            # Every resource is a VCALENDAR holding one event and its overrides
+            documents.append(data.text.strip().encode("utf-8"))
+
+    logger.info(f"CalDAV query of {url} returned {len(documents)} resources")
+    return b"\r\n".join(documents)
+
+
+def _caldav_time(value: datetime) -> str:
+    # Time ranges are in UTC, naive datetimes are taken as UTC
+    return datetime.fromtimestamp(to_timestamp(value), UTC).strftime("%Y%m%dT%H%M%SZ")
@@ -0,0 +1,144 @@
+import hashlib
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import UTC, datetime
+
+import icalendar
+import recurring_ical_events
+from icalendar.cal import Component
+
+from src.calendar_manager.model.calendar_expansion import (
+    CalendarExpansion,
+    ExpandedEvent,
+)
+from src.calendar_manager.model.compact_event import CompactEvent
+from src.calendar_manager.service.compact_events import (
+    cap_occurrences,
+    compact_event,
+)
+from src.calendar_manager.service.ics_stream import (
+    ICS_CHUNK_SIZE,
+    iter_ics_components,
+    parse_ics_stream,
+)
+from src.common import to_timestamp
+
+# Tasks of the calendar worker pool. They run in other processes, so they only take
+# and return picklable values: the raw ICS content in, CompactEvent records out.
+
+# Zero-length events still match a window they start in
+_INSTANT = 1e-6
+
+
+def expand_window(
+    content: bytes,
+    start: datetime,
+    end: datetime,
+    limit: int | None = None,
+    series_limit: int | None = None,
+) -> list[CompactEvent]:
+    """
+    Parses an ICS calendar and returns its occurrences overlapping [start, end).
+
+    Occurrences are expanded lazily, in order of start, so that no more than `limit`
+    of them, and `series_limit` per recurring series, are ever materialized.
+    """
+    calendar = parse_ics_stream(_chunks(content), start, end)
+    return cap_occurrences(
+        (
+            compact_event(occurrence)
+            for occurrence in _iter_window(calendar, start, end)
+        ),
+        limit,
+        series_limit,
+    )
+
+
+def expand_calendar(
+    content: bytes,
+    horizon: tuple[float, float],
+    fingerprints: dict[str, str],
+    timezones_fingerprint: str | None,
+) -> CalendarExpansion:
+    """
+    Parses an ICS calendar and expands, over the horizon, the events whose
+    fingerprint differs from `fingerprints` (keyed by UID).
+
+    When the time zones differ from `timezones_fingerprint` every event is expanded.
+    """
+    horizon_start, horizon_end = (datetime.fromtimestamp(t, UTC) for t in horizon)
+
+    timezones: list[Component] = []
+    events_by_uid: dict[str, list[Component]] = defaultdict(list)
+    for component in iter_ics_components(_chunks(content), horizon_start, horizon_end):
+        if component.name == "VTIMEZONE":
+            timezones.append(component)
+        elif component.name == "VEVENT":
+            events_by_uid[str(component.get("UID", ""))].append(component)
+
+    expansion = CalendarExpansion(
+        timezones_fingerprint=_fingerprint(timezones),
+        reset=False,
+        uids=list(events_by_uid),
+    )
+    if expansion.timezones_fingerprint != timezones_fingerprint:
+        # Every occurrence may move
+        expansion.reset = True
+        fingerprints = {}
+
+    changed: dict[str, str] = {}
+    for uid, events in events_by_uid.items():
+        fingerprint = _fingerprint(events)
+        if fingerprints.get(uid) != fingerprint:
+            changed[uid] = fingerprint
+    if not changed:
+        return expansion
+
+    partial = icalendar.Calendar()
+    for component in [*timezones, *(e for uid in changed for e in events_by_uid[uid])]:
+        partial.add_component(component)
+
+    occurrences: dict[str, list[tuple[float, float, CompactEvent]]] = defaultdict(list)
+    # RRULE is kept so occurrences can still be told apart from single events
+    for occurrence in recurring_ical_events.of(
+        partial, keep_recurrence_attributes=True
+    ).between(horizon_start, horizon_end):
+        start = to_timestamp(occurrence.start)
+        end = max(to_timestamp(occurrence.end), start + _INSTANT)
+        occurrences[str(occurrence.get("UID", ""))].append(
+            (start, end, compact_event(occurrence))
+        )
+
+    expansion.expanded = {
+        uid: ExpandedEvent(fingerprint=fingerprint, occurrences=occurrences[uid])
+        for uid, fingerprint in changed.items()
+    }
+    return expansion
+
+
+def _iter_window(
+    calendar: icalendar.Calendar, start: datetime, end: datetime
+) -> Iterator[Component]:
+    window_end = to_timestamp(end)
+    for occurrence in recurring_ical_events.of(
+        calendar, keep_recurrence_attributes=True
+    ).after(start):
+        # Yielded in order of start once past the occurrences overlapping `start`
+        if to_timestamp(occurrence.start) >= window_end:
+            return
+        yield occurrence
+
+
+def _chunks(content: bytes) -> Iterator[bytes]:
+    for offset in range(0, len(content), ICS_CHUNK_SIZE):
+        yield content[offset : offset + ICS_CHUNK_SIZE]
+
+
+def _fingerprint(components: list[Component]) -> str:
+    digest = hashlib.sha256()
+    for component in components:
+        for line in component.to_ical().splitlines():
+            # Exports stamp every event at download time, ignore it
+            if not line.startswith(b"DTSTAMP"):
+                digest.update(line)
+    return digest.hexdigest()
@@ -0,0 +1,219 @@
+import math
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+
+from icalendar.cal import Component
+
+from src.calendar_manager.model.calendar_search_result import CalendarSearchResult
+from src.calendar_manager.model.compact_event import CompactEvent
+from src.common import count_tokens, to_timestamp
+
+COLUMNS = ("calendar", "uid", "summary", "start", "end", "location", "recurring")
+
+
+def compact_event(component: Component) -> CompactEvent:
+    """
+    Projects an expanded VEVENT into the few fields the LLM needs.
+    """
+    return CompactEvent(
+        uid=str(component.get("UID", "")),
+        summary=str(component.get("SUMMARY", "")),
+        start=component.start,
+        end=component.end,
+        location=str(component["LOCATION"]) if component.get("LOCATION") else None,
+        # Occurrences of a series keep its RRULE/RDATE when expanded
+        recurring="RRULE" in component or "RDATE" in component,
+        rrule=_rrule(component),
+        busy=str(component.get("TRANSP", "")).upper() != "TRANSPARENT"
+        and str(component.get("STATUS", "")).upper() != "CANCELLED",
+    )
+
+
+def cap_occurrences(
+    occurrences: Iterable[CompactEvent],
+    limit: int | None = None,
+    series_limit: int | None = None,
+) -> list[CompactEvent]:
+    """
+    Keeps at most `series_limit` occurrences of every series and `limit` overall.
+
+    `occurrences` is consumed lazily and only until `limit` is reached, so it can be
+    a generator expanding them.
+    """
+    kept: list[CompactEvent] = []
+    per_series: Counter[str] = Counter()
+    for occurrence in occurrences:
+        if limit is not None and len(kept) >= limit:
+            break
+        if occurrence.recurring and series_limit is not None:
+            per_series[occurrence.uid] += 1
+            if per_series[occurrence.uid] > series_limit:
+                continue
+        kept.append(occurrence)
+    return kept
+
+
+def page_events(
+    result: CalendarSearchResult,
+    page: int,
+    page_size: int,
+    collapse_after: timedelta | None = None,
+    window: timedelta | None = None,
+) -> CalendarSearchResult:
+    """
+    Returns a page of the events of every calendar, in order of start.
+
+    When the window is longer than `collapse_after`, every series is listed once, as
+    its first occurrence with a description of how it repeats.
+    """
+    rows = sorted(
+        (
+            (to_timestamp(event.start), name, event)
+            for name, calendar_events in result.events.items()
+            for event in _collapse(
+                calendar_events,
+                collapse_after is not None
+                and window is not None
+                and window > collapse_after,
+            )
+        ),
+        key=lambda row: row[0],
+    )
+
+    pages = max(1, math.ceil(len(rows) / page_size))
+    events: dict[str, list[CompactEvent]] = {name: [] for name in result.events}
+    for _, name, event in rows[(page - 1) * page_size : page * page_size]:
+        events[name].append(event)
+    return result.model_copy(update={"events": events, "page": page, "pages": pages})
+
+
+def describe_recurrence(event: CompactEvent) -> str:
+    """
+    Describes how a series repeats, e.g. "daily at 09:00 until 2030-03-01".
+    """
+    if not event.rrule:
+        return "repeats"
+    rule = dict(part.split("=", 1) for part in event.rrule.split(";") if "=" in part)
+
+    interval = int(rule.get("INTERVAL", "1"))
+    unit = _FREQUENCIES.get(rule.get("FREQ", ""), ("repeats", ""))
+    text = unit[0] if interval == 1 else f"every {interval} {unit[1]}"
+    if "BYDAY" in rule:
+        text += f" on {rule['BYDAY']}"
+    if isinstance(event.start, datetime):
+        text += f" at {event.start.strftime('%H:%M')}"
+    if "UNTIL" in rule:
+        until = rule["UNTIL"]
+        text += f" until {until[:4]}-{until[4:6]}-{until[6:8]}"
+    elif "COUNT" in rule:
+        text += f", {rule['COUNT']} times"
+    return text
+
+
+def format_events(
+    events: dict[str, list[CompactEvent]],
+    token_budget: int | None = None,
+) -> str:
+    """
+    Renders the events of every calendar as a single table sorted by start.
+
+    When `token_budget` is set, the latest events that do not fit are dropped and
+    replaced by a notice with how many were omitted.
+    """
+    rows = sorted(
+        (
+            (to_timestamp(event.start), _row(name, event))
+            for name, calendar_events in events.items()
+            for event in calendar_events
+        ),
+        key=lambda row: row[0],
+    )
+    if not rows:
+        return "No events."
+
+    header = "|".join(COLUMNS)
+    lines = [row for _, row in rows]
+    if token_budget is None:
+        return "\n".join([header, *lines])
+
+    used = count_tokens(header) + 1
+    row_tokens = [count_tokens(line) + 1 for line in lines]
+    if used + sum(row_tokens) <= token_budget:
+        return "\n".join([header, *lines])
+
+    # Keep room for the notice, sized for the worst case
+    used += count_tokens(_omitted_notice(len(lines)))
+    kept = 0
+    for tokens in row_tokens:
+        if used + tokens > token_budget:
+            break
+        used += tokens
+        kept += 1
+
+    return "\n".join([header, *lines[:kept], _omitted_notice(len(lines) - kept)])
+
+
+def _collapse(events: list[CompactEvent], collapse: bool) -> list[CompactEvent]:
+    if not collapse:
+        return events
+    collapsed: list[CompactEvent] = []
+    series: set[tuple[str, str | None]] = set()
+    for event in sorted(events, key=lambda event: to_timestamp(event.start)):
+        if not event.recurring:
+            collapsed.append(event)
+            continue
+        key = (event.uid, event.rrule)
+        if key not in series:
+            series.add(key)
+            collapsed.append(
+                event.model_copy(update={"repeats": describe_recurrence(event)})
+            )
+    return collapsed
+
+
+def _rrule(component: Component) -> str | None:
+    rrule = component.get("RRULE")
+    if rrule is None:
+        return None
+    if isinstance(rrule, list):
+        rrule = rrule[0]
+    return rrule.to_ical().decode()
+
+
+_FREQUENCIES = {
+    "SECONDLY": ("every second", "seconds"),
+    "MINUTELY": ("every minute", "minutes"),
+    "HOURLY": ("hourly", "hours"),
+    "DAILY": ("daily", "days"),
+    "WEEKLY": ("weekly", "weeks"),
+    "MONTHLY": ("monthly", "months"),
+    "YEARLY": ("yearly", "years"),
+}
+
+
+def _omitted_notice(count: int) -> str:
+    return f"({count} more events omitted, search a narrower time range to see them)"
+
+
+def _row(calendar: str, event: CompactEvent) -> str:
+    values = (
+        calendar,
+        event.uid,
+        event.summary,
+        _format_time(event.start),
+        _format_time(event.end),
+        event.location or "",
+        event.repeats or ("yes" if event.recurring else ""),
+    )
+    # Keep one event per line and the column count stable
+    return "|".join(
+        value.replace("|", "/").replace("\r", " ").replace("\n", " ")
+        for value in values
+    )
+
+
+def _format_time(value: date | datetime) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat(timespec="minutes")
+    return value.isoformat()
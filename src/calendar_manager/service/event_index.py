@@ -0,0 +1,226 @@
+import logging
+import threading
+from bisect import bisect_left
+from datetime import UTC, datetime, timedelta
+
+from src.calendar_manager.model.calendar_expansion import ExpandedEvent
+from src.calendar_manager.model.compact_event import CompactEvent
+from src.calendar_manager.service.calendar_worker import (
+    expand_calendar,
+    expand_window,
+)
+from src.calendar_manager.service.compact_events import cap_occurrences
+from src.calendar_manager.service.worker_pool import CalendarWorkerPool
+from src.common import to_timestamp
+
+logger = logging.getLogger(__name__)
+
+
+class EventIndex:
+    """
+    Interval index over the occurrences of a calendar expanded on a rolling horizon.
+
+    Occurrences are sorted by start and a segment tree keeps the latest end of every
+    range, so a window query only descends into ranges holding a match. When the
+    feed changes, only the events (grouped by UID) whose content changed are
+    expanded again. Parsing and expansion run on the worker pool, the index only
+    holds CompactEvent records.
+    """
+
+    past_days: int
+    future_days: int
+    worker_pool: CalendarWorkerPool
+
+    def __init__(
+        self,
+        past_days: int,
+        future_days: int,
+        worker_pool: CalendarWorkerPool | None = None,
+    ) -> None:
+        self.past_days = past_days
+        self.future_days = future_days
+        self.worker_pool = worker_pool or CalendarWorkerPool(0)
+
+        self._lock = threading.Lock()
+        self._content: bytes | None = None
+        self._timezones_fingerprint: str | None = None
+        self._expanded_at: datetime | None = None
+        self._horizon: tuple[float, float] = (0.0, 0.0)
+
+        self._groups: dict[str, ExpandedEvent] = {}
+
+        self._starts: list[float] = []
+        self._ends: list[float] = []
+        self._events: list[CompactEvent] = []
+        self._max_end: list[float] = []
+        self._size = 0
+
+    def query(
+        self,
+        content: bytes,
+        start: datetime,
+        end: datetime,
+        limit: int | None = None,
+        series_limit: int | None = None,
+    ) -> list[CompactEvent]:
+        """
+        Returns the occurrences of the ICS `content` overlapping [start, end), at most
+        `limit` of them and `series_limit` per recurring series.
+
+        Windows outside the indexed horizon are expanded directly from the calendar.
+        """
+        with self._lock:
+            self._update(content)
+
+            window_start, window_end = to_timestamp(start), to_timestamp(end)
+            horizon_start, horizon_end = self._horizon
+            if window_start >= horizon_start and window_end <= horizon_end:
+                return cap_occurrences(
+                    self._collect(window_start, window_end), limit, series_limit
+                )
+
+        return self.worker_pool.run(
+            expand_window, content, start, end, limit, series_limit
+        )
+
+    def cached(self, start: datetime, end: datetime) -> list[CompactEvent] | None:
+        """
+        Returns the indexed occurrences overlapping [start, end) as they are, or None
+        when nothing is indexed yet or the window is outside the horizon.
+        """
+        with self._lock:
+            window_start, window_end = to_timestamp(start), to_timestamp(end)
+            horizon_start, horizon_end = self._horizon
+            if self._content is None or not (
+                window_start >= horizon_start and window_end <= horizon_end
+            ):
+                return None
+            return self._collect(window_start, window_end)
+
+    def horizon_occurrences(
+        self,
+        content: bytes,
+    ) -> tuple[datetime, datetime, list[CompactEvent]]:
+        """
+        Returns the indexed horizon of the ICS `content` and every occurrence within
+        it.
+        """
+        with self._lock:
+            self._update(content)
+
+            horizon_start, horizon_end = self._horizon
+            return (
+                datetime.fromtimestamp(horizon_start, UTC),
+                datetime.fromtimestamp(horizon_end, UTC),
+                list(self._events),
+            )
+
+    def patch(self, events: bytes, uids: set[str]) -> list[CompactEvent] | None:
+        """
+        Replaces the occurrences of the events with a UID in `uids` by the ones of the
+        ICS `events`, without the rest of the calendar. Patched events are expanded
+        again from the calendar once its content changes.
+
+        Returns the new occurrences, or None when the calendar is not indexed yet.
+        """
+        with self._lock:
+            if self._content is None:
+                return None
+
+            expansion = self.worker_pool.run(
+                expand_calendar, events, self._horizon, {}, None
+            )
+            for uid in uids:
+                self._groups.pop(uid, None)
+            for uid, group in expansion.expanded.items():
+                # Matches no fingerprint, so the calendar's copy replaces it
+                group.fingerprint = ""
+                self._groups[uid] = group
+            self._rebuild()
+
+            logger.info(
+                f"Calendar index patched: {len(expansion.expanded)} events expanded, {len(uids)} replaced"
+            )
+            return [
+                o[2] for group in expansion.expanded.values() for o in group.occurrences
+            ]
+
+    # ---------- internal helpers ---------- #
+    def _update(self, content: bytes) -> None:
+        now = datetime.now(UTC)
+        expired = self._expanded_at is None or now - self._expanded_at > timedelta(1)
+
+        if not expired and content == self._content:
+            return
+
+        if expired:
+            # The horizon rolled, expand everything again
+            self._groups = {}
+            self._timezones_fingerprint = None
+            self._expanded_at = now
+            self._horizon = (
+                (now - timedelta(days=self.past_days)).timestamp(),
+                (now + timedelta(days=self.future_days)).timestamp(),
+            )
+
+        expansion = self.worker_pool.run(
+            expand_calendar,
+            content,
+            self._horizon,
+            {uid: group.fingerprint for uid, group in self._groups.items()},
+            self._timezones_fingerprint,
+        )
+        if expansion.reset:
+            self._groups = {}
+
+        removed = self._groups.keys() - set(expansion.uids)
+        for uid in removed:
+            del self._groups[uid]
+        self._groups.update(expansion.expanded)
+
+        logger.info(
+            f"Calendar index updated: {len(expansion.expanded)} events expanded, {len(removed)} removed, {len(expansion.uids) - len(expansion.expanded)} reused"
+        )
+
+        self._content = content
+        self._timezones_fingerprint = expansion.timezones_fingerprint
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        occurrences = sorted(
+            (o for group in self._groups.values() for o in group.occurrences),
+            key=lambda o: o[0],
+        )
+        self._starts = [o[0] for o in occurrences]
+        self._ends = [o[1] for o in occurrences]
+        self._events = [o[2] for o in occurrences]
+
+        size = 1
+        while size < len(occurrences):
+            size *= 2
+        self._size = size
+        self._max_end = [float("-inf")] * (2 * size)
+        self._max_end[size : size + len(self._ends)] = self._ends
+        for node in range(size - 1, 0, -1):
+            self._max_end[node] = max(
+                self._max_end[2 * node], self._max_end[2 * node + 1]
+            )
+
+    def _collect(self, window_start: float, window_end: float) -> list[CompactEvent]:
+        # Only occurrences starting before the window ends can overlap it
+        limit = bisect_left(self._starts, window_end)
+        found: list[int] = []
+
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= limit or self._max_end[node] <= window_start:
+                continue
+            if hi - lo == 1:
+                found.append(lo)
+                continue
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+
+        return [self._events[i] for i in found]
@@ -0,0 +1,161 @@
+import logging
+import sqlite3
+from contextlib import closing
+from datetime import UTC, datetime
+from pathlib import Path
+
+from src.calendar_manager.model.calendar_sync_state import CalendarSyncState
+from src.calendar_manager.model.compact_event import CompactEvent
+from src.calendar_manager.service.compact_events import cap_occurrences
+from src.common import to_timestamp
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calendar_sync (
+    calendar TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    horizon_start REAL NOT NULL,
+    horizon_end REAL NOT NULL,
+    last_synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS calendar_occurrences (
+    calendar TEXT NOT NULL,
+    uid TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    event TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calendar_occurrences_window
+    ON calendar_occurrences (calendar, start, end);
+"""
+
+
+class EventStore:
+    """
+    Local SQLite copy of the expanded occurrences of every calendar.
+
+    Each calendar is replaced as a whole on every sync and records the horizon
+    that was expanded and when it was last synced.
+    """
+
+    path: Path
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def replace_events(
+        self,
+        calendar: str,
+        url: str,
+        horizon_start: datetime,
+        horizon_end: datetime,
+        occurrences: list[CompactEvent],
+    ) -> None:
+        rows = self._rows(calendar, occurrences)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "DELETE FROM calendar_occurrences WHERE calendar = ?", (calendar,)
+            )
+            conn.executemany(
+                "INSERT INTO calendar_occurrences VALUES (?, ?, ?, ?, ?)", rows
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO calendar_sync VALUES (?, ?, ?, ?, ?)",
+                (
+                    calendar,
+                    url,
+                    to_timestamp(horizon_start),
+                    to_timestamp(horizon_end),
+                    datetime.now(UTC).timestamp(),
+                ),
+            )
+        logger.info(f"Mirrored {len(rows)} occurrences of calendar '{calendar}'")
+
+    def patch_events(
+        self,
+        calendar: str,
+        uids: set[str],
+        occurrences: list[CompactEvent],
+    ) -> None:
+        """
+        Replaces the occurrences of the events with a UID in `uids`, the rest of the
+        calendar and its sync state are left untouched.
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "DELETE FROM calendar_occurrences WHERE calendar = ? AND uid = ?",
+                [(calendar, uid) for uid in uids],
+            )
+            conn.executemany(
+                "INSERT INTO calendar_occurrences VALUES (?, ?, ?, ?, ?)",
+                self._rows(calendar, occurrences),
+            )
+        logger.info(
+            f"Patched {len(uids)} events of calendar '{calendar}' with {len(occurrences)} occurrences"
+        )
+
+    def sync_state(self, calendar: str) -> CalendarSyncState | None:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT horizon_start, horizon_end, last_synced_at FROM calendar_sync WHERE calendar = ?",
+                (calendar,),
+            ).fetchone()
+        if row is None:
+            return None
+        horizon_start, horizon_end, last_synced_at = (
+            datetime.fromtimestamp(value, UTC) for value in row
+        )
+        return CalendarSyncState(
+            horizon_start=horizon_start,
+            horizon_end=horizon_end,
+            last_synced_at=last_synced_at,
+        )
+
+    def query(
+        self,
+        calendar: str,
+        start: datetime,
+        end: datetime,
+        limit: int | None = None,
+        series_limit: int | None = None,
+    ) -> list[CompactEvent]:
+        window_start, window_end = to_timestamp(start), to_timestamp(end)
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                """SELECT event FROM calendar_occurrences
+                WHERE calendar = ? AND start < ? AND (end > ? OR start >= ?)
+                ORDER BY start""",
+                (calendar, window_end, window_start, window_start),
+            )
+            # Rows are decoded as they are read, up to the limits
+            return cap_occurrences(
+                (CompactEvent.model_validate_json(event) for (event,) in rows),
+                limit,
+                series_limit,
+            )
+
+    def _rows(
+        self, calendar: str, occurrences: list[CompactEvent]
+    ) -> list[tuple[str, str, float, float, str]]:
+        rows = []
+        for occurrence in occurrences:
+            start = to_timestamp(occurrence.start)
+            rows.append(
+                (
+                    calendar,
+                    occurrence.uid,
+                    start,
+                    max(to_timestamp(occurrence.end), start),
+                    occurrence.model_dump_json(),
+                )
+            )
+        return rows
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import BinaryIO
+
+import httpx
+
+from src.calendar_manager.model.cached_feed import CachedFeed, FeedCacheStats
+from src.calendar_manager.service.ics_stream import ICS_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class FeedCache:
+    """
+    Keeps ICS feeds in memory, keyed by URL.
+
+    Fresh entries are served without touching the network. Stale entries are
+    revalidated with a conditional GET (ETag / Last-Modified) so an unchanged feed
+    is not downloaded again. Concurrent requests for the same feed share a single
+    download. Feeds are kept as bytes, parsing is left to the calendar workers.
+    """
+
+    ttl: float
+    cache_dir: Path | None
+
+    def __init__(self, ttl: float, cache_dir: Path | None = None) -> None:
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self._entries: dict[str, CachedFeed] = {}
+        self._in_flight: dict[str, asyncio.Future[CachedFeed]] = {}
+        self._stats = FeedCacheStats()
+
+    async def get(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        ttl: float | None = None,
+    ) -> CachedFeed:
+        """
+        Returns the feed, revalidating it when it is older than `ttl` seconds, the
+        cache's TTL by default.
+        """
+        entry = self._entries.get(url)
+        if entry is None and self.cache_dir is not None:
+            entry = await asyncio.to_thread(self._load_from_disk, url)
+            if entry is not None:
+                self._entries[url] = entry
+
+        if entry is not None and self._is_fresh(entry, ttl):
+            self._stats.hits += 1
+            return entry
+
+        in_flight = self._in_flight.get(url)
+        if in_flight is not None:
+            self._stats.shared += 1
+            return await asyncio.shield(in_flight)
+
+        task = asyncio.ensure_future(self._fetch(client, url, entry))
+        self._in_flight[url] = task
+        task.add_done_callback(lambda _: self._in_flight.pop(url, None))
+        return await asyncio.shield(task)
+
+    def peek(self, url: str) -> CachedFeed | None:
+        """
+        Returns the feed held in memory, however old, without touching the network.
+        """
+        return self._entries.get(url)
+
+    def expire(self, url: str) -> None:
+        """
+        Makes the next `get` of the feed revalidate it.
+        """
+        entry = self._entries.get(url)
+        if entry is not None:
+            entry.fetched_at = datetime.fromtimestamp(0, UTC)
+
+    def stats(self) -> FeedCacheStats:
+        return self._stats.model_copy(update={"entries": len(self._entries)})
+
+    async def _fetch(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        entry: CachedFeed | None,
+    ) -> CachedFeed:
+        headers: dict[str, str] = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        async with client.stream("GET", url, headers=headers) as response:
+            if entry is not None and response.status_code == httpx.codes.NOT_MODIFIED:
+                self._stats.revalidations += 1
+                entry.fetched_at = datetime.now(UTC)
+                if self.cache_dir is not None:
+                    await asyncio.to_thread(self._save_metadata, entry)
+                return entry
+
+            response.raise_for_status()
+            self._stats.misses += 1
+            content = await self._read_feed(url, response)
+
+        fresh = CachedFeed(
+            url=url,
+            content=content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fetched_at=datetime.now(UTC),
+        )
+        self._entries[url] = fresh
+
+        if self.cache_dir is not None:
+            await asyncio.to_thread(self._save_metadata, fresh)
+
+        return fresh
+
+    async def _read_feed(
+        self,
+        url: str,
+        response: httpx.Response,
+    ) -> bytes:
+        """
+        Reads the feed and streams a copy to disk while it downloads, when enabled.
+        """
+        chunks: list[bytes] = []
+        copy = await asyncio.to_thread(self._open_copy, url)
+        try:
+            async for chunk in response.aiter_bytes(ICS_CHUNK_SIZE):
+                chunks.append(chunk)
+                if copy is not None:
+                    copy = await asyncio.to_thread(self._write_copy, url, copy, chunk)
+        except BaseException:
+            if copy is not None:
+                await asyncio.to_thread(copy.close)
+            raise
+
+        if copy is not None:
+            await asyncio.to_thread(self._commit_copy, url, copy)
+        return b"".join(chunks)
+
+    def _is_fresh(self, entry: CachedFeed, ttl: float | None = None) -> bool:
+        age = (datetime.now(UTC) - entry.fetched_at).total_seconds()
+        return age < (self.ttl if ttl is None else ttl)
+
+    # ---------- on-disk copy ---------- #
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        assert self.cache_dir is not None
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.ics", self.cache_dir / f"{key}.json"
+
+    def _open_copy(self, url: str) -> BinaryIO | None:
+        if self.cache_dir is None:
+            return None
+        ics_path, _ = self._paths(url)
+        try:
+            ics_path.parent.mkdir(parents=True, exist_ok=True)
+            return ics_path.with_suffix(".part").open("wb")
+        except OSError as e:
+            logger.warning(f"Could not write the cached feed {url}: {e}")
+            return None
+
+    def _write_copy(self, url: str, copy: BinaryIO, chunk: bytes) -> BinaryIO | None:
+        try:
+            copy.write(chunk)
+            return copy
+        except OSError as e:
+            logger.warning(f"Could not write the cached feed {url}: {e}")
+            copy.close()
+            # Never pair the new metadata with an older copy
+            Path(copy.name).unlink(missing_ok=True)
+            self._paths(url)[0].unlink(missing_ok=True)
+            return None
+
+    def _commit_copy(self, url: str, copy: BinaryIO) -> None:
+        ics_path, _ = self._paths(url)
+        try:
+            copy.close()
+            os.replace(copy.name, ics_path)
+        except OSError as e:
+            logger.warning(f"Could not write the cached feed {url}: {e}")
+
+    def _save_metadata(self, entry: CachedFeed) -> None:
+        _, metadata_path = self._paths(entry.url)
+        try:
+            metadata_path.write_text(
+                entry.model_dump_json(exclude={"content"}), encoding="utf-8"
+            )
+        except OSError as e:
+            logger.warning(f"Could not write the cached feed {entry.url}: {e}")
+
+    def _load_from_disk(self, url: str) -> CachedFeed | None:
+        ics_path, metadata_path = self._paths(url)
+        if not ics_path.is_file() or not metadata_path.is_file():
+            return None
+
+        try:
+            metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+            return CachedFeed(content=ics_path.read_bytes(), **metadata)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cached feed {url}: {e}")
+            return None
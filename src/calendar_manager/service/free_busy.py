@@ -0,0 +1,146 @@
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from src.calendar_manager.model.compact_event import CompactEvent
+from src.calendar_manager.model.find_free_slots import (
+    FindFreeSlots,
+    FreeBusy,
+    TimeBlock,
+)
+
+
+def merge_busy(intervals: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    """
+    Merges overlapping and back-to-back intervals with a sweep line over their
+    start and end points.
+    """
+    # Starts go before ends at the same instant so touching intervals are merged
+    points = sorted(
+        [(start, 0) for start, _ in intervals] + [(end, 1) for _, end in intervals]
+    )
+
+    blocks: list[tuple[float, float]] = []
+    depth = 0
+    block_start = 0.0
+    for instant, is_end in points:
+        if is_end:
+            depth -= 1
+            if depth == 0:
+                blocks.append((block_start, instant))
+        else:
+            if depth == 0:
+                block_start = instant
+            depth += 1
+    return blocks
+
+
+def find_free_slots(
+    events: dict[str, list[CompactEvent]],
+    payload: FindFreeSlots,
+) -> FreeBusy:
+    """
+    Merges the events of every calendar into busy blocks and returns the gaps within
+    the working hours that fit `payload.duration_minutes`.
+
+    Cancelled events and events marked as free (TRANSP:TRANSPARENT) do not block time.
+    """
+    zone = ZoneInfo(payload.timezone)
+    intervals = []
+    for calendar_events in events.values():
+        for event in calendar_events:
+            if not event.busy:
+                continue
+            start, end = _timestamp(event.start, zone), _timestamp(event.end, zone)
+            if end > start:
+                intervals.append((start, end))
+    busy = merge_busy(intervals)
+
+    duration = payload.duration_minutes * 60
+    window_start = _timestamp(payload.start_time, zone)
+    window_end = _timestamp(payload.end_time, zone)
+
+    free_busy = FreeBusy()
+    first_busy = 0
+    for work_start, work_end in _working_hours(payload, zone):
+        work_start, work_end = max(work_start, window_start), min(work_end, window_end)
+        if work_end <= work_start:
+            continue
+
+        # Both lists are sorted, skip the blocks that ended before this day
+        while first_busy < len(busy) and busy[first_busy][1] <= work_start:
+            first_busy += 1
+
+        cursor = work_start
+        for busy_start, busy_end in busy[first_busy:]:
+            if busy_start >= work_end:
+                break
+            free_busy.busy.append(
+                _block(max(busy_start, work_start), min(busy_end, work_end), zone)
+            )
+            if busy_start - cursor >= duration:
+                _add_slot(free_busy, payload, cursor, busy_start, zone)
+            cursor = max(cursor, busy_end)
+        if work_end - cursor >= duration:
+            _add_slot(free_busy, payload, cursor, work_end, zone)
+
+    return free_busy
+
+
+def format_free_busy(free_busy: FreeBusy, duration_minutes: int) -> str:
+    """
+    Renders the busy blocks and free slots as short lines for the LLM.
+    """
+    lines = [f"Free slots of at least {duration_minutes} minutes:"]
+    lines += [_format_block(slot) for slot in free_busy.free_slots] or ["none"]
+    if free_busy.omitted_slots:
+        lines.append(f"({free_busy.omitted_slots} more free slots omitted)")
+    lines.append("Busy within working hours:")
+    lines += [_format_block(block) for block in free_busy.busy] or ["none"]
+    return "\n".join(lines)
+
+
+def _add_slot(
+    free_busy: FreeBusy,
+    payload: FindFreeSlots,
+    start: float,
+    end: float,
+    zone: ZoneInfo,
+) -> None:
+    if len(free_busy.free_slots) < payload.max_slots:
+        free_busy.free_slots.append(_block(start, end, zone))
+    else:
+        free_busy.omitted_slots += 1
+
+
+def _working_hours(payload: FindFreeSlots, zone: ZoneInfo):
+    day = datetime.fromtimestamp(_timestamp(payload.start_time, zone), zone).date()
+    last_day = datetime.fromtimestamp(_timestamp(payload.end_time, zone), zone).date()
+    while day <= last_day:
+        if payload.include_weekends or day.weekday() < 5:
+            yield (
+                datetime.combine(day, payload.work_day_start, zone).timestamp(),
+                datetime.combine(day, payload.work_day_end, zone).timestamp(),
+            )
+        day += timedelta(days=1)
+
+
+def _timestamp(value: date | datetime, zone: ZoneInfo) -> float:
+    if isinstance(value, datetime):
+        # Floating times are read in the user's zone
+        return (value if value.tzinfo else value.replace(tzinfo=zone)).timestamp()
+    # All-day events span the whole day in the user's zone
+    return datetime.combine(value, time(), zone).timestamp()
+
+
+def _block(start: float, end: float, zone: ZoneInfo) -> TimeBlock:
+    return TimeBlock(
+        start=datetime.fromtimestamp(start, zone),
+        end=datetime.fromtimestamp(end, zone),
+    )
+
+
+def _format_block(block: TimeBlock) -> str:
+    start = block.start.isoformat(timespec="minutes")
+    if block.end.date() == block.start.date():
+        return f"{start} to {block.end.strftime('%H:%M')}"
+    return f"{start} to {block.end.isoformat(timespec='minutes')}"
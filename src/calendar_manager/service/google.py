@@ -3,8 +3,13 @@ from typing import Any
 
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
 
+from src.calendar_manager.model.calendar_mutation_result import (
+    CalendarMutationResult,
+)
 from src.calendar_manager.model.create_google_event import CreateGoogleCalendarEvent
+from src.calendar_manager.model.update_event import UpdateEvent
 from src.calendar_manager.model.update_google_event import UpdateGoogleCalendarEvent
 from src.common import remove_none_values
 from src.config import env
@@ -56,14 +61,20 @@ def create_google_event(
         raise
 
 
+def google_event_id(event_id: str) -> str:
+    """
+    Converts a Google iCalendar UID (`<event id>@google.com`) into the event ID.
+    """
+    return event_id.split("@")[0] if "@" in event_id else event_id
+
+
 def delete_google_event(client, calendar_id: str, event_id: str) -> None:
     """
     Deletes an event by ID from the given calendar.
     """
     try:
         # Convert the google uid to the event id if needed
-        if "@" in event_id:
-            event_id = event_id.split("@")[0]
+        event_id = google_event_id(event_id)
 
         client.events().delete(calendarId=calendar_id, eventId=event_id).execute()
         logging.info(f"Event {event_id} deleted successfully.")
@@ -92,31 +103,15 @@ def update_google_event(
     """
     try:
         # Convert the google uid to the event id if needed
-        if "@" in event_id:
-            event_id = event_id.split("@")[0]
-
-        # Retrieve the existing event
-        event = client.events().get(calendarId=calendar_id, eventId=event_id).execute()
-
-        # Update the event with new data
-        update_data = remove_none_values(
-            data.model_dump(
-                exclude_unset=True,
-                mode="json",
-            )
-        )
-        logging.info(f"Event is: {event}, update data is: {update_data}")
-        for key, value in update_data.items():
-            event[key] = value
-
-        event = remove_none_values(event)
+        event_id = google_event_id(event_id)
 
-        logging.info(f"Will update the event '{event_id}' with data: {event}")
+        # Patch only sends the fields that change, no need to read the event first
+        update_data = google_update_body(data)
+        logging.info(f"Will update the event '{event_id}' with data: {update_data}")
 
-        # Update the event
         updated_event = (
             client.events()
-            .update(calendarId=calendar_id, eventId=event_id, body=event)
+            .patch(calendarId=calendar_id, eventId=event_id, body=update_data)
             .execute()
         )
 
@@ -129,3 +124,150 @@ def update_google_event(
             f"Failed to update event '{event_id}' in calendar '{calendar_id}': {e}"
         )
         raise
+
+
+def google_update_body(data: UpdateGoogleCalendarEvent) -> dict[str, Any]:
+    """
+    Returns the fields of `data` that were set, as a Google Calendar patch body.
+    """
+    return remove_none_values(data.model_dump(exclude_unset=True, mode="json"))
+
+
+def create_google_events(
+    client,
+    calendar_id: str,
+    events_data: list[CreateGoogleCalendarEvent],
+) -> list[CalendarMutationResult]:
+    """
+    Creates several events with batch requests.
+
+    Returns:
+        One result per event, in the same order, with the created event or the error.
+    """
+    requests = [
+        (
+            None,
+            client.events().insert(
+                calendarId=calendar_id,
+                body=remove_none_values(data.model_dump(mode="json")),
+            ),
+        )
+        for data in events_data
+    ]
+    return execute_google_batch(client, "create", requests)
+
+
+def update_google_events(
+    client,
+    calendar_id: str,
+    updates: list[UpdateEvent],
+) -> list[CalendarMutationResult]:
+    """
+    Patches several events with batch requests.
+
+    Returns:
+        One result per event, in the same order, with the updated event or the error.
+    """
+    requests = []
+    for update in updates:
+        event_id = google_event_id(update.id)
+        requests.append(
+            (
+                event_id,
+                client.events().patch(
+                    calendarId=calendar_id,
+                    eventId=event_id,
+                    body=google_update_body(update.data),
+                ),
+            )
+        )
+    return execute_google_batch(client, "update", requests)
+
+
+def delete_google_events(
+    client,
+    calendar_id: str,
+    event_ids: list[str],
+) -> list[CalendarMutationResult]:
+    """
+    Deletes several events with batch requests.
+
+    Returns:
+        One result per event, in the same order, with the error if it failed.
+    """
+    requests = []
+    for event_id in event_ids:
+        event_id = google_event_id(event_id)
+        requests.append(
+            (
+                event_id,
+                client.events().delete(calendarId=calendar_id, eventId=event_id),
+            )
+        )
+    return execute_google_batch(client, "delete", requests)
+
+
+def execute_google_batch(
+    client,
+    action: str,
+    requests: list[tuple[str | None, HttpRequest]],
+) -> list[CalendarMutationResult]:
+    """
+    Sends `(event id, request)` pairs in batches of `CALENDAR_BATCH_SIZE`, one HTTP
+    round-trip per batch instead of one per event.
+
+    A request that fails does not fail the others, its error is kept in its result.
+    """
+    results: list[CalendarMutationResult | None] = [None] * len(requests)
+
+    def callback(request_id: str, response: Any, exception: Exception | None) -> None:
+        index = int(request_id)
+        event_id = requests[index][0]
+        if exception is not None:
+            logging.error(f"Failed to {action} event '{event_id}': {exception}")
+            results[index] = CalendarMutationResult(
+                action=action,
+                event_id=event_id,
+                error=str(exception),
+                status_code=getattr(getattr(exception, "resp", None), "status", None),
+            )
+            return
+
+        # Deletions answer with an empty body
+        event = response or None
+        results[index] = CalendarMutationResult(
+            action=action,
+            event_id=event_id or (event or {}).get("id"),
+            event=event,
+        )
+
+    for offset in range(0, len(requests), env.CALENDAR_BATCH_SIZE):
+        indexes = range(offset, min(offset + env.CALENDAR_BATCH_SIZE, len(requests)))
+        batch = client.new_batch_http_request(callback=callback)
+        for index in indexes:
+            batch.add(requests[index][1], request_id=str(index))
+
+        try:
+            batch.execute()
+        except Exception as e:
+            # The whole batch failed to be sent
+            logging.error(f"Failed to send a batch of {len(indexes)} {action}s: {e}")
+            for index in indexes:
+                if results[index] is None:
+                    results[index] = CalendarMutationResult(
+                        action=action, event_id=requests[index][0], error=str(e)
+                    )
+
+    # One result per event, in order, even when Google left a request unanswered
+    completed = [
+        result
+        if result is not None
+        else CalendarMutationResult(
+            action=action, event_id=requests[index][0], error="No response in batch"
+        )
+        for index, result in enumerate(results)
+    ]
+    logging.info(
+        f"Batch {action} of {len(requests)} events: {sum(1 for r in completed if r.ok)} succeeded"
+    )
+    return completed
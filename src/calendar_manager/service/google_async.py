@@ -0,0 +1,388 @@
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Awaitable
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+import httpx
+from google.auth import crypt, jwt
+
+from src.calendar_manager.model.calendar_mutation_result import (
+    CalendarMutationResult,
+)
+from src.calendar_manager.model.create_google_event import CreateGoogleCalendarEvent
+from src.calendar_manager.model.update_event import UpdateEvent
+from src.calendar_manager.model.update_google_event import UpdateGoogleCalendarEvent
+from src.calendar_manager.service.google import google_event_id, google_update_body
+from src.common import remove_none_values
+from src.config import env
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CALENDAR_API = "https://www.googleapis.com/calendar/v3"
+GOOGLE_CALENDAR_SCOPES = ["https://www.googleapis.com/auth/calendar"]
+
+# Tokens are refreshed this many seconds before Google expires them
+_TOKEN_EXPIRY_MARGIN = 60
+_TOKEN_LIFETIME = 3600
+_JWT_BEARER_GRANT = "urn:ietf:params:oauth:grant-type:jwt-bearer"
+
+
+class GoogleServiceAccountToken:
+    """
+    OAuth access token of a service account, requested with a signed JWT assertion
+    (RFC 7523) and cached until shortly before it expires.
+
+    Concurrent callers share a single refresh.
+    """
+
+    service_account_email: str
+    token_uri: str
+    scopes: list[str]
+    refreshes: int
+
+    def __init__(
+        self,
+        signer: crypt.Signer,
+        service_account_email: str,
+        token_uri: str,
+        scopes: list[str],
+    ) -> None:
+        self.signer = signer
+        self.service_account_email = service_account_email
+        self.token_uri = token_uri
+        self.scopes = scopes
+        self.refreshes = 0
+        self._token: str | None = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_service_account_file(
+        cls, path: Path, scopes: list[str]
+    ) -> "GoogleServiceAccountToken":
+        info = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(
+            crypt.RSASigner.from_service_account_info(info),
+            info["client_email"],
+            info["token_uri"],
+            scopes,
+        )
+
+    async def get(self, client: httpx.AsyncClient, rejected: str | None = None) -> str:
+        """
+        Returns a valid access token, requesting a new one when the cached token
+        expired or is the `rejected` one.
+        """
+        if self._is_valid(rejected):
+            return self._token
+        async with self._lock:
+            # Another caller may have refreshed it while this one waited
+            if not self._is_valid(rejected):
+                await self._refresh(client)
+            return self._token
+
+    def _is_valid(self, rejected: str | None) -> bool:
+        return (
+            self._token is not None
+            and self._token != rejected
+            and time.monotonic() < self._expires_at
+        )
+
+    async def _refresh(self, client: httpx.AsyncClient) -> None:
+        issued_at = int(time.time())
+        assertion = jwt.encode(
+            self.signer,
+            {
+                "iss": self.service_account_email,
+                "scope": " ".join(self.scopes),
+                "aud": self.token_uri,
+                "iat": issued_at,
+                "exp": issued_at + _TOKEN_LIFETIME,
+            },
+        )
+        requested_at = time.monotonic()
+        response = await client.post(
+            self.token_uri,
+            data={"grant_type": _JWT_BEARER_GRANT, "assertion": assertion.decode()},
+        )
+        response.raise_for_status()
+        grant = response.json()
+
+        self._token = grant["access_token"]
+        self._expires_at = (
+            requested_at
+            + grant.get("expires_in", _TOKEN_LIFETIME)
+            - _TOKEN_EXPIRY_MARGIN
+        )
+        self.refreshes += 1
+        logger.info(f"Refreshed the access token of {self.service_account_email}")
+
+
+class AsyncGoogleCalendarClient:
+    """
+    Google Calendar REST client on a pooled httpx connection.
+
+    Requests never block the event loop and, when `h2` is installed, concurrent calls
+    are multiplexed over a single HTTP/2 connection. A request answered with 401 is
+    sent once more with a new access token.
+    """
+
+    base_url: str
+
+    def __init__(
+        self,
+        token: GoogleServiceAccountToken,
+        http_client: httpx.AsyncClient | None = None,
+        base_url: str = GOOGLE_CALENDAR_API,
+    ) -> None:
+        self.token = token
+        self.http_client = http_client
+        self.base_url = base_url
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None = None,
+    ) -> dict[str, Any] | None:
+        """
+        Sends an authorized request and returns its JSON body, None when it is empty.
+        """
+        client = self._get_http_client()
+        token = await self.token.get(client)
+        response = await self._send(client, method, path, body, token)
+        if response.status_code == httpx.codes.UNAUTHORIZED:
+            token = await self.token.get(client, rejected=token)
+            response = await self._send(client, method, path, body, token)
+
+        response.raise_for_status()
+        return response.json() if response.content else None
+
+    async def insert_event(
+        self, calendar_id: str, body: dict[str, Any]
+    ) -> dict[str, Any]:
+        return await self.request("POST", self._events_path(calendar_id), body)
+
+    async def patch_event(
+        self, calendar_id: str, event_id: str, body: dict[str, Any]
+    ) -> dict[str, Any]:
+        return await self.request(
+            "PATCH", self._events_path(calendar_id, event_id), body
+        )
+
+    async def delete_event(self, calendar_id: str, event_id: str) -> None:
+        await self.request("DELETE", self._events_path(calendar_id, event_id))
+
+    async def watch_events(
+        self, calendar_id: str, body: dict[str, Any]
+    ) -> dict[str, Any]:
+        return await self.request(
+            "POST", f"{self._events_path(calendar_id)}/watch", body
+        )
+
+    async def stop_channel(self, body: dict[str, Any]) -> None:
+        await self.request("POST", "/channels/stop", body)
+
+    async def aclose(self) -> None:
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        # Created lazily so that it binds to the running event loop
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(
+                # HTTP/2 needs the optional `h2` package, HTTP/1.1 is pooled too
+                http2=find_spec("h2") is not None,
+                timeout=env.CALENDAR_FETCH_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=env.CALENDAR_API_CONCURRENCY,
+                    max_keepalive_connections=env.CALENDAR_API_CONCURRENCY,
+                ),
+            )
+        return self.http_client
+
+    async def _send(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None,
+        token: str,
+    ) -> httpx.Response:
+        return await client.request(
+            method,
+            f"{self.base_url}{path}",
+            json=body,
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    def _events_path(self, calendar_id: str, event_id: str | None = None) -> str:
+        path = f"/calendars/{quote(calendar_id, safe='')}/events"
+        if event_id is not None:
+            path += f"/{quote(event_id, safe='')}"
+        return path
+
+
+def initialize_async_google_calendar() -> AsyncGoogleCalendarClient:
+    token = GoogleServiceAccountToken.from_service_account_file(
+        env.DATA_DIR / env.GOOGLE_SERVICE_ACCOUNT_FILE, GOOGLE_CALENDAR_SCOPES
+    )
+    logger.info("Async Google Calendar client initialized successfully.")
+    return AsyncGoogleCalendarClient(token)
+
+
+async def acreate_google_event(
+    client: AsyncGoogleCalendarClient,
+    calendar_id: str,
+    event_data: CreateGoogleCalendarEvent,
+    event_id: str | None = None,
+) -> dict[str, Any]:
+    """
+    Creates an event in the Google Calendar, see `create_google_event`.
+
+    When `event_id` is given the event is created with it, so sending the same
+    creation twice fails with 409 instead of duplicating the event.
+    """
+    body = remove_none_values(event_data.model_dump(mode="json"))
+    if event_id is not None:
+        body["id"] = event_id
+    logger.info(f"Creating event in calendar '{calendar_id}' with data: {body}")
+    event = await client.insert_event(calendar_id, body)
+    logger.info(f"Event created successfully: {event.get('htmlLink')}")
+    return event
+
+
+async def aupdate_google_event(
+    client: AsyncGoogleCalendarClient,
+    calendar_id: str,
+    event_id: str,
+    data: UpdateGoogleCalendarEvent,
+) -> dict[str, Any]:
+    """
+    Patches an existing event in Google Calendar, see `update_google_event`.
+    """
+    event_id = google_event_id(event_id)
+    event = await client.patch_event(calendar_id, event_id, google_update_body(data))
+    logger.info(f"Event '{event_id}' updated successfully: {event.get('htmlLink')}")
+    return event
+
+
+async def adelete_google_event(
+    client: AsyncGoogleCalendarClient,
+    calendar_id: str,
+    event_id: str,
+) -> None:
+    """
+    Deletes an event by ID from the given calendar, see `delete_google_event`.
+    """
+    event_id = google_event_id(event_id)
+    await client.delete_event(calendar_id, event_id)
+    logger.info(f"Event {event_id} deleted successfully.")
+
+
+async def acreate_google_events(
+    client: AsyncGoogleCalendarClient,
+    calendar_id: str,
+    events_data: list[CreateGoogleCalendarEvent],
+    event_ids: list[str] | None = None,
+) -> list[CalendarMutationResult]:
+    """
+    Creates several events concurrently, returning one result per event in the
+    same order.
+    """
+    ids: list[str | None] = (
+        list(event_ids) if event_ids is not None else [None] * len(events_data)
+    )
+    return await _gather_mutations(
+        "create",
+        [
+            (event_id, acreate_google_event(client, calendar_id, data, event_id))
+            for data, event_id in zip(events_data, ids, strict=True)
+        ],
+    )
+
+
+async def aupdate_google_events(
+    client: AsyncGoogleCalendarClient,
+    calendar_id: str,
+    updates: list[UpdateEvent],
+) -> list[CalendarMutationResult]:
+    """
+    Patches several events concurrently, returning one result per event in the
+    same order.
+    """
+    return await _gather_mutations(
+        "update",
+        [
+            (
+                google_event_id(update.id),
+                aupdate_google_event(client, calendar_id, update.id, update.data),
+            )
+            for update in updates
+        ],
+    )
+
+
+async def adelete_google_events(
+    client: AsyncGoogleCalendarClient,
+    calendar_id: str,
+    event_ids: list[str],
+) -> list[CalendarMutationResult]:
+    """
+    Deletes several events concurrently, returning one result per event in the
+    same order.
+    """
+    return await _gather_mutations(
+        "delete",
+        [
+            (
+                google_event_id(event_id),
+                adelete_google_event(client, calendar_id, event_id),
+            )
+            for event_id in event_ids
+        ],
+    )
+
+
+async def _gather_mutations(
+    action: str,
+    calls: list[tuple[str | None, Awaitable[dict[str, Any] | None]]],
+) -> list[CalendarMutationResult]:
+    # Bounded so a large plan does not open more streams than the pool allows
+    semaphore = asyncio.Semaphore(env.CALENDAR_API_CONCURRENCY)
+
+    async def run(
+        event_id: str | None, call: Awaitable[dict[str, Any] | None]
+    ) -> CalendarMutationResult:
+        async with semaphore:
+            try:
+                event = await call
+            except Exception as e:
+                logger.error(f"Failed to {action} event '{event_id}': {e}")
+                return CalendarMutationResult(
+                    action=action,
+                    event_id=event_id,
+                    error=str(e),
+                    status_code=(
+                        e.response.status_code
+                        if isinstance(e, httpx.HTTPStatusError)
+                        else None
+                    ),
+                )
+        return CalendarMutationResult(
+            action=action,
+            event_id=event_id or (event or {}).get("id"),
+            event=event or None,
+        )
+
+    results = await asyncio.gather(*(run(event_id, call) for event_id, call in calls))
+    logger.info(
+        f"{action.capitalize()} of {len(results)} events: {sum(1 for r in results if r.ok)} succeeded"
+    )
+    return results
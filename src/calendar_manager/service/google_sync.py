@@ -0,0 +1,325 @@
+import logging
+import threading
+from contextlib import AbstractContextManager
+from datetime import UTC, date, datetime
+from typing import Any
+from urllib.parse import unquote, urlparse
+from zoneinfo import ZoneInfo
+
+import icalendar
+from googleapiclient.errors import HttpError
+
+from src.common import remove_none_values
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_SCHEME = "google://"
+
+
+def google_calendar_id(calendar_url: str) -> str | None:
+    """
+    Returns the ID of the Google calendar read through `calendar_url`, either the
+    API mirror or the secret iCal address, or None for other calendars.
+    """
+    if calendar_url.startswith(GOOGLE_SCHEME):
+        return calendar_url.removeprefix(GOOGLE_SCHEME)
+    url = urlparse(calendar_url)
+    # https://calendar.google.com/calendar/ical/<calendar id>/private-<key>/basic.ics
+    if url.hostname == "calendar.google.com":
+        _, _, rest = unquote(url.path).partition("/ical/")
+        calendar_id, _, _ = rest.partition("/")
+        return calendar_id or None
+    return None
+
+
+def google_event_time(value: dict[str, Any]) -> date | datetime:
+    """
+    Converts a Google Calendar start/end object into a date or an aware datetime.
+    """
+    if "date" in value:
+        return date.fromisoformat(value["date"])
+
+    moment = datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00"))
+    if value.get("timeZone"):
+        # Keep the zone so recurrences follow its daylight saving rules
+        moment = moment.astimezone(ZoneInfo(value["timeZone"]))
+    elif moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return moment
+
+
+def google_event_to_ical(resource: dict[str, Any]) -> icalendar.Event:
+    """
+    Converts a Google Calendar event resource into an iCalendar VEVENT.
+    """
+    event = icalendar.Event()
+    event.add("UID", resource.get("iCalUID") or resource["id"])
+    event.add("SUMMARY", resource.get("summary", ""))
+    if resource.get("description"):
+        event.add("DESCRIPTION", resource["description"])
+    if resource.get("location"):
+        event.add("LOCATION", resource["location"])
+    if resource.get("updated"):
+        event.add("LAST-MODIFIED", datetime.fromisoformat(resource["updated"]))
+    event.add("DTSTART", google_event_time(resource["start"]))
+    event.add("DTEND", google_event_time(resource["end"]))
+    if "originalStartTime" in resource:
+        event.add("RECURRENCE-ID", google_event_time(resource["originalStartTime"]))
+
+    for line in resource.get("recurrence", []):
+        # RRULE/EXDATE/RDATE lines are already in iCalendar format
+        parsed = icalendar.Event.from_ical(f"BEGIN:VEVENT\r\n{line}\r\nEND:VEVENT\r\n")
+        for key, value in parsed.items():
+            if key in event:
+                existing = event[key]
+                existing = existing if isinstance(existing, list) else [existing]
+                event[key] = [*existing, value]
+            else:
+                event[key] = value
+
+    return event
+
+
+class GoogleCalendarSync:
+    """
+    Local mirror of a Google calendar kept up to date with incremental sync.
+
+    The first sync lists every event, later syncs send the stored `syncToken` and
+    only receive what changed since. When Google expires the token (410 Gone) the
+    mirror is rebuilt with a full sync.
+    """
+
+    calendar_id: str
+    events: dict[str, dict[str, Any]]
+    sync_token: str | None
+    synced_at: datetime | None
+
+    def __init__(
+        self,
+        client,
+        calendar_id: str,
+        client_lock: AbstractContextManager | None = None,
+    ) -> None:
+        self.client = client
+        self.calendar_id = calendar_id
+        self.events = {}
+        self.sync_token = None
+        self.synced_at = None
+        # The googleapiclient service is not thread-safe, share the lock between
+        # every sync using the same client.
+        self._client_lock = client_lock or threading.Lock()
+        self._lock = threading.Lock()
+        self._calendar: icalendar.Calendar | None = None
+        self._ics: bytes | None = None
+
+    def sync(self) -> int:
+        """
+        Applies the changes since the last sync. Returns the number of changes.
+        """
+        with self._lock:
+            full = self.sync_token is None
+            try:
+                items, next_sync_token = self._list_changes(self.sync_token)
+            except HttpError as e:
+                if e.resp.status != 410:
+                    raise
+                logger.warning(
+                    f"Sync token of calendar '{self.calendar_id}' expired, running a full sync."
+                )
+                full = True
+                items, next_sync_token = self._list_changes(None)
+
+            if full:
+                self.events = {}
+            for item in items:
+                if item.get("status") == "cancelled" and "recurringEventId" not in item:
+                    self.events.pop(item["id"], None)
+                else:
+                    # Cancelled instances are kept to exclude them from their series
+                    self.events[item["id"]] = item
+
+            if full or items:
+                self._calendar = None
+                self._ics = None
+            self.sync_token = next_sync_token
+            self.synced_at = datetime.now(UTC)
+
+            logger.info(
+                f"{'Full' if full else 'Incremental'} sync of calendar '{self.calendar_id}' applied {len(items)} changes."
+            )
+            return len(items)
+
+    def apply(
+        self, resources: list[dict[str, Any]], deleted_ids: list[str]
+    ) -> set[str]:
+        """
+        Applies modifications made through Lis without waiting for the next sync,
+        which later confirms them. Returns the UIDs of the events that changed.
+        """
+        with self._lock:
+            if self.synced_at is None:
+                # Nothing mirrored yet, the first sync includes them
+                return set()
+
+            changed: dict[str, dict[str, Any]] = {}
+            for resource in resources:
+                changed[resource["id"]] = resource
+            for event_id in deleted_ids:
+                resource = self.events.get(event_id) or self._instance(event_id)
+                if resource is not None:
+                    changed[event_id] = {**resource, "status": "cancelled"}
+
+            uids: set[str] = set()
+            for event_id, resource in changed.items():
+                uids.add(
+                    resource.get("iCalUID")
+                    or self._series_uid(resource)
+                    or resource["id"]
+                )
+                if resource.get("status") == "cancelled" and (
+                    "recurringEventId" not in resource
+                ):
+                    self.events.pop(event_id, None)
+                    # The instances of a deleted series go with it
+                    for instance_id, instance in list(self.events.items()):
+                        if instance.get("recurringEventId") == event_id:
+                            del self.events[instance_id]
+                else:
+                    self.events[event_id] = resource
+
+            if changed:
+                self._calendar = None
+                self._ics = None
+            logger.info(
+                f"Applied {len(changed)} local modifications to calendar '{self.calendar_id}'."
+            )
+            return uids
+
+    def calendar(self, max_age: float) -> icalendar.Calendar:
+        """
+        Returns the mirror as an iCalendar calendar, syncing it first when it is
+        older than `max_age` seconds.
+
+        The same object is returned until the mirror changes.
+        """
+        if self._is_stale(max_age):
+            self.sync()
+
+        with self._lock:
+            if self._calendar is None:
+                self._calendar = self._build_calendar()
+            return self._calendar
+
+    def ics(self, max_age: float) -> bytes:
+        """
+        Same as `calendar`, serialized as ICS for the calendar workers.
+        """
+        if self._is_stale(max_age):
+            self.sync()
+
+        with self._lock:
+            if self._ics is None:
+                if self._calendar is None:
+                    self._calendar = self._build_calendar()
+                self._ics = self._calendar.to_ical()
+            return self._ics
+
+    def _instance(self, event_id: str) -> dict[str, Any] | None:
+        # Instances of a series are not listed until modified, their ID is the ID of
+        # the series followed by their original start
+        series_id, _, original_start = event_id.rpartition("_")
+        series = self.events.get(series_id)
+        if series is None or not original_start:
+            return None
+        try:
+            if "T" in original_start:
+                moment = datetime.strptime(original_start, "%Y%m%dT%H%M%SZ")
+                start = {
+                    "dateTime": moment.replace(tzinfo=UTC).isoformat(),
+                    "timeZone": series["start"].get("timeZone"),
+                }
+            else:
+                day = datetime.strptime(original_start, "%Y%m%d").date()
+                start = {"date": day.isoformat()}
+        except ValueError:
+            return None
+        start = remove_none_values(start)
+        return remove_none_values(
+            {
+                "id": event_id,
+                "recurringEventId": series_id,
+                "iCalUID": series.get("iCalUID"),
+                "originalStartTime": start,
+                "start": start,
+                "end": start,
+            }
+        )
+
+    def _series_uid(self, resource: dict[str, Any]) -> str | None:
+        series = self.events.get(resource.get("recurringEventId", ""))
+        return series.get("iCalUID") if series is not None else None
+
+    def _is_stale(self, max_age: float) -> bool:
+        return (
+            self.synced_at is None
+            or (datetime.now(UTC) - self.synced_at).total_seconds() >= max_age
+        )
+
+    def _list_changes(
+        self,
+        sync_token: str | None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        items: list[dict[str, Any]] = []
+        page_token: str | None = None
+
+        while True:
+            params: dict[str, Any] = {
+                "calendarId": self.calendar_id,
+                "maxResults": 2500,
+                "showDeleted": sync_token is not None,
+            }
+            if sync_token is not None:
+                params["syncToken"] = sync_token
+            if page_token is not None:
+                params["pageToken"] = page_token
+
+            with self._client_lock:
+                response = self.client.events().list(**params).execute()
+
+            items.extend(response.get("items", []))
+            page_token = response.get("nextPageToken")
+            if page_token is None:
+                return items, response.get("nextSyncToken")
+
+    def _build_calendar(self) -> icalendar.Calendar:
+        calendar = icalendar.Calendar()
+        calendar.add("PRODID", "-//Lis//Google Calendar mirror//EN")
+        calendar.add("VERSION", "2.0")
+
+        masters: dict[str, icalendar.Event] = {}
+        instances: list[dict[str, Any]] = []
+        for resource in self.events.values():
+            if "recurringEventId" in resource:
+                instances.append(resource)
+            else:
+                masters[resource["id"]] = google_event_to_ical(resource)
+
+        for resource in instances:
+            master = masters.get(resource["recurringEventId"])
+            if resource.get("status") == "cancelled":
+                if master is not None:
+                    master.add(
+                        "EXDATE", google_event_time(resource["originalStartTime"])
+                    )
+                continue
+
+            override = google_event_to_ical(resource)
+            if master is not None:
+                # Overrides must share the UID of their series
+                override["UID"] = master["UID"]
+            calendar.add_component(override)
+
+        for master in masters.values():
+            calendar.add_component(master)
+
+        return calendar
@@ -0,0 +1,135 @@
+import hmac
+import logging
+import secrets
+import uuid
+from collections.abc import Mapping
+from datetime import UTC, datetime
+
+import httpx
+
+from src.calendar_manager.model.google_channel import GoogleChannel
+from src.calendar_manager.service.google_async import AsyncGoogleCalendarClient
+from src.config import env
+
+logger = logging.getLogger(__name__)
+
+# Sent once when a channel is created, before any change
+SYNC_STATE = "sync"
+
+
+class GoogleCalendarWatch:
+    """
+    Push notification channels (`events.watch`) of Google calendars.
+
+    A channel makes Google post a notification to `address` whenever an event of its
+    calendar changes. Channels expire: `renew` opens a new channel for every one
+    about to expire before stopping it, so no change goes unnoticed in between.
+    Notifications carry the secret token of their channel and are checked against it.
+    """
+
+    address: str
+    ttl: int
+    renew_margin: float
+    channels: dict[str, GoogleChannel]
+
+    def __init__(
+        self,
+        client: AsyncGoogleCalendarClient,
+        address: str,
+        ttl: int = env.CALENDAR_WATCH_TTL,
+        renew_margin: float = env.CALENDAR_WATCH_RENEW_MARGIN,
+    ) -> None:
+        self.client = client
+        self.address = address
+        self.ttl = ttl
+        self.renew_margin = renew_margin
+        self.channels = {}
+
+    async def watch(self, calendar_id: str) -> GoogleChannel:
+        """
+        Opens a channel notifying the changes of the events of `calendar_id`.
+        """
+        channel_id, token = str(uuid.uuid4()), secrets.token_urlsafe(32)
+        response = await self.client.watch_events(
+            calendar_id,
+            {
+                "id": channel_id,
+                "type": "web_hook",
+                "address": self.address,
+                "token": token,
+                "params": {"ttl": str(self.ttl)},
+            },
+        )
+        channel = GoogleChannel(
+            id=channel_id,
+            calendar_id=calendar_id,
+            resource_id=response["resourceId"],
+            token=token,
+            # Milliseconds since the epoch
+            expiration=datetime.fromtimestamp(int(response["expiration"]) / 1000, UTC),
+        )
+        self.channels[channel.id] = channel
+        logger.info(
+            f"Watching calendar '{calendar_id}' with channel {channel.id} until {channel.expiration}"
+        )
+        return channel
+
+    async def stop(self, channel: GoogleChannel) -> None:
+        self.channels.pop(channel.id, None)
+        try:
+            await self.client.stop_channel(
+                {"id": channel.id, "resourceId": channel.resource_id}
+            )
+        except httpx.HTTPStatusError as e:
+            # Already expired
+            if e.response.status_code != httpx.codes.NOT_FOUND:
+                raise
+        logger.info(f"Stopped channel {channel.id} of calendar '{channel.calendar_id}'")
+
+    async def renew(self) -> list[GoogleChannel]:
+        """
+        Replaces the channels expiring within the renewal margin. Returns the new
+        channels.
+        """
+        renewed: list[GoogleChannel] = []
+        for channel in list(self.channels.values()):
+            if not channel.expires_within(self.renew_margin):
+                continue
+            try:
+                renewed.append(await self.watch(channel.calendar_id))
+                await self.stop(channel)
+            except Exception as e:
+                logger.error(f"Could not renew channel {channel.id}: {e}")
+        return renewed
+
+    def calendar_ids(self) -> set[str]:
+        """
+        Calendars with an open channel.
+        """
+        return {
+            channel.calendar_id
+            for channel in self.channels.values()
+            if not channel.expires_within(0)
+        }
+
+    def verify(self, headers: Mapping[str, str]) -> GoogleChannel | None:
+        """
+        Returns the channel a notification was sent on, or None when the channel is
+        unknown or the token does not match.
+        """
+        channel = self.channels.get(headers.get("X-Goog-Channel-ID", ""))
+        if channel is None or not hmac.compare_digest(
+            headers.get("X-Goog-Channel-Token", ""), channel.token
+        ):
+            return None
+        return channel
+
+    async def aclose(self) -> None:
+        """
+        Stops every channel, Google would keep notifying them until they expire.
+        """
+        for channel in list(self.channels.values()):
+            try:
+                await self.stop(channel)
+            except Exception as e:
+                logger.warning(f"Could not stop channel {channel.id}: {e}")
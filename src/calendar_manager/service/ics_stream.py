@@ -0,0 +1,231 @@
+import codecs
+import logging
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+
+import icalendar
+from icalendar.cal import Component
+
+from src.common import to_timestamp
+
+logger = logging.getLogger(__name__)
+
+ICS_CHUNK_SIZE = 64 * 1024
+
+# Floating and TZID times are read as UTC, no zone is more than a day away
+_SLACK = timedelta(days=1).total_seconds()
+_WINDOW_PROPERTIES = {"DTSTART", "DTEND", "DURATION", "RRULE", "RDATE", "RECURRENCE-ID"}
+
+
+class IcsStreamParser:
+    """
+    Incremental ICS parser fed with chunks of bytes.
+
+    Only the content lines of the component being read are kept in memory, and each
+    top-level component (VEVENT, VTIMEZONE, ...) is returned as soon as it ends. When
+    a window is given, single events that fall clearly outside of it are dropped
+    before being parsed. Recurring masters and their overrides are always kept so
+    the series can still be expanded.
+
+    Several VCALENDAR objects in a row, like the resources of a CalDAV report, are
+    read as a single calendar.
+    """
+
+    dropped: int
+
+    def __init__(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> None:
+        self._window = (
+            (to_timestamp(start) - _SLACK, to_timestamp(end) + _SLACK)
+            if start is not None and end is not None
+            else None
+        )
+        self.dropped = 0
+
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._tail = ""
+        self._line: str | None = None
+        self._properties: list[str] = []
+        self._lines: list[str] | None = None
+        self._component_name = ""
+        self._window_lines: dict[str, str] = {}
+        self._depth = 0
+        self._timezones: set[str] = set()
+
+    def feed(self, chunk: bytes) -> list[Component]:
+        """
+        Parses a chunk and returns the components completed by it.
+        """
+        lines = (self._tail + self._decoder.decode(chunk)).split("\n")
+        self._tail = lines.pop()
+        components = self._read(lines)
+        if self._tail[:1] not in ("", " ", "\t") and self._line is not None:
+            # The next line started and is not a continuation, the last one is done
+            components += self._handle(self._line)
+            self._line = None
+        return components
+
+    def close(self) -> list[Component]:
+        """
+        Parses what is left once the stream ended.
+        """
+        rest = self._tail + self._decoder.decode(b"", final=True)
+        self._tail = ""
+        components = self._read(rest.split("\n") if rest else [])
+        if self._line is not None:
+            components += self._handle(self._line)
+            self._line = None
+        return components
+
+    def to_calendar(self, components: Iterable[Component]) -> icalendar.Calendar:
+        """
+        Builds the calendar from its properties and the components returned.
+        """
+        calendar = icalendar.Calendar.from_ical(
+            "\r\n".join(["BEGIN:VCALENDAR", *self._properties, "END:VCALENDAR"])
+        )
+        for component in components:
+            calendar.add_component(component)
+        return calendar
+
+    def _read(self, lines: list[str]) -> list[Component]:
+        components: list[Component] = []
+        for line in lines:
+            line = line.rstrip("\r")
+            if line[:1] in (" ", "\t"):
+                # Folded content line (RFC 5545, section 3.1)
+                if self._line is not None:
+                    self._line += line[1:]
+                continue
+            if self._line is not None:
+                components += self._handle(self._line)
+            self._line = line or None
+        return components
+
+    def _handle(self, line: str) -> list[Component]:
+        name = _name(line)
+        value = line.partition(":")[2].strip().upper()
+
+        if self._lines is None:
+            if name == "BEGIN" and value != "VCALENDAR":
+                self._lines = [line]
+                self._component_name = value
+                self._window_lines = {}
+                self._depth = 1
+            elif name not in ("BEGIN", "END") and not any(
+                _name(p) == name for p in self._properties
+            ):
+                self._properties.append(line)
+            return []
+
+        self._lines.append(line)
+        if name == "BEGIN":
+            self._depth += 1
+        elif name == "END":
+            self._depth -= 1
+        elif self._depth == 1 and (name in _WINDOW_PROPERTIES or name == "TZID"):
+            self._window_lines.setdefault(name, line)
+        if self._depth > 0:
+            return []
+
+        lines, self._lines = self._lines, None
+        if self._component_name == "VEVENT" and not self._in_window():
+            self.dropped += 1
+            return []
+        if self._component_name == "VTIMEZONE":
+            tzid = _value(self._window_lines.get("TZID", ""))
+            if tzid in self._timezones:
+                return []
+            self._timezones.add(tzid)
+        return [Component.from_ical("\r\n".join(lines))]
+
+    def _in_window(self) -> bool:
+        if self._window is None:
+            return True
+        if "RECURRENCE-ID" in self._window_lines:
+            # Overrides can move an occurrence in or out of the window, keep them
+            return True
+
+        window_start, window_end = self._window
+        try:
+            start, is_date = _parse_time(self._window_lines["DTSTART"])
+            if "RRULE" in self._window_lines or "RDATE" in self._window_lines:
+                # A series never occurs before its first occurrence
+                return start < window_end
+
+            if "DTEND" in self._window_lines:
+                end, _ = _parse_time(self._window_lines["DTEND"])
+            elif "DURATION" in self._window_lines:
+                duration = icalendar.vDuration.from_ical(
+                    _value(self._window_lines["DURATION"])
+                )
+                end = start + duration.total_seconds()
+            else:
+                end = start + (86400 if is_date else 0)
+        except Exception:
+            # Keep what cannot be read quickly, the full parser will decide
+            return True
+
+        return start < window_end and end >= window_start
+
+
+def iter_ics_components(
+    chunks: Iterable[bytes],
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> Iterator[Component]:
+    """
+    Yields the top-level components of an ICS stream one by one.
+    """
+    parser = IcsStreamParser(start, end)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def parse_ics_stream(
+    chunks: Iterable[bytes],
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> icalendar.Calendar:
+    """
+    Parses an ICS stream into a calendar, dropping the single events outside of
+    the window when one is given.
+    """
+    parser = IcsStreamParser(start, end)
+    components: list[Component] = []
+    for chunk in chunks:
+        components += parser.feed(chunk)
+    components += parser.close()
+
+    if parser.dropped:
+        logger.info(f"Dropped {parser.dropped} events outside of {start} - {end}")
+    return parser.to_calendar(components)
+
+
+def _name(line: str) -> str:
+    end = min((i for i in (line.find(":"), line.find(";")) if i >= 0), default=0)
+    return line[:end].upper()
+
+
+def _value(line: str) -> str:
+    # Parameter values may be quoted and hold colons
+    quoted = False
+    for i, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == ":" and not quoted:
+            return line[i + 1 :].strip()
+    return ""
+
+
+def _parse_time(line: str) -> tuple[float, bool]:
+    value = _value(line)
+    if len(value) == 8:
+        moment = datetime.strptime(value, "%Y%m%d").replace(tzinfo=UTC)
+        return moment.timestamp(), True
+    moment = datetime.strptime(value[:15], "%Y%m%dT%H%M%S").replace(tzinfo=UTC)
+    return moment.timestamp(), False
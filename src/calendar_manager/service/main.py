@@ -1,12 +1,28 @@
 from typing import Any
 
+from src.calendar_manager.model.calendar_mutation_result import (
+    CalendarMutationResult,
+)
 from src.calendar_manager.model.create_google_event import CreateGoogleCalendarEvent
 from src.calendar_manager.model.update_event import UpdateEvent
 from src.calendar_manager.service.google import (
     create_google_event,
+    create_google_events,
     delete_google_event,
+    delete_google_events,
     initialize_google_calendar,
     update_google_event,
+    update_google_events,
+)
+from src.calendar_manager.service.google_async import (
+    AsyncGoogleCalendarClient,
+    acreate_google_event,
+    acreate_google_events,
+    adelete_google_event,
+    adelete_google_events,
+    aupdate_google_event,
+    aupdate_google_events,
+    initialize_async_google_calendar,
 )
 from src.config import env
 
@@ -19,6 +35,14 @@ def initialize_calendar(provider: str):
             raise NotImplementedError(f"provider {provider} not supported")
 
 
+def initialize_async_calendar(provider: str) -> AsyncGoogleCalendarClient:
+    match provider:
+        case "google":
+            return initialize_async_google_calendar()
+        case _:
+            raise NotImplementedError(f"provider {provider} not supported")
+
+
 def create_event(
     client,
     provider: str,
@@ -58,3 +82,147 @@ def update_event(
             )
         case _:
             raise NotImplementedError(f"Provider '{provider}' not supported")
+
+
+def create_events(
+    client,
+    provider: str,
+    calendar_id: str,
+    events_data: list[
+        CreateGoogleCalendarEvent
+    ],  # Use Union[] when using more providers
+) -> list[CalendarMutationResult]:
+    """
+    Creates several events at once, returning one result per event.
+    """
+    match provider:
+        case "google":
+            return create_google_events(client, calendar_id, events_data)
+        case _:
+            raise NotImplementedError(f"Provider '{provider}' not supported")
+
+
+def delete_events(
+    client,
+    provider: str,
+    calendar_id: str,
+    event_ids: list[str],
+) -> list[CalendarMutationResult]:
+    """
+    Deletes several events at once, returning one result per event.
+    """
+    match provider:
+        case "google":
+            return delete_google_events(client, calendar_id, event_ids)
+        case _:
+            raise NotImplementedError(f"Provider '{provider}' not supported")
+
+
+def update_events(
+    client,
+    provider: str,
+    calendar_id: str,
+    updates: list[UpdateEvent],
+) -> list[CalendarMutationResult]:
+    """
+    Updates several events at once, returning one result per event.
+    """
+    match provider:
+        case "google":
+            return update_google_events(client, calendar_id, updates)
+        case _:
+            raise NotImplementedError(f"Provider '{provider}' not supported")
+
+
+async def acreate_event(
+    client,
+    provider: str,
+    calendar_id: str,
+    event_data: CreateGoogleCalendarEvent,  # Use Union[] when using more providers
+) -> dict[str, Any]:
+    """
+    Async version of `create_event`, `client` comes from `initialize_async_calendar`.
+    """
+    match provider:
+        case "google":
+            return await acreate_google_event(client, calendar_id, event_data)
+        case _:
+            raise NotImplementedError(f"Provider '{provider}' not supported")
+
+
+async def adelete_event(client, provider: str, calendar_id: str, event_id: str) -> None:
+    match provider:
+        case "google":
+            return await adelete_google_event(client, calendar_id, event_id)
+        case _:
+            raise NotImplementedError(f"Provider '{provider}' not supported")
+
+
+async def aupdate_event(
+    client,
+    provider: str,
+    calendar_id: str,
+    update_event: UpdateEvent,
+) -> dict[str, Any]:
+    match provider:
+        case "google":
+            return await aupdate_google_event(
+                client, calendar_id, update_event.id, update_event.data
+            )
+        case _:
+            raise NotImplementedError(f"Provider '{provider}' not supported")
+
+
+async def acreate_events(
+    client,
+    provider: str,
+    calendar_id: str,
+    events_data: list[
+        CreateGoogleCalendarEvent
+    ],  # Use Union[] when using more providers
+    event_ids: list[str] | None = None,
+) -> list[CalendarMutationResult]:
+    """
+    Creates several events concurrently, returning one result per event.
+
+    `event_ids` makes the creations idempotent, see `acreate_google_event`.
+    """
+    match provider:
+        case "google":
+            return await acreate_google_events(
+                client, calendar_id, events_data, event_ids
+            )
+        case _:
+            raise NotImplementedError(f"Provider '{provider}' not supported")
+
+
+async def adelete_events(
+    client,
+    provider: str,
+    calendar_id: str,
+    event_ids: list[str],
+) -> list[CalendarMutationResult]:
+    """
+    Deletes several events concurrently, returning one result per event.
+    """
+    match provider:
+        case "google":
+            return await adelete_google_events(client, calendar_id, event_ids)
+        case _:
+            raise NotImplementedError(f"Provider '{provider}' not supported")
+
+
+async def aupdate_events(
+    client,
+    provider: str,
+    calendar_id: str,
+    updates: list[UpdateEvent],
+) -> list[CalendarMutationResult]:
+    """
+    Updates several events concurrently, returning one result per event.
+    """
+    match provider:
+        case "google":
+            return await aupdate_google_events(client, calendar_id, updates)
+        case _:
+            raise NotImplementedError(f"Provider '{provider}' not supported")
@@ -0,0 +1,226 @@
+import logging
+import re
+from datetime import UTC, date, datetime
+from typing import Literal, NamedTuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from src.calendar_manager.model.calendar_preflight_problem import (
+    CalendarPreflightProblem,
+)
+from src.calendar_manager.model.compact_event import CompactEvent
+from src.calendar_manager.model.create_google_event import (
+    CreateGoogleCalendarEvent,
+    GoogleCalendarEventDateTime,
+)
+from src.calendar_manager.model.delete_event import DeleteEvent
+from src.calendar_manager.model.update_event import UpdateEvent
+from src.common import to_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Checks of the calendar modifications asked by the LLM against the local copies of
+# the calendars, so the ones bound to fail or to double-book are caught before any
+# request is sent to the provider.
+
+_UID_LINE = re.compile(rb"^UID:(.+?)\r?$", re.MULTILINE)
+# Long lines are folded at 75 octets, continued on lines starting with a space or tab
+_FOLD = re.compile(rb"\r?\n[ \t]")
+# Google exports its events with the event ID followed by this suffix as UID
+_GOOGLE_UID_SUFFIX = "@google.com"
+
+
+class _Planned(NamedTuple):
+    # An event created or moved by the modifications
+    action: Literal["create", "update"]
+    index: int
+    event_id: str | None
+    summary: str
+    start: float
+    end: float
+
+
+def feed_event_ids(content: bytes) -> set[str]:
+    """
+    Returns the IDs of the events of an ICS feed.
+    """
+    ids: set[str] = set()
+    for uid in _UID_LINE.findall(_FOLD.sub(b"", content)):
+        uid = uid.decode(errors="replace").strip()
+        ids.update((uid, uid.removesuffix(_GOOGLE_UID_SUFFIX)))
+    return ids
+
+
+def is_known_event(event_id: str, known_ids: set[str]) -> bool:
+    """
+    Whether `event_id` is one of `known_ids` or an instance of one of them.
+    """
+    if event_id in known_ids:
+        return True
+    # Instances of a series are the ID of the series followed by their original start
+    series_id, _, original_start = event_id.rpartition("_")
+    return bool(series_id and original_start) and series_id in known_ids
+
+
+def find_overlaps(intervals: np.ndarray, busy: np.ndarray) -> np.ndarray:
+    """
+    Returns a boolean matrix telling whether each interval (row) overlaps each busy
+    interval (column). Both are arrays of [start, end) timestamp pairs.
+    """
+    intervals, busy = intervals.reshape(-1, 2), busy.reshape(-1, 2)
+    return (busy[:, 0] < intervals[:, 1, None]) & (busy[:, 1] > intervals[:, 0, None])
+
+
+def planned_window(
+    create_events: list[CreateGoogleCalendarEvent],
+    update_events: list[UpdateEvent],
+) -> tuple[datetime, datetime] | None:
+    """
+    Returns the window covering the times of the events created or moved, or None
+    when none is.
+    """
+    planned = _planned(create_events, update_events)
+    if not planned:
+        return None
+    return (
+        datetime.fromtimestamp(min(p.start for p in planned), UTC),
+        datetime.fromtimestamp(max(p.end for p in planned), UTC),
+    )
+
+
+def preflight_mutations(
+    create_events: list[CreateGoogleCalendarEvent],
+    update_events: list[UpdateEvent],
+    delete_events: list[DeleteEvent],
+    known_ids: set[str] | None,
+    occurrences: list[CompactEvent],
+) -> list[CalendarPreflightProblem]:
+    """
+    Returns the problems of a set of calendar modifications:
+
+    - updates and deletions of events missing from `known_ids`, skipped when the IDs
+      are unknown (None);
+    - events created or moved over a busy occurrence of `occurrences`, or over
+      another event created or moved by the same modifications.
+    """
+    problems: list[CalendarPreflightProblem] = []
+
+    if known_ids is not None:
+        targets: list[
+            tuple[Literal["update", "delete"], list[UpdateEvent] | list[DeleteEvent]]
+        ] = [("update", update_events), ("delete", delete_events)]
+        for action, events in targets:
+            for index, event in enumerate(events):
+                if not is_known_event(event.id, known_ids):
+                    problems.append(
+                        CalendarPreflightProblem(
+                            action=action,
+                            index=index,
+                            kind="unknown_event",
+                            event_id=event.id,
+                            message=f"There is no event with ID '{event.id}' in the calendar.",
+                        )
+                    )
+
+    planned = _planned(create_events, update_events)
+    if not planned:
+        return problems
+
+    # Deleted or moved events do not keep their time
+    replaced = {event.id for event in delete_events} | {
+        event.id for event in update_events if event.data.start and event.data.end
+    }
+    busy_events = [
+        occurrence
+        for occurrence in occurrences
+        if occurrence.busy
+        and _event_id(occurrence.uid) not in replaced
+        and to_timestamp(occurrence.end) > to_timestamp(occurrence.start)
+    ]
+
+    intervals = np.array([(p.start, p.end) for p in planned], dtype=float)
+    busy = np.array(
+        [(to_timestamp(o.start), to_timestamp(o.end)) for o in busy_events],
+        dtype=float,
+    ).reshape(-1, 2)
+    # The planned events are checked against each other as well, not themselves
+    overlaps = find_overlaps(intervals, np.vstack([busy, intervals]))
+    overlaps[np.arange(len(planned)), len(busy) + np.arange(len(planned))] = False
+
+    for row, event in enumerate(planned):
+        conflicts = []
+        for column in np.flatnonzero(overlaps[row]):
+            if column < len(busy):
+                occurrence = busy_events[column]
+                conflicts.append(
+                    _describe(occurrence.summary, occurrence.start, occurrence.end)
+                )
+            else:
+                other = planned[column - len(busy)]
+                conflicts.append(
+                    _describe(
+                        other.summary,
+                        datetime.fromtimestamp(other.start, UTC),
+                        datetime.fromtimestamp(other.end, UTC),
+                    )
+                )
+        if conflicts:
+            problems.append(
+                CalendarPreflightProblem(
+                    action=event.action,
+                    index=event.index,
+                    kind="overlap",
+                    event_id=event.event_id,
+                    conflicts=conflicts,
+                    message=f"'{event.summary}' would overlap {len(conflicts)} busy events.",
+                )
+            )
+    return problems
+
+
+def _planned(
+    create_events: list[CreateGoogleCalendarEvent],
+    update_events: list[UpdateEvent],
+) -> list[_Planned]:
+    planned: list[_Planned] = []
+    for index, created in enumerate(create_events):
+        planned.append(
+            _Planned(
+                "create",
+                index,
+                None,
+                created.summary,
+                _timestamp(created.start),
+                _timestamp(created.end),
+            )
+        )
+    for index, updated in enumerate(update_events):
+        if updated.data.start is None or updated.data.end is None:
+            continue
+        planned.append(
+            _Planned(
+                "update",
+                index,
+                updated.id,
+                updated.data.summary or updated.id,
+                _timestamp(updated.data.start),
+                _timestamp(updated.data.end),
+            )
+        )
+    return planned
+
+
+def _timestamp(value: GoogleCalendarEventDateTime) -> float:
+    moment = value.dateTime
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=ZoneInfo(value.timeZone or "UTC"))
+    return moment.timestamp()
+
+
+def _event_id(uid: str) -> str:
+    return uid.removesuffix(_GOOGLE_UID_SUFFIX)
+
+
+def _describe(summary: str, start: date | datetime, end: date | datetime) -> str:
+    return f"{summary} ({start.isoformat()} - {end.isoformat()})"
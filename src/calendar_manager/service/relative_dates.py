@@ -0,0 +1,176 @@
+import logging
+import re
+from datetime import date, datetime, time, timedelta
+
+from src.calendar_manager.model.relative_date_range import RelativeDateRange
+
+logger = logging.getLogger(__name__)
+
+# Deterministic resolution of the relative time references of a message ("tomorrow",
+# "next Monday afternoon", "this week") into concrete windows, so the agent does not
+# need a round trip to learn the date before searching the calendars.
+
+_WEEKDAYS = [
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+]
+_NUMBERS = {
+    "a": 1,
+    "an": 1,
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+}
+# Hours of the parts of a day, the end is exclusive
+_DAY_PARTS = {
+    "morning": (6, 12),
+    "afternoon": (12, 18),
+    "evening": (18, 22),
+    "night": (18, 24),
+}
+_DAYS = {
+    "today": 0,
+    "tonight": 0,
+    "this": 0,
+    "tomorrow": 1,
+    "day after tomorrow": 2,
+    "yesterday": -1,
+    "day before yesterday": -2,
+}
+
+_PATTERN = re.compile(
+    rf"""
+    \b(?:
+        (?:the\s+)?(?P<day>day\s+after\s+tomorrow|day\s+before\s+yesterday
+            |today|tonight|tomorrow|yesterday
+            |this(?=\s+(?:{"|".join(_DAY_PARTS)})))
+      | (?:(?P<which>this|next|last)\s+)?(?P<weekday>{"|".join(_WEEKDAYS)})
+      | (?P<period_which>this|next|last)\s+(?P<period>weekend|week|month|year)
+      | in\s+(?P<count>\d+|{"|".join(_NUMBERS)})\s+(?P<unit>days?|weeks?)
+    )
+    (?:\s+(?P<part>{"|".join(_DAY_PARTS)}))?
+    \b
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+
+def resolve_relative_dates(text: str, now: datetime) -> list[RelativeDateRange]:
+    """
+    Returns the windows of the relative time references of `text`, in the time zone
+    of `now`, in the order they appear.
+
+    Days and weekdays may be followed by a part of the day ("morning", "afternoon",
+    "evening", "night"). A bare or "next" weekday is its next occurrence after today,
+    "this" one is the one of the current week and "last" one the previous occurrence.
+    Weeks start on Monday. Clock times are left to the model.
+    """
+    today = now.date()
+    ranges: list[RelativeDateRange] = []
+    seen: set[tuple[datetime, datetime]] = set()
+    for match in _PATTERN.finditer(text):
+        try:
+            window = _window(match, today)
+        except ValueError as e:
+            logger.debug(f"Could not resolve '{match.group(0)}': {e}")
+            continue
+        if window is None:
+            continue
+
+        first, last = window
+        start = datetime.combine(first, time(), now.tzinfo)
+        end = datetime.combine(last, time(), now.tzinfo)
+        part = (match.group("part") or "").lower()
+        if match.group("day") and match.group("day").lower() == "tonight":
+            part = part or "night"
+        if part and last - first == timedelta(days=1):
+            start_hour, end_hour = _DAY_PARTS[part]
+            start, end = (
+                start + timedelta(hours=start_hour),
+                start + timedelta(hours=end_hour),
+            )
+
+        if (start, end) in seen:
+            continue
+        seen.add((start, end))
+        ranges.append(
+            RelativeDateRange(
+                expression=" ".join(match.group(0).split()), start=start, end=end
+            )
+        )
+    return ranges
+
+
+def format_temporal_context(now: datetime, ranges: list[RelativeDateRange]) -> str:
+    """
+    Describes the current date and time and the resolved time references for the LLM.
+    """
+    lines = [
+        f"Current date and time: {now.strftime('%A')}, {now.isoformat(timespec='minutes')} ({now.tzinfo})"
+    ]
+    if ranges:
+        lines.append("Resolved time references (start inclusive, end exclusive):")
+        lines.extend(
+            f'- "{r.expression}": {r.start.isoformat()} to {r.end.isoformat()}'
+            for r in ranges
+        )
+    return "\n".join(lines)
+
+
+def _window(found: re.Match, today: date) -> tuple[date, date] | None:
+    if day := found.group("day"):
+        first = today + timedelta(days=_DAYS[" ".join(day.lower().split())])
+        return first, first + timedelta(days=1)
+
+    if weekday := found.group("weekday"):
+        offset = _WEEKDAYS.index(weekday.lower()) - today.weekday()
+        match (found.group("which") or "next").lower():
+            case "this":
+                pass
+            case "last":
+                offset = offset % -7 or -7
+            case _:
+                offset = offset % 7 or 7
+        first = today + timedelta(days=offset)
+        return first, first + timedelta(days=1)
+
+    if period := found.group("period"):
+        shift = {"this": 0, "next": 1, "last": -1}[found.group("period_which").lower()]
+        return _period(period.lower(), today, shift)
+
+    if unit := found.group("unit"):
+        count = found.group("count").lower()
+        count = int(_NUMBERS.get(count, count))
+        if unit.lower().startswith("day"):
+            first = today + timedelta(days=count)
+            return first, first + timedelta(days=1)
+        return _period("week", today + timedelta(weeks=count), 0)
+
+    return None
+
+
+def _period(period: str, today: date, shift: int) -> tuple[date, date]:
+    match period:
+        case "week" | "weekend":
+            monday = today - timedelta(days=today.weekday()) + timedelta(weeks=shift)
+            if period == "weekend":
+                return monday + timedelta(days=5), monday + timedelta(days=7)
+            return monday, monday + timedelta(days=7)
+        case "month":
+            months = today.year * 12 + today.month - 1 + shift
+            first = date(months // 12, months % 12 + 1, 1)
+            return first, date((months + 1) // 12, (months + 1) % 12 + 1, 1)
+        case _:
+            return date(today.year + shift, 1, 1), date(today.year + shift + 1, 1, 1)
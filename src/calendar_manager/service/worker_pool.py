@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from src.calendar_manager.model.worker_pool_stats import WorkerPoolStats
+
+logger = logging.getLogger(__name__)
+
+
+def _timed(
+    fn: Callable[..., Any], args: tuple, submitted_at: float
+) -> tuple[float, float, Any]:
+    # Runs in the worker, wall clock times are comparable across processes
+    started_at = time.time()
+    result = fn(*args)
+    return started_at - submitted_at, time.time() - started_at, result
+
+
+class CalendarWorkerPool:
+    """
+    Pool of processes running the CPU-bound calendar work, ICS parsing and
+    recurrence expansion, away from the event loop and the GIL.
+
+    Tasks are module-level functions taking and returning picklable values. With 0
+    workers they run in the calling thread. The pool records how long tasks wait for
+    a free worker and how long they run.
+    """
+
+    workers: int
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._stats = WorkerPoolStats(workers=workers)
+        self._queue_wait_total = 0.0
+        self._run_time_total = 0.0
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs `fn(*args)` on the pool and waits for its result.
+        """
+        submitted_at = time.time()
+        try:
+            if self.workers <= 0:
+                timed = _timed(fn, args, submitted_at)
+            else:
+                timed = self._submit(fn, args, submitted_at).result()
+        except BaseException as e:
+            self._record_failure(e)
+            raise
+        return self._record(*timed)
+
+    async def arun(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs `fn(*args)` on the pool without blocking the event loop.
+        """
+        submitted_at = time.time()
+        try:
+            if self.workers <= 0:
+                timed = await asyncio.to_thread(_timed, fn, args, submitted_at)
+            else:
+                timed = await asyncio.wrap_future(self._submit(fn, args, submitted_at))
+        except BaseException as e:
+            self._record_failure(e)
+            raise
+        return self._record(*timed)
+
+    def start(self) -> None:
+        """
+        Starts the worker processes ahead of the first task, spawning them and
+        importing the calendar code takes a moment.
+        """
+        for _ in range(self.workers):
+            self._submit(time.time, (), time.time())
+
+    def stats(self) -> WorkerPoolStats:
+        with self._lock:
+            stats = self._stats.model_copy()
+            if stats.tasks:
+                stats.queue_wait_avg = self._queue_wait_total / stats.tasks
+                stats.run_time_avg = self._run_time_total / stats.tasks
+        return stats
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(
+        self, fn: Callable[..., Any], args: tuple, submitted_at: float
+    ) -> Future[tuple[float, float, Any]]:
+        with self._lock:
+            if self._executor is None:
+                # Spawned, forking a process with running threads is not safe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            executor = self._executor
+        return executor.submit(_timed, fn, args, submitted_at)
+
+    def _record(self, queue_wait: float, run_time: float, result: Any) -> Any:
+        queue_wait = max(queue_wait, 0.0)
+        with self._lock:
+            self._stats.tasks += 1
+            self._queue_wait_total += queue_wait
+            self._run_time_total += run_time
+            self._stats.queue_wait_max = max(self._stats.queue_wait_max, queue_wait)
+            self._stats.run_time_max = max(self._stats.run_time_max, run_time)
+        return result
+
+    def _record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            self._stats.failed += 1
+            if isinstance(error, BrokenProcessPool) and self._executor is not None:
+                # A worker died, the next task starts a new pool
+                logger.warning(f"Calendar worker pool broke: {error}")
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,66 @@
+import logging
+from typing import Any
+
+import icalendar
+
+from src.calendar_manager.model.calendar_mutation_result import (
+    CalendarMutationResult,
+)
+from src.calendar_manager.service.google_sync import (
+    google_calendar_id,
+    google_event_to_ical,
+)
+
+logger = logging.getLogger(__name__)
+
+# Helpers to apply the modifications made through Lis to the local copies of the
+# calendar they target, so reading it back does not need a fetch.
+
+
+def is_written_calendar(calendar_url: str, calendar_id: str) -> bool:
+    """
+    Whether `calendar_url` reads the Google calendar `calendar_id`, either through
+    the API mirror or through its secret iCal address.
+    """
+    return google_calendar_id(calendar_url) == calendar_id
+
+
+def written_changes(
+    results: list[CalendarMutationResult],
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """
+    Returns the event resources created or updated and the IDs of the events
+    deleted by the modifications that succeeded.
+    """
+    resources: list[dict[str, Any]] = []
+    deleted_ids: list[str] = []
+    for result in results:
+        if not result.ok:
+            continue
+        if result.action == "delete" and result.event_id is not None:
+            deleted_ids.append(result.event_id)
+        elif result.action != "delete" and result.event is not None:
+            resources.append(result.event)
+    return resources, deleted_ids
+
+
+def event_uids(resource: dict[str, Any]) -> set[str]:
+    """
+    UIDs the event may be stored under, Google exports events with the `iCalUID`.
+    """
+    uids = {resource["id"], f"{resource['id']}@google.com"}
+    if resource.get("iCalUID"):
+        uids.add(resource["iCalUID"])
+    return uids
+
+
+def changes_ics(resources: list[dict[str, Any]]) -> bytes:
+    """
+    Serializes event resources as an ICS calendar for the calendar workers.
+    """
+    calendar = icalendar.Calendar()
+    calendar.add("PRODID", "-//Lis//Calendar modifications//EN")
+    calendar.add("VERSION", "2.0")
+    for resource in resources:
+        calendar.add_component(google_event_to_ical(resource))
+    return calendar.to_ical()
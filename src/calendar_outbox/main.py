@@ -0,0 +1,364 @@
+import asyncio
+import hashlib
+import logging
+import sqlite3
+from collections.abc import Awaitable, Callable
+from contextlib import closing
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from src.calendar_manager.main import CalendarManager
+from src.calendar_manager.model.calendar_mutation_result import (
+    CalendarMutationResult,
+)
+from src.calendar_outbox.model.outbox_entry import CalendarOutboxEntry
+from src.config import env
+from src.generate_response.model.action_payloads import ActionPayloads
+
+logger = logging.getLogger(__name__)
+
+# A running attempt not finished after this long is considered lost and retried
+_LEASE = timedelta(minutes=5)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calendar_outbox (
+    key TEXT PRIMARY KEY,
+    thread_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    reported INTEGER NOT NULL,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calendar_outbox_due
+    ON calendar_outbox (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS calendar_outbox_thread
+    ON calendar_outbox (thread_id);
+"""
+
+
+def outbox_key(thread_id: str, message_id: str | None, payloads: ActionPayloads) -> str:
+    """
+    Idempotency key of the modifications planned by a response message.
+    """
+    digest = hashlib.sha256()
+    for part in (thread_id, message_id or "", payloads.model_dump_json()):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def describe_outbox_entry(entry: CalendarOutboxEntry) -> str:
+    """
+    Summarizes the outcome of an entry for the thread's message history.
+    """
+    if entry.status == "done":
+        heading = "The calendar modifications planned earlier were applied"
+    else:
+        heading = (
+            f"Some calendar modifications planned earlier failed after "
+            f"{entry.attempts} attempts"
+        )
+    lines = [f"{heading}:"]
+    for result in entry.results:
+        if result is None:
+            continue
+        outcome = "ok" if result.ok else f"failed: {result.error}"
+        lines.append(f"- {result.action} {result.event_id or ''} {outcome}".strip())
+    return "\n".join(lines)
+
+
+class CalendarOutbox:
+    """
+    Durable queue of the calendar modifications planned by the agent.
+
+    `enqueue` stores the ActionPayloads of a turn under an idempotency key and returns
+    at once, so the reply does not wait on the calendar API. A background worker
+    applies them, retrying the modifications that failed for a transient reason
+    with exponential backoff, and hands every finished entry to `on_finished`.
+    Creations are sent with an event ID derived from the key, so a retry never
+    creates an event twice.
+    """
+
+    path: Path
+    max_attempts: int
+    retry_delay: float
+    on_finished: Callable[[CalendarOutboxEntry], Awaitable[bool]] | None
+
+    def __init__(
+        self,
+        path: Path,
+        calendar_manager: CalendarManager,
+        max_attempts: int = env.CALENDAR_OUTBOX_MAX_ATTEMPTS,
+        retry_delay: float = env.CALENDAR_OUTBOX_RETRY_DELAY,
+    ) -> None:
+        self.path = path
+        self.calendar_manager = calendar_manager
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        # Returns whether the outcome could be reported, it is tried again otherwise
+        self.on_finished = None
+        self._task: asyncio.Task | None = None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+
+    def enqueue(
+        self,
+        thread_id: str,
+        payloads: ActionPayloads,
+        key: str | None = None,
+    ) -> CalendarOutboxEntry:
+        """
+        Queues the modifications, or returns the entry already queued under `key`.
+        """
+        now = datetime.now(UTC)
+        entry = CalendarOutboxEntry(
+            key=key or outbox_key(thread_id, None, payloads),
+            thread_id=thread_id,
+            payloads=payloads,
+            next_attempt_at=now,
+            created_at=now,
+            updated_at=now,
+        )
+        with closing(self._connect()) as conn, conn:
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO calendar_outbox VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    entry.key,
+                    entry.thread_id,
+                    entry.status,
+                    entry.next_attempt_at.timestamp(),
+                    0,
+                    entry.model_dump_json(),
+                ),
+            ).rowcount
+            if not inserted:
+                (stored,) = conn.execute(
+                    "SELECT entry FROM calendar_outbox WHERE key = ?", (entry.key,)
+                ).fetchone()
+                logger.info(f"Calendar modifications {entry.key} were already queued")
+                return CalendarOutboxEntry.model_validate_json(stored)
+
+        logger.info(f"Queued calendar modifications {entry.key} of thread {thread_id}")
+        return entry
+
+    def entries(self, thread_id: str) -> list[CalendarOutboxEntry]:
+        """
+        Returns the modifications queued by a thread, oldest first.
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT entry FROM calendar_outbox WHERE thread_id = ? ORDER BY rowid",
+                (thread_id,),
+            ).fetchall()
+        return [CalendarOutboxEntry.model_validate_json(entry) for (entry,) in rows]
+
+    async def process_due(self) -> int:
+        """
+        Applies every due entry and reports the finished ones not reported yet.
+        Returns the number of entries applied.
+        """
+        due = await asyncio.to_thread(self._claim_due)
+        for entry in due:
+            entry = await self._apply(entry)
+            await asyncio.to_thread(self._save, entry)
+
+        for entry in await asyncio.to_thread(self._unreported):
+            await self._report(entry)
+        return len(due)
+
+    def start(self) -> None:
+        """
+        Starts the background worker that applies the queued modifications.
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ---------- internal helpers ---------- #
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.process_due()
+            except Exception as e:
+                logger.error(f"Calendar outbox worker failed: {e}", exc_info=True)
+            await asyncio.sleep(env.CALENDAR_OUTBOX_POLL_INTERVAL)
+
+    async def _apply(self, entry: CalendarOutboxEntry) -> CalendarOutboxEntry:
+        creates = entry.payloads.create_events or []
+        updates = entry.payloads.update_events or []
+        deletes = entry.payloads.delete_events or []
+        results = entry.results or [None] * (len(creates) + len(updates) + len(deletes))
+
+        pending = [i for i, result in enumerate(results) if not _settled(result)]
+        first_update, first_delete = len(creates), len(creates) + len(updates)
+        batches = [
+            [i for i in pending if i < first_update],
+            [i for i in pending if first_update <= i < first_delete],
+            [i for i in pending if first_delete <= i],
+        ]
+
+        try:
+            if batches[0]:
+                created = await self.calendar_manager.acreate_events(
+                    [creates[i] for i in batches[0]],
+                    [_event_id(entry.key, i) for i in batches[0]],
+                )
+                for i, result in zip(batches[0], created, strict=True):
+                    results[i] = result
+            if batches[1]:
+                updated = await self.calendar_manager.aupdate_events(
+                    [updates[i - first_update] for i in batches[1]]
+                )
+                for i, result in zip(batches[1], updated, strict=True):
+                    results[i] = result
+            if batches[2]:
+                deleted = await self.calendar_manager.adelete_events(
+                    [deletes[i - first_delete] for i in batches[2]]
+                )
+                for i, result in zip(batches[2], deleted, strict=True):
+                    results[i] = result
+        except Exception as e:
+            # The provider client could not even be used, retry everything left
+            logger.error(f"Could not apply calendar modifications {entry.key}: {e}")
+            for i in pending:
+                if results[i] is None:
+                    results[i] = CalendarMutationResult(
+                        action=_action(i, first_update, first_delete), error=str(e)
+                    )
+
+        now = datetime.now(UTC)
+        entry.results = [_already_applied(result) for result in results]
+        entry.attempts += 1
+        entry.updated_at = now
+        if all(_settled(result) for result in entry.results):
+            ok = all(result is not None and result.ok for result in entry.results)
+            entry.status = "done" if ok else "failed"
+        elif entry.attempts >= self.max_attempts:
+            entry.status = "failed"
+        else:
+            entry.status = "pending"
+            entry.next_attempt_at = now + timedelta(
+                seconds=self.retry_delay * 2 ** (entry.attempts - 1)
+            )
+
+        logger.info(
+            f"Calendar modifications {entry.key} are {entry.status} after {entry.attempts} attempts"
+        )
+        return entry
+
+    async def _report(self, entry: CalendarOutboxEntry) -> None:
+        if self.on_finished is None:
+            return
+        try:
+            reported = await self.on_finished(entry)
+        except Exception as e:
+            logger.error(f"Could not report calendar modifications {entry.key}: {e}")
+            return
+        if reported:
+            entry.reported = True
+            await asyncio.to_thread(self._save, entry)
+
+    def _claim_due(self) -> list[CalendarOutboxEntry]:
+        now = datetime.now(UTC)
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute(
+                """SELECT entry, next_attempt_at FROM calendar_outbox
+                WHERE status IN ('pending', 'running') AND next_attempt_at <= ?
+                ORDER BY next_attempt_at""",
+                (now.timestamp(),),
+            ).fetchall()
+
+            claimed = []
+            for stored, next_attempt_at in rows:
+                entry = CalendarOutboxEntry.model_validate_json(stored)
+                entry.status = "running"
+                entry.next_attempt_at = now + _LEASE
+                # Another worker sharing the database may have claimed it meanwhile
+                if conn.execute(
+                    """UPDATE calendar_outbox
+                    SET status = ?, next_attempt_at = ?, entry = ?
+                    WHERE key = ? AND next_attempt_at = ?""",
+                    (
+                        entry.status,
+                        entry.next_attempt_at.timestamp(),
+                        entry.model_dump_json(),
+                        entry.key,
+                        next_attempt_at,
+                    ),
+                ).rowcount:
+                    claimed.append(entry)
+        return claimed
+
+    def _unreported(self) -> list[CalendarOutboxEntry]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                """SELECT entry FROM calendar_outbox
+                WHERE status IN ('done', 'failed') AND reported = 0
+                ORDER BY rowid"""
+            ).fetchall()
+        return [CalendarOutboxEntry.model_validate_json(entry) for (entry,) in rows]
+
+    def _save(self, entry: CalendarOutboxEntry) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """UPDATE calendar_outbox
+                SET status = ?, next_attempt_at = ?, reported = ?, entry = ?
+                WHERE key = ?""",
+                (
+                    entry.status,
+                    entry.next_attempt_at.timestamp(),
+                    int(entry.reported),
+                    entry.model_dump_json(),
+                    entry.key,
+                ),
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+
+def _event_id(key: str, index: int) -> str:
+    # Google event IDs use base32hex characters, hex digits are a subset
+    return hashlib.sha256(f"{key}:{index}".encode()).hexdigest()
+
+
+def _action(index: int, first_update: int, first_delete: int) -> str:
+    if index < first_update:
+        return "create"
+    return "update" if index < first_delete else "delete"
+
+
+def _settled(result: CalendarMutationResult | None) -> bool:
+    """Whether retrying the modification cannot change its outcome."""
+    if result is None:
+        return False
+    if result.ok:
+        return True
+    status = result.status_code
+    # Network errors, throttling and server errors may succeed later
+    return status is not None and status != 429 and status < 500
+
+
+def _already_applied(
+    result: CalendarMutationResult | None,
+) -> CalendarMutationResult | None:
+    # A retried creation conflicts with the event created by a lost attempt, and a
+    # retried deletion finds the event already gone
+    if result is not None and (
+        (result.action == "create" and result.status_code == 409)
+        or (result.action == "delete" and result.status_code == 410)
+    ):
+        return result.model_copy(update={"error": None, "status_code": None})
+    return result
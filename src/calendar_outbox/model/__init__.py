@@ -0,0 +1 @@
+from .outbox_entry import *
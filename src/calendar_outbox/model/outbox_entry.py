@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from src.calendar_manager.model.calendar_mutation_result import (
+    CalendarMutationResult,
+)
+from src.generate_response.model.action_payloads import ActionPayloads
+
+
+class CalendarOutboxEntry(BaseModel):
+    key: str = Field(
+        description="Idempotency key, the same modifications are never queued twice."
+    )
+    thread_id: str = Field(description="Thread whose turn planned the modifications.")
+    payloads: ActionPayloads = Field(description="Modifications to apply.")
+    status: Literal["pending", "running", "done", "failed"] = Field(
+        default="pending",
+        description="`done` when every modification was applied, `failed` when some could not be.",
+    )
+    attempts: int = Field(default=0, description="Attempts made so far.")
+    results: list[CalendarMutationResult | None] = Field(
+        default_factory=list,
+        description="Latest result of every modification: creations, then updates, then deletions.",
+    )
+    next_attempt_at: datetime = Field(
+        description="When the modifications are due, or when a running attempt is considered lost."
+    )
+    reported: bool = Field(
+        default=False,
+        description="Whether the outcome was added to the thread's message history.",
+    )
+    created_at: datetime = Field(description="When the modifications were queued.")
+    updated_at: datetime = Field(description="When the entry last changed.")
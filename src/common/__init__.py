@@ -1,2 +1,4 @@
 from .main import *
 from .normalize_delta import *
+from .to_timestamp import *
+from .count_tokens import *
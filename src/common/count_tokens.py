@@ -0,0 +1,37 @@
+import logging
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Average characters per token of English text with BPE tokenizers
+_CHARS_PER_TOKEN = 4
+
+_encoding: Any = None
+
+
+def load_encoding() -> bool:
+    """
+    Loads the cl100k tokenizer used by `count_tokens`, downloaded on first use. It
+    blocks on the network, call it once at startup off the event loop. Returns
+    whether the tokenizer is available.
+    """
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.warning(f"tiktoken encoding unavailable, estimating tokens: {e}")
+            return False
+    return True
+
+
+def count_tokens(text: str) -> int:
+    """
+    Counts the tokens of `text` with the cl100k tokenizer once `load_encoding` has
+    loaded it, or estimates them from its length. Never touches the network.
+    """
+    if _encoding is None:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+    return len(_encoding.encode(text, disallowed_special=()))
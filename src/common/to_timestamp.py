@@ -0,0 +1,14 @@
+from datetime import UTC, date, datetime
+
+
+def to_timestamp(value: date | datetime) -> float:
+    """
+    Normalizes an iCalendar date/datetime into a UTC timestamp.
+
+    All-day dates and floating (naive) times are read as UTC.
+    """
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
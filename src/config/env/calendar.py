@@ -1,4 +1,7 @@
 import os
+from pathlib import Path
+
+from src.config.env.data import DATA_DIR
 
 # Calendar to schedule events
 CALENDAR_PROVIDER = os.getenv(
@@ -9,3 +12,124 @@ GOOGLE_SERVICE_ACCOUNT_FILE = os.getenv(
     "GOOGLE_SERVICE_ACCOUNT_FILE",
     "service-account.google.json",
 )  # path to credentials
+USER_TIMEZONE = os.getenv(
+    "USER_TIMEZONE", "UTC"
+)  # IANA time zone the dates of the user are read in
+TEMPORAL_CONTEXT_ENABLED = (
+    os.getenv("TEMPORAL_CONTEXT_ENABLED", "true").lower() == "true"
+)  # give the current date and the resolved relative dates with every turn
+
+# ICS feed fetching
+CALENDAR_FETCH_TIMEOUT = float(
+    os.getenv("CALENDAR_FETCH_TIMEOUT", "10")
+)  # seconds allowed per feed
+CALENDAR_FETCH_CONCURRENCY = int(
+    os.getenv("CALENDAR_FETCH_CONCURRENCY", "5")
+)  # feeds downloaded at the same time
+
+# Calendar parsing
+CALENDAR_PARSE_WORKERS = int(
+    os.getenv("CALENDAR_PARSE_WORKERS", "2")
+)  # processes parsing and expanding feeds, 0 to run them in threads
+
+# Calendar tool output
+CALENDAR_TOOL_TOKEN_BUDGET = (
+    int(os.getenv("CALENDAR_TOOL_TOKEN_BUDGET", "2000")) or None
+)  # tokens of events given to the LLM per search, 0 for no limit
+CALENDAR_MAX_OCCURRENCES = int(
+    os.getenv("CALENDAR_MAX_OCCURRENCES", "5000")
+)  # occurrences expanded per calendar and search
+CALENDAR_SERIES_MAX_OCCURRENCES = int(
+    os.getenv("CALENDAR_SERIES_MAX_OCCURRENCES", "50")
+)  # occurrences of a single series expanded per search
+CALENDAR_SERIES_COLLAPSE_DAYS = float(
+    os.getenv("CALENDAR_SERIES_COLLAPSE_DAYS", "14")
+)  # searches longer than this list every series once
+CALENDAR_PAGE_SIZE = int(
+    os.getenv("CALENDAR_PAGE_SIZE", "100")
+)  # events per page of a calendar search
+
+# Calendar modifications
+CALENDAR_BATCH_SIZE = int(
+    os.getenv("CALENDAR_BATCH_SIZE", "50")
+)  # event modifications sent in a single batch request
+CALENDAR_API_CONCURRENCY = int(
+    os.getenv("CALENDAR_API_CONCURRENCY", "10")
+)  # calendar API calls in flight at the same time
+CALENDAR_PREFLIGHT_ENABLED = (
+    os.getenv("CALENDAR_PREFLIGHT_ENABLED", "true").lower() == "true"
+)  # check modifications against the local copies before sending them
+CALENDAR_REJECT_OVERLAPS = (
+    os.getenv("CALENDAR_REJECT_OVERLAPS", "false").lower() == "true"
+)  # refuse modifications that would double-book, instead of warning
+
+# ICS feed cache
+CALENDAR_CACHE_TTL = float(
+    os.getenv("CALENDAR_CACHE_TTL", "300")
+)  # seconds a parsed feed is served without revalidation
+calendar_cache_dir = os.getenv("CALENDAR_CACHE_DIR")
+CALENDAR_CACHE_DIR = (
+    Path(calendar_cache_dir) if calendar_cache_dir else None
+)  # on-disk copy of the feeds for warm restarts
+
+# Expanded occurrences index
+CALENDAR_INDEX_PAST_DAYS = int(
+    os.getenv("CALENDAR_INDEX_PAST_DAYS", "30")
+)  # days before today kept in the index
+CALENDAR_INDEX_FUTURE_DAYS = int(
+    os.getenv("CALENDAR_INDEX_FUTURE_DAYS", "365")
+)  # days after today kept in the index
+
+# Background calendar mirror
+CALENDAR_MIRROR_ENABLED = (
+    os.getenv("CALENDAR_MIRROR_ENABLED", "false").lower() == "true"
+)  # serve searches from the local event store
+calendar_mirror_path = os.getenv("CALENDAR_MIRROR_PATH")
+CALENDAR_MIRROR_PATH = (
+    Path(calendar_mirror_path)
+    if calendar_mirror_path
+    else DATA_DIR / "calendar-mirror.db"
+)  # SQLite database of the mirror
+CALENDAR_MIRROR_INTERVAL = float(
+    os.getenv("CALENDAR_MIRROR_INTERVAL", "300")
+)  # seconds between syncs
+CALENDAR_MIRROR_MAX_STALENESS = float(
+    os.getenv("CALENDAR_MIRROR_MAX_STALENESS", "900")
+)  # older mirrored calendars are fetched live
+
+# Calendar write outbox
+CALENDAR_OUTBOX_ENABLED = (
+    os.getenv("CALENDAR_OUTBOX_ENABLED", "false").lower() == "true"
+)  # apply the agent's calendar modifications in the background
+calendar_outbox_path = os.getenv("CALENDAR_OUTBOX_PATH")
+CALENDAR_OUTBOX_PATH = (
+    Path(calendar_outbox_path)
+    if calendar_outbox_path
+    else DATA_DIR / "calendar-outbox.db"
+)  # SQLite database of the outbox
+CALENDAR_OUTBOX_MAX_ATTEMPTS = int(
+    os.getenv("CALENDAR_OUTBOX_MAX_ATTEMPTS", "5")
+)  # attempts before the modifications are reported as failed
+CALENDAR_OUTBOX_RETRY_DELAY = float(
+    os.getenv("CALENDAR_OUTBOX_RETRY_DELAY", "2")
+)  # seconds before the first retry, doubled after every attempt
+CALENDAR_OUTBOX_POLL_INTERVAL = float(
+    os.getenv("CALENDAR_OUTBOX_POLL_INTERVAL", "1")
+)  # seconds between two checks for due modifications
+
+# Google push notifications
+CALENDAR_WATCH_ENABLED = (
+    os.getenv("CALENDAR_WATCH_ENABLED", "false").lower() == "true"
+)  # refresh Google calendars when Google notifies a change
+CALENDAR_WATCH_ADDRESS = os.getenv(
+    "CALENDAR_WATCH_ADDRESS", ""
+)  # public HTTPS URL of POST /calendars/notifications
+CALENDAR_WATCH_TTL = int(
+    os.getenv("CALENDAR_WATCH_TTL", "604800")
+)  # seconds a notification channel is requested for
+CALENDAR_WATCH_RENEW_MARGIN = float(
+    os.getenv("CALENDAR_WATCH_RENEW_MARGIN", "3600")
+)  # channels are replaced this long before they expire
+CALENDAR_WATCH_RESYNC_INTERVAL = float(
+    os.getenv("CALENDAR_WATCH_RESYNC_INTERVAL", "3600")
+)  # seconds a watched calendar is reused without a notification
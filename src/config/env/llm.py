@@ -52,6 +52,33 @@ TOOL_EVALUATOR_LLM_STOP = (
     tool_evaluator_llm_stop.split(",") if tool_evaluator_llm_stop else None
 )
 
+COMBINED_RESPONSE_ENABLED = (
+    os.getenv("COMBINED_RESPONSE_ENABLED", "false").lower() == "true"
+)  # the tool evaluator answers itself when no tool is needed
+
+# Decision cache
+DECISION_CACHE_ENABLED = (
+    os.getenv("DECISION_CACHE_ENABLED", "true").lower() == "true"
+)  # reuse the tool evaluator decisions, only with a temperature of 0
+DECISION_CACHE_SIZE = int(
+    os.getenv("DECISION_CACHE_SIZE", "256")
+)  # decisions kept, the least recently used are dropped first
+DECISION_CACHE_TTL = float(os.getenv("DECISION_CACHE_TTL", "300"))  # seconds
+
+# Intent router
+INTENT_ROUTER_ENABLED = (
+    os.getenv("INTENT_ROUTER_ENABLED", "false").lower() == "true"
+)  # answer greetings, thanks and confirmations without the tool evaluator
+INTENT_ROUTER_LOG_ONLY = (
+    os.getenv("INTENT_ROUTER_LOG_ONLY", "true").lower() == "true"
+)  # when disabled, still log the routes for tuning, the tool evaluator decides
+INTENT_ROUTER_THRESHOLD = float(
+    os.getenv("INTENT_ROUTER_THRESHOLD", "0.8")
+)  # confidence below which the tool evaluator decides
+INTENT_ROUTER_MAX_WORDS = int(
+    os.getenv("INTENT_ROUTER_MAX_WORDS", "8")
+)  # longer messages always go to the tool evaluator
+
 # Text Embedding configuration
 TEXT_EMBEDDING_PROVIDER = LLMProvider(
     os.getenv("TEXT_EMBEDDING_PROVIDER") or LLM_PROVIDER
@@ -5,3 +5,14 @@ from dotenv import load_dotenv
 load_dotenv()
 
 ENV = os.getenv("ENV", "dev")
+BLOCKING_THREADS = int(
+    os.getenv("BLOCKING_THREADS", "16")
+)  # threads running the blocking calls of the agent off the event loop
+
+# Speculative tool prefetch
+TOOL_PREFETCH_ENABLED = (
+    os.getenv("TOOL_PREFETCH_ENABLED", "false").lower() == "true"
+)  # start the likely tool call while the next step is decided
+TOOL_PREFETCH_DAYS = float(
+    os.getenv("TOOL_PREFETCH_DAYS", "7")
+)  # days from today of the calendar window prefetched
@@ -10,6 +10,9 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
 )
 
+# Name of the messages reporting errors, told apart from the other system messages
+ERROR_MESSAGE_NAME = "error_handler"
+
 
 class ErrorHandler:
     prompt: str
@@ -38,7 +41,7 @@ class ErrorHandler:
         )
 
         logger.info(f"Rendered prompt: {rendered_prompt}")
-        return SystemMessage(content=rendered_prompt)
+        return SystemMessage(content=rendered_prompt, name=ERROR_MESSAGE_NAME)
 
     def _load_prompt(self) -> str:
         root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
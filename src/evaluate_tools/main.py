@@ -1,3 +1,4 @@
+import logging
 import os
 
 from langchain.llms.base import BaseLLM
@@ -7,14 +8,32 @@ from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import RunnableConfig, RunnableSerializable
 
 from src.config import env
-from src.evaluate_tools.model import ToolConfig
+from src.evaluate_tools.model import CombinedDecision, ToolConfig
+from src.evaluate_tools.service import DecisionCache, decision_key
 from src.llm.service import load_model
 
+logger = logging.getLogger(__name__)
+
+# Appended to the prompt when the decision and the response are a single call
+_COMBINED_INSTRUCTIONS = """
+---
+
+## Answering in the Same Call
+
+When you would choose `generate_response`, answer yourself instead: leave
+`tool_request` empty and fill `answer` with the response to the user, based on the
+chat history and the data retrieved by the tools. Consider modifying the calendar if
+necessary and include the data to do so. Otherwise fill `tool_request` with the tools
+to run and leave `answer` empty.
+"""
+
 
 class EvaluateTools:
     model: BaseLLM | BaseChatModel
     prompt: str
     chain: RunnableSerializable
+    combined_chain: RunnableSerializable
+    decision_cache: DecisionCache | None
 
     def __init__(self):
         self.model = load_model(
@@ -27,12 +46,18 @@ class EvaluateTools:
         )
         self.prompt = self._load_prompt()
         self.chain = self._load_chain()
+        self.combined_chain = self._load_chain(CombinedDecision, _COMBINED_INSTRUCTIONS)
+        self.decision_cache = self._load_decision_cache()
 
     def decide_next_step(
         self,
         config: RunnableConfig | None = None,
         query: list | None = None,
     ) -> ToolConfig:
+        key = self._decision_key(query)
+        if key is not None and (cached := self.decision_cache.get(key)) is not None:
+            return cached
+
         response = self.chain.invoke(
             {
                 "query": query,
@@ -40,7 +65,94 @@ class EvaluateTools:
             config=config,
         )
 
-        return ToolConfig.model_validate(response)
+        decision = ToolConfig.model_validate(response)
+        self._store_decision(key, decision)
+        return decision
+
+    async def adecide_next_step(
+        self,
+        config: RunnableConfig | None = None,
+        query: list | None = None,
+    ) -> ToolConfig:
+        key = self._decision_key(query)
+        if key is not None and (cached := self.decision_cache.get(key)) is not None:
+            return cached
+
+        response = await self.chain.ainvoke(
+            {
+                "query": query,
+            },
+            config=config,
+        )
+
+        decision = ToolConfig.model_validate(response)
+        self._store_decision(key, decision)
+        return decision
+
+    async def adecide_or_respond(
+        self,
+        config: RunnableConfig | None = None,
+        query: list | None = None,
+    ) -> CombinedDecision:
+        """
+        Decides the next step and, when no tool is needed, answers in the same call.
+        """
+        response = await self.combined_chain.ainvoke(
+            {
+                "query": query,
+            },
+            config=config,
+        )
+
+        return CombinedDecision.model_validate(response)
+
+    def forget_decision(self, query: list) -> None:
+        """
+        Drops the cached decision behind the last reasoning message of `query`, so a
+        decision that caused an error is not replayed.
+        """
+        if self.decision_cache is None:
+            return
+        last = max(
+            (
+                index
+                for index, message in enumerate(query)
+                if message.type == "reasoning"
+            ),
+            default=None,
+        )
+        if last is not None:
+            self.decision_cache.discard(decision_key(query[:last]))
+
+    def _decision_key(self, query: list | None) -> str | None:
+        if self.decision_cache is None or not query:
+            return None
+        return decision_key(query)
+
+    def _store_decision(self, key: str | None, decision: ToolConfig) -> None:
+        if key is None or self.decision_cache is None:
+            return
+        # A decision missing the payload of its tool fails, the model must see why
+        chosen = set(decision.tools or []) | {decision.tool}
+        payloads = {
+            "search_calendars": decision.search_calendars,
+            "find_free_slots": decision.find_free_slots,
+            "rag": decision.rag_query,
+        }
+        if any(payloads.get(tool, True) is None for tool in chosen):
+            return
+        self.decision_cache.put(key, decision)
+
+    def _load_decision_cache(self) -> DecisionCache | None:
+        if not env.DECISION_CACHE_ENABLED:
+            return None
+        # Sampled decisions are not meant to repeat
+        if env.TOOL_EVALUATOR_LLM_TEMPERATURE != 0:
+            logger.info(
+                "Decision cache disabled, the tool evaluator temperature is not 0"
+            )
+            return None
+        return DecisionCache(env.DECISION_CACHE_SIZE, env.DECISION_CACHE_TTL)
 
     def _load_prompt(self) -> str:
         root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
@@ -59,10 +171,14 @@ class EvaluateTools:
                 "Neither prompts/evaluate_tools.md nor prompts/evaluate_tools.example.md found."
             )
 
-    def _load_chain(self):
-        parser = JsonOutputParser(pydantic_object=ToolConfig)
+    def _load_chain(
+        self,
+        output: type[ToolConfig | CombinedDecision] = ToolConfig,
+        instructions: str = "",
+    ):
+        parser = JsonOutputParser(pydantic_object=output)
         prompt = PromptTemplate(
-            template=f"{self.prompt}",
+            template=f"{self.prompt}{instructions}",
             input_variables=[
                 "query",
             ],
@@ -1 +1,2 @@
 from .tool_config import *
+from .combined_decision import *
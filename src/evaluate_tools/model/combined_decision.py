@@ -0,0 +1,23 @@
+from typing import Self
+
+from pydantic import BaseModel, Field, model_validator
+
+from src.evaluate_tools.model.tool_config import ToolConfig
+from src.generate_response.model.response import LLMAPIResponse
+
+
+class CombinedDecision(BaseModel):
+    tool_request: ToolConfig | None = Field(
+        default=None,
+        description="Tools to run before answering. Leave None when you answer now.",
+    )
+    answer: LLMAPIResponse | None = Field(
+        default=None,
+        description="Response to the user, when no tool is needed to answer. Leave None when requesting tools.",
+    )
+
+    @model_validator(mode="after")
+    def _one_of(self) -> Self:
+        if (self.tool_request is None) == (self.answer is None):
+            raise ValueError("Exactly one of `tool_request` and `answer` must be set.")
+        return self
@@ -3,6 +3,7 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 from src.agent.model.steps import Steps
+from src.calendar_manager.model.find_free_slots import FindFreeSlots
 from src.calendar_manager.model.retrieve_events import RetrieveEvents
 
 
@@ -11,16 +12,32 @@ class ToolConfig(BaseModel):
         default=None,
         description=f"The payload to be sent to the calendar manager tool to search all events between two dates. Used to retrieve events. Is required if the tool set is ${Steps.search_calendars}.",
     )
+    find_free_slots: FindFreeSlots | None = Field(
+        default=None,
+        description=f"The payload to be sent to the free slots finder tool to find free time of a given duration across all calendars. Is required if the tool set is ${Steps.find_free_slots}.",
+    )
     rag_query: str | None = Field(
         default=None,
         description="The query to be sent to the RAG tool. Used to retrieve information from the RAG tool.",
     )
     tool: Literal[
         "search_calendars",
+        "find_free_slots",
         "get_current_date",
         "rag",
         "generate_response",
     ] = Field(
         description="The tool that the agent needs to use to retrieve the necessary information."
     )
+    tools: (
+        list[Literal["search_calendars", "find_free_slots", "get_current_date", "rag"]]
+        | None
+    ) = Field(
+        default=None,
+        description="Tools to run at the same time when the request needs more than one and none of them depends on the result of another (e.g., `rag` and `search_calendars` for known dates). Set the payload of each of them. Leave None to run only `tool`.",
+    )
+    final: bool = Field(
+        default=False,
+        description="Whether the results of the tool (or tools) chosen are enough to answer. When true the response is generated right after they run, without deciding again. Leave false when another tool may be needed or when answering without tools.",
+    )
     reason: str = Field(description="The reason why the agent needs to use this tool.")
@@ -0,0 +1 @@
+from .decision_cache import *
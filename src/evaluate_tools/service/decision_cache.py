@@ -0,0 +1,90 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+
+from langchain_core.messages import BaseMessage
+
+from src.error_handler import ERROR_MESSAGE_NAME
+from src.evaluate_tools.model.tool_config import ToolConfig
+
+logger = logging.getLogger(__name__)
+
+
+def decision_key(messages: Sequence[BaseMessage]) -> str:
+    """
+    Fingerprint of the conversation a decision is made on.
+
+    The previous decisions (reasoning messages) and the errors reported by the error
+    handler are left out. Re-entering the evaluator after a failed tool then replays
+    the decision that chose it, and a decision that caused the error itself can be
+    found and dropped. Whitespace is collapsed and structured contents are
+    serialized with sorted keys.
+    """
+    digest = hashlib.sha256()
+    for message in messages:
+        if message.type == "reasoning" or message.name == ERROR_MESSAGE_NAME:
+            continue
+        content = message.content
+        if not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True, default=str)
+        digest.update(f"{message.type}\0{' '.join(content.split())}\0".encode())
+    return digest.hexdigest()
+
+
+class DecisionCache:
+    """
+    Decisions of the tool evaluator, keyed by `decision_key`.
+
+    Bounded to `size` entries, the least recently used being evicted first, and
+    entries expire `ttl` seconds after being stored. Decisions are copied in and
+    out, as the workflow keeps them in its state.
+    """
+
+    size: int
+    ttl: float
+    hits: int
+    misses: int
+
+    def __init__(
+        self,
+        size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.size = size
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, ToolConfig]] = OrderedDict()
+
+    def get(self, key: str) -> ToolConfig | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= self.clock():
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        logger.info(f"Reusing the decision {entry[1].tool} of {key[:12]}")
+        return entry[1].model_copy(deep=True)
+
+    def put(self, key: str, decision: ToolConfig) -> None:
+        if self.size <= 0:
+            return
+        self._entries[key] = (self.clock() + self.ttl, decision.model_copy(deep=True))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        if self._entries.pop(key, None) is not None:
+            logger.info(f"Dropped the decision of {key[:12]}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -56,6 +56,19 @@ class ResponseGenerator:
         )
         return LLMAPIResponse.model_validate(response)
 
+    async def agenerate_response(
+        self,
+        config: RunnableConfig | None = None,
+        query: list | None = None,
+    ) -> LLMAPIResponse:
+        response = await self.chain.ainvoke(
+            {
+                "query": query,
+            },
+            config=config,
+        )
+        return LLMAPIResponse.model_validate(response)
+
     async def generate_websocket_response(
         self,
         websocket: WebSocket,
@@ -111,6 +124,20 @@ class ResponseGenerator:
         logger.info(f"Response: {response}")
         return LLMWhatsAppResponse.model_validate(response)
 
+    async def agenerate_whatsapp_response(
+        self,
+        config: RunnableConfig | None = None,
+        query: list | None = None,
+    ) -> LLMWhatsAppResponse:
+        response = await self.whatsapp_chain.ainvoke(
+            {
+                "query": query,
+            },
+            config=config,
+        )
+        logger.info(f"Response: {response}")
+        return LLMWhatsAppResponse.model_validate(response)
+
     def _load_chain(self):
         parser = JsonOutputParser(pydantic_object=LLMAPIResponse)
         prompt = PromptTemplate(
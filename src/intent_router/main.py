@@ -0,0 +1,190 @@
+import logging
+import re
+import zlib
+
+import numpy as np
+
+from src.config import env
+from src.intent_router.model import Intent, IntentRoute
+
+logger = logging.getLogger(__name__)
+
+# Whole messages answered without the tool evaluator
+DEFAULT_RULES: dict[Intent, re.Pattern] = {
+    Intent.greeting: re.compile(
+        r"(hi|hello|hey|hiya|yo|good (morning|afternoon|evening)|howdy)( there| lis)?",
+        re.IGNORECASE,
+    ),
+    Intent.acknowledgement: re.compile(
+        r"(thanks?( you)?( so much| a lot)?|thx|ty|ok(ay)?|great|cool|nice|perfect"
+        r"|got it|sounds good|awesome|noted)( thanks?( you)?)?",
+        re.IGNORECASE,
+    ),
+    Intent.confirmation: re.compile(
+        r"(yes|yeah|yep|sure|confirm(ed)?|go ahead|do it|please do|book it|"
+        r"yes,? (please|book it|do it|go ahead|confirm))( please| thanks?)?",
+        re.IGNORECASE,
+    ),
+}
+
+# Trains the linear model, anything unlike these is `other`
+TRAINING_EXAMPLES: dict[Intent, list[str]] = {
+    Intent.greeting: [
+        "hi",
+        "hello there",
+        "hey lis, good morning",
+        "good evening!",
+        "hi, how are you?",
+        "hello, hope you're well",
+        "morning!",
+        "hey, what's up",
+    ],
+    Intent.acknowledgement: [
+        "thanks!",
+        "thank you very much",
+        "ok thanks",
+        "great, thank you",
+        "perfect, that's all",
+        "got it, thanks a lot",
+        "cool, appreciate it",
+        "alright, sounds good",
+        "nice one, thanks",
+    ],
+    Intent.confirmation: [
+        "yes, book it",
+        "yes please",
+        "sure, go ahead",
+        "confirm",
+        "yes, create the event",
+        "go ahead and schedule it",
+        "that works, book it",
+        "yep, do it",
+        "yes, delete it",
+        "ok, move it then",
+    ],
+    Intent.other: [
+        "what's on my calendar tomorrow?",
+        "am I free on friday afternoon?",
+        "schedule a meeting with alex next week",
+        "who is my manager?",
+        "cancel my 3pm event",
+        "find me a free hour on thursday",
+        "what does the handbook say about PTO?",
+        "move my standup to 10am",
+        "do I have anything next monday?",
+        "book a dentist appointment",
+        "yes, but move it to friday instead",
+        "no, make it 4pm",
+        "thanks, and what about next week?",
+        "hi, am I busy today?",
+    ],
+}
+
+
+class HashedLinearClassifier:
+    """
+    Softmax regression over hashed word and character n-grams, small enough to train
+    on start.
+    """
+
+    intents: list[Intent]
+    features: int
+
+    def __init__(
+        self,
+        examples: dict[Intent, list[str]],
+        features: int = 2**12,
+        epochs: int = 200,
+        learning_rate: float = 0.5,
+    ) -> None:
+        self.intents = list(examples)
+        self.features = features
+        x = np.stack(
+            [self._vector(text) for texts in examples.values() for text in texts]
+        )
+        y = np.array(
+            [index for index, texts in enumerate(examples.values()) for _ in texts]
+        )
+        targets = np.eye(len(self.intents))[y]
+
+        self.weights = np.zeros((features, len(self.intents)))
+        self.bias = np.zeros(len(self.intents))
+        for _ in range(epochs):
+            gradient = (self._softmax(x @ self.weights + self.bias) - targets) / len(x)
+            self.weights -= learning_rate * (x.T @ gradient)
+            self.bias -= learning_rate * gradient.sum(axis=0)
+
+    def predict(self, text: str) -> tuple[Intent, float]:
+        """
+        Returns the most likely intent of `text` and its probability.
+        """
+        probabilities = self._softmax(self._vector(text) @ self.weights + self.bias)
+        best = int(probabilities.argmax())
+        return self.intents[best], float(probabilities[best])
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.features)
+        text = " ".join(re.findall(r"[a-z0-9']+", text.casefold()))
+        words = text.split()
+        grams = [f"w:{word}" for word in words]
+        grams += [f"b:{a} {b}" for a, b in zip(words, words[1:], strict=False)]
+        padded = f" {text} "
+        grams += [f"c:{padded[i : i + 3]}" for i in range(len(padded) - 2)]
+        for gram in grams:
+            vector[zlib.crc32(gram.encode()) % self.features] += 1
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _softmax(scores: np.ndarray) -> np.ndarray:
+        exp = np.exp(scores - scores.max(axis=-1, keepdims=True))
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class IntentRouter:
+    """
+    Classifies short messages that need no tool (greetings, acknowledgements,
+    confirmations) with rules first and a hashed-feature linear model second.
+    Messages it is unsure about are left to the tool evaluator.
+    """
+
+    rules: dict[Intent, re.Pattern]
+    classifier: HashedLinearClassifier
+    threshold: float
+    max_words: int
+
+    def __init__(
+        self,
+        rules: dict[Intent, re.Pattern] | None = None,
+        examples: dict[Intent, list[str]] | None = None,
+        threshold: float = env.INTENT_ROUTER_THRESHOLD,
+        max_words: int = env.INTENT_ROUTER_MAX_WORDS,
+    ) -> None:
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.classifier = HashedLinearClassifier(examples or TRAINING_EXAMPLES)
+        self.threshold = threshold
+        self.max_words = max_words
+
+    def classify(self, text: str) -> IntentRoute | None:
+        """
+        Returns the intent of `text`, or None when the tool evaluator should decide.
+        """
+        text = text.strip()
+        if not text or len(text.split()) > self.max_words:
+            return None
+
+        bare = text.strip(" !.,?:;)(").strip()
+        for intent, rule in self.rules.items():
+            if rule.fullmatch(bare):
+                route = IntentRoute(intent=intent, confidence=1.0, source="rule")
+                break
+        else:
+            intent, confidence = self.classifier.predict(text)
+            route = IntentRoute(intent=intent, confidence=confidence, source="model")
+
+        logger.info(
+            f"Intent of {text!r}: {route.intent.value} ({route.confidence:.2f}, {route.source})"
+        )
+        if route.intent == Intent.other or route.confidence < self.threshold:
+            return None
+        return route
@@ -0,0 +1,2 @@
+from .intent import *
+from .intent_route import *
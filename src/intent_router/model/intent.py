@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class Intent(Enum):
+    greeting = "greeting"  # Hi, good morning...
+    acknowledgement = "acknowledgement"  # Thanks, ok, got it...
+    confirmation = "confirmation"  # Yes, book it...
+    other = "other"  # Anything that needs the tool evaluator.
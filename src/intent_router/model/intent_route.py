@@ -0,0 +1,15 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from src.intent_router.model.intent import Intent
+
+
+class IntentRoute(BaseModel):
+    intent: Intent = Field(description="Intent of the message.")
+    confidence: float = Field(
+        ge=0, le=1, description="Confidence in the intent, 1 for rule matches."
+    )
+    source: Literal["rule", "model"] = Field(
+        description="Whether a rule or the linear model classified the message."
+    )
@@ -1,9 +1,15 @@
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from textwrap import dedent
 
 from fastapi import APIRouter, FastAPI
 
+from src.agent import workflow
+from src.common import load_encoding
 from src.config.env import main
+from src.rest.calendars import router as calendars_router
 from src.rest.graph import router as graph_router
 from src.rest.messages import router as messages_router
 from src.rest.threads import router as threads_router
@@ -16,6 +22,28 @@ logging.basicConfig(
 )
 logging.info(f"Initializing {__name__} for environment {main.ENV}...")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Blocking calls offloaded with asyncio.to_thread, by Lis or by LangChain, share
+    # this bounded pool instead of holding the event loop
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(main.BLOCKING_THREADS, thread_name_prefix="lis-blocking")
+    )
+    # The tokenizer may be downloaded, tokens are estimated until it is loaded
+    await asyncio.to_thread(load_encoding)
+    workflow.calendar_manager.worker_pool.start()
+    workflow.calendar_manager.start_mirror()
+    workflow.calendar_manager.start_watch()
+    if workflow.calendar_outbox is not None:
+        workflow.calendar_outbox.start()
+    yield
+    if workflow.calendar_outbox is not None:
+        await workflow.calendar_outbox.aclose()
+    # Release pooled connections held by the worker
+    await workflow.calendar_manager.aclose()
+
+
 # --- Metadata taken from README ------------------------------------------------
 app = FastAPI(
     title="Lis Secretary Agent",
@@ -47,6 +75,7 @@ app = FastAPI(
     },
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # --- Tag metadata (shows up as sections in the docs) ---------------------------
@@ -67,6 +96,10 @@ tags_metadata = [
         "name": "Vectorstore",
         "description": "Handle vectorstore data.",
     },
+    {
+        "name": "Calendars",
+        "description": "Inspect calendar retrieval.",
+    },
 ]
 app.openapi_tags = tags_metadata
 
@@ -83,3 +116,4 @@ app.include_router(agent_router)
 
 # Other routes
 app.include_router(vectorstore_router, prefix="/vectorstore", tags=["Vectorstore"])
+app.include_router(calendars_router, prefix="/calendars", tags=["Calendars"])
@@ -2,3 +2,4 @@ from .messages import *
 from .threads import *
 from .graph import *
 from .vectorstore import *
+from .calendars import *
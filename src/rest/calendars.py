@@ -0,0 +1,33 @@
+from fastapi import APIRouter, HTTPException, Request
+
+from src.agent import workflow
+from src.calendar_manager.model.cached_feed import FeedCacheStats
+from src.calendar_manager.model.worker_pool_stats import WorkerPoolStats
+
+router = APIRouter()
+
+
+@router.get("/cache", response_model=FeedCacheStats)
+async def get_calendar_cache_stats():
+    """
+    API endpoint to retrieve the hit/miss counters of the calendar feed cache.
+    """
+    return workflow.calendar_manager.feed_cache.stats()
+
+
+@router.get("/workers", response_model=WorkerPoolStats)
+async def get_calendar_worker_stats():
+    """
+    API endpoint to retrieve the queue wait and parse time of the calendar workers.
+    """
+    return workflow.calendar_manager.worker_pool.stats()
+
+
+@router.post("/notifications")
+async def receive_calendar_notification(request: Request):
+    """
+    API endpoint receiving the push notifications of the Google Calendar channels
+    opened by Lis. The changed calendar is refreshed in the background.
+    """
+    if not await workflow.calendar_manager.handle_notification(request.headers):
+        raise HTTPException(status_code=404, detail="Unknown notification channel.")
@@ -2,9 +2,11 @@ import logging
 
 from fastapi import APIRouter, HTTPException
 
+from src.agent import workflow
 from src.agent.graph import (
     render_mermaid,
 )  # already instanced Workflow()
+from src.agent.model.prefetch_stats import PrefetchStats
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,15 @@ async def get_workflow_graph_string():
         raise HTTPException(status_code=500, detail=e) from e
 
 
+@router.get(
+    "/prefetch",
+    response_model=PrefetchStats,
+    summary="Return the hit rate and the time saved by the speculative tool prefetch",
+)
+async def get_prefetch_stats():
+    return workflow.prefetcher.stats()
+
+
 # @router.get(
 #     "/mermaid-png",
 #     summary="Return a PNG rendering of the compiled workflow graph",
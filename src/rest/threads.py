@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException
 
+from src.agent import workflow
 from src.agent.threads import clear_thread, get_latest_thread_state, get_thread_history
+from src.calendar_outbox.model import CalendarOutboxEntry
 
 router = APIRouter()
 
@@ -50,6 +52,19 @@ async def get_thread_history_endpoint(thread_id: str):
         ) from e
 
 
+@router.get("/{thread_id}/calendar-writes")
+async def get_thread_calendar_writes_endpoint(
+    thread_id: str,
+) -> list[CalendarOutboxEntry]:
+    """
+    API endpoint to list the calendar modifications queued by a specific thread and
+    their status.
+    """
+    if workflow.calendar_outbox is None:
+        raise HTTPException(status_code=404, detail="Calendar outbox is disabled.")
+    return workflow.calendar_outbox.entries(thread_id)
+
+
 @router.delete("/{thread_id}")
 async def delete_thread_data(thread_id: str):
     try:
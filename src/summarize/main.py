@@ -60,13 +60,41 @@ class Summarizer:
     def summarize_conditionally(
         self, state: GraphState, config: RunnableConfig | None = None
     ):
+        split = self._split(state)
+        if split is None:
+            return
+        system_head, to_summarize, keep_tail = split
+
+        # 4) Produce the summary text/object ONLY from the chosen set
+        summary = self.summarize(to_summarize, config)
+        self._rewrite(state, system_head, summary, keep_tail)
+
+    async def asummarize_conditionally(
+        self, state: GraphState, config: RunnableConfig | None = None
+    ):
+        split = self._split(state)
+        if split is None:
+            return
+        system_head, to_summarize, keep_tail = split
+
+        # 4) Produce the summary text/object ONLY from the chosen set
+        summary = await self.asummarize(to_summarize, config)
+        self._rewrite(state, system_head, summary, keep_tail)
+
+    def _split(
+        self, state: GraphState
+    ) -> tuple[list[BaseMessage], list[BaseMessage], list[BaseMessage]] | None:
+        """
+        Returns the system messages to keep, the messages to summarize and the keep
+        tail, or None when there is nothing to summarize yet.
+        """
         total = len(state.messages)
         keep = state.summarize_message_keep
         window = state.summarize_message_window
 
         pre_keep = max(0, total - keep)
         if pre_keep < window:
-            return  # don’t summarize until there’s enough history
+            return None  # don’t summarize until there’s enough history
 
         # 1) Split: everything before the keep-tail will be summarized (subject to the flag)
         pre_region = state.messages[:pre_keep]
@@ -85,11 +113,17 @@ class Summarizer:
 
         # If there’s nothing to summarize (e.g., only system messages), skip work
         if not to_summarize:
-            return
+            return None
 
-        # 4) Produce the summary text/object ONLY from the chosen set
-        summary = self.summarize(to_summarize, config)
+        return system_head, to_summarize, keep_tail
 
+    def _rewrite(
+        self,
+        state: GraphState,
+        system_head: list[BaseMessage],
+        summary: SummarizeOutput,
+        keep_tail: list[BaseMessage],
+    ) -> None:
         # 5) Build a single reducer update:
         #    - remove ALL current messages (so we control final order deterministically)
         ops: list[BaseMessage] = [RemoveMessage(id=m.id) for m in state.messages]  # type: ignore[assignment]
@@ -132,6 +166,14 @@ class Summarizer:
         response = self.chain.invoke({"query": query}, config=config)
         return SummarizeOutput.model_validate(response)
 
+    async def asummarize(
+        self,
+        query: list,
+        config: RunnableConfig | None = None,
+    ) -> SummarizeOutput:
+        response = await self.chain.ainvoke({"query": query}, config=config)
+        return SummarizeOutput.model_validate(response)
+
     def _load_prompt(self) -> str:
         root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
         prompt_dir = os.path.join(root_dir, "prompts")
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Any
 
@@ -105,6 +106,15 @@ class VectorManager:
             logger.error(f"Error retrieving documents: {str(e)}", exc_info=True)
             raise
 
+    async def aretrieve(
+        self, query: str, top_k: int = 5, metadata_filter: dict | None = None
+    ) -> list[Document]:
+        """
+        Same as `retrieve`, run on the blocking thread pool so the Milvus client does
+        not hold the event loop.
+        """
+        return await asyncio.to_thread(self.retrieve, query, top_k, metadata_filter)
+
     def add_documents(self, documents: list[Document]):
         """
         Add new documents to the Milvus vectorstore.
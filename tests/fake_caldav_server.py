@@ -0,0 +1,68 @@
+import xml.etree.ElementTree as ET
+from datetime import UTC, datetime
+
+import httpx
+import icalendar
+
+NAMESPACES = {"D": "DAV:", "C": "urn:ietf:params:xml:ns:caldav"}
+
+
+class FakeCalDAVServer:
+    """
+    In-process stand-in of a CalDAV server answering `calendar-query` REPORTs.
+
+    It is used as the handler of an `httpx.MockTransport`.
+    """
+
+    def __init__(self) -> None:
+        # href -> VCALENDAR text of the resource
+        self.resources: dict[str, str] = {}
+        self.requests: list[httpx.Request] = []
+        self.returned: list[str] = []
+
+    def put(self, href: str, vevent: str) -> None:
+        self.resources[href] = (
+            "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Fake//CalDAV//EN\r\n"
+            f"{vevent.strip()}\r\nEND:VCALENDAR\r\n"
+        )
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.method != "REPORT":
+            return httpx.Response(405)
+
+        time_range = ET.fromstring(request.content).find(".//C:time-range", NAMESPACES)
+        if time_range is None:
+            return httpx.Response(400)
+        start = self._parse_time(time_range.attrib["start"])
+        end = self._parse_time(time_range.attrib["end"])
+
+        responses = []
+        for href, ics in self.resources.items():
+            if not self._overlaps(ics, start, end):
+                continue
+            self.returned.append(href)
+            data = ics.replace("&", "&amp;").replace("<", "&lt;")
+            responses.append(
+                f"<D:response><D:href>{href}</D:href><D:propstat><D:prop>"
+                f"<C:calendar-data>{data}</C:calendar-data>"
+                "</D:prop><D:status>HTTP/1.1 200 OK</D:status></D:propstat>"
+                "</D:response>"
+            )
+
+        body = (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            '<D:multistatus xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">'
+            f"{''.join(responses)}</D:multistatus>"
+        )
+        return httpx.Response(207, content=body.encode())
+
+    def _overlaps(self, ics: str, start: datetime, end: datetime) -> bool:
+        event = icalendar.Calendar.from_ical(ics).walk("VEVENT")[0]
+        if "RRULE" in event:
+            # Series without an end may always overlap
+            return event.start < end
+        return event.start < end and event.end > start
+
+    def _parse_time(self, value: str) -> datetime:
+        return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=UTC)
@@ -0,0 +1,57 @@
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model answering every prompt with the JSON of `reply` after `latency`
+    seconds.
+
+    Sync calls sleep in the calling thread, as a blocking HTTP client would, and
+    async calls sleep on the event loop. `reply` is either a fixed object or a
+    function of the prompt. Every call is recorded in `calls`.
+    """
+
+    reply: dict[str, Any] | Callable[[str], dict[str, Any]]
+    latency: float = 0
+    calls: list[str] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result(messages)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result(messages)
+
+    def _result(self, messages: list[BaseMessage]) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        self.calls.append(prompt)
+        reply = self.reply(prompt) if callable(self.reply) else self.reply
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=json.dumps(reply)))]
+        )
@@ -0,0 +1,318 @@
+import json
+from datetime import UTC, datetime, timedelta
+from email.parser import Parser
+from email.utils import format_datetime
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlparse
+
+import httplib2
+import httpx
+from google.auth import jwt
+from googleapiclient.discovery import build
+
+EVENTS_PATH = "/calendar/v3/calendars/"
+BATCH_PATH = "/batch/calendar/v3"
+CHANNELS_STOP_PATH = "/calendar/v3/channels/stop"
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+
+class FakeGoogleCalendar:
+    """
+    In-process stand-in of the Google Calendar REST API.
+
+    It is passed as the `http` object of a real discovery-based client, so requests
+    go through googleapiclient exactly as they would against Google. It also serves
+    httpx clients, with the OAuth token endpoint, through `transport`.
+    """
+
+    def __init__(self, page_size: int = 2500, public_key: bytes | None = None) -> None:
+        self.page_size = page_size
+        self.events: dict[str, dict[str, Any]] = {}
+        # Every API call, including the ones sent inside a batch
+        self.requests: list[tuple[str, str]] = []
+        # Actual HTTP round-trips
+        self.round_trips = 0
+        self._sequence = 0
+        self._changed_at: dict[str, int] = {}
+        self._expired_before = 0
+        # Signed JWT assertions are checked against it when given
+        self.public_key = public_key
+        self.access_token: str | None = None
+        self.token_lifetime = 3600
+        self.token_grants = 0
+        self._failures = 0
+        # Open notification channels by ID
+        self.channels: dict[str, dict[str, Any]] = {}
+        self.max_channel_ttl = 30 * 24 * 3600
+        self._message_number = 0
+        self._fail_after_apply = False
+
+    def client(self):
+        return build("calendar", "v3", http=self, static_discovery=True)
+
+    # ---------- test controls ---------- #
+    def put(self, resource: dict[str, Any]) -> dict[str, Any]:
+        self._sequence += 1
+        resource = {"status": "confirmed", **resource}
+        resource.setdefault("iCalUID", f"{resource['id']}@google.com")
+        self.events[resource["id"]] = resource
+        self._changed_at[resource["id"]] = self._sequence
+        return resource
+
+    def cancel(self, event_id: str) -> None:
+        self.put({**self.events[event_id], "status": "cancelled"})
+
+    def expire_sync_tokens(self) -> None:
+        self._expired_before = self._sequence + 1
+
+    def revoke_access_token(self) -> None:
+        self.access_token = None
+
+    def fail_next(self, count: int, after_apply: bool = False) -> None:
+        """
+        Answers the next `count` httpx API calls with 503. With `after_apply` the
+        calls still take effect, as when the response is lost on the way back.
+        """
+        self._failures = count
+        self._fail_after_apply = after_apply
+
+    async def notify(
+        self,
+        client: httpx.AsyncClient,
+        calendar_id: str,
+        resource_state: str = "exists",
+    ) -> list[int]:
+        """
+        Posts a notification to every channel watching `calendar_id`, as Google does
+        when its events change. Returns the status codes of the responses.
+        """
+        statuses = []
+        for channel in list(self.channels.values()):
+            if channel["calendar_id"] != calendar_id:
+                continue
+            self._message_number += 1
+            response = await client.post(
+                channel["address"],
+                headers={
+                    "X-Goog-Channel-ID": channel["id"],
+                    "X-Goog-Channel-Token": channel["token"],
+                    "X-Goog-Channel-Expiration": channel["expiration_header"],
+                    "X-Goog-Resource-ID": channel["resourceId"],
+                    "X-Goog-Resource-URI": channel["resourceUri"],
+                    "X-Goog-Resource-State": resource_state,
+                    "X-Goog-Message-Number": str(self._message_number),
+                },
+            )
+            statuses.append(response.status_code)
+        return statuses
+
+    # ---------- httpx interface ---------- #
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self._handle)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.round_trips += 1
+        if str(request.url) == TOKEN_URI:
+            return self._grant(parse_qs(request.content.decode()))
+        authorization = request.headers.get("Authorization")
+        if self.access_token is None or authorization != f"Bearer {self.access_token}":
+            return httpx.Response(401, json={"error": {"code": 401}})
+
+        unavailable = httpx.Response(503, json={"error": {"code": 503}})
+        if self._failures and not self._fail_after_apply:
+            self._failures -= 1
+            return unavailable
+        status, payload = self._call(
+            request.method, str(request.url), request.content.decode() or None
+        )
+        if self._failures:
+            self._failures -= 1
+            return unavailable
+        if payload is None:
+            return httpx.Response(status)
+        return httpx.Response(status, json=payload)
+
+    def _grant(self, form: dict[str, list[str]]) -> httpx.Response:
+        claims = jwt.decode(
+            form["assertion"][0],
+            certs=self.public_key,
+            verify=self.public_key is not None,
+            audience=TOKEN_URI,
+        )
+        if form["grant_type"] != ["urn:ietf:params:oauth:grant-type:jwt-bearer"]:
+            return httpx.Response(400, json={"error": "unsupported_grant_type"})
+
+        self.token_grants += 1
+        self.access_token = f"token-{self.token_grants}-{claims['iss']}"
+        return httpx.Response(
+            200,
+            json={
+                "access_token": self.access_token,
+                "expires_in": self.token_lifetime,
+                "token_type": "Bearer",
+            },
+        )
+
+    # ---------- httplib2 interface ---------- #
+    def request(
+        self,
+        uri: str,
+        method: str = "GET",
+        body: Any = None,
+        headers: Any = None,
+        redirections: int = 5,
+        connection_type: Any = None,
+    ) -> tuple[httplib2.Response, bytes]:
+        self.round_trips += 1
+        if urlparse(uri).path == BATCH_PATH:
+            return self._batch(body, headers)
+        status, payload = self._call(method, uri, body)
+        return self._respond(status, payload)
+
+    def _call(self, method: str, uri: str, body: Any) -> tuple[int, dict | None]:
+        url = urlparse(uri)
+        self.requests.append((method, url.path))
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path == CHANNELS_STOP_PATH and method == "POST":
+            return self._stop(json.loads(body))
+
+        if not url.path.startswith(EVENTS_PATH):
+            return 404, {"error": {"code": 404}}
+        calendar_id, _, rest = url.path.removeprefix(EVENTS_PATH).partition("/")
+        calendar_id = unquote(calendar_id)
+        event_id = unquote(rest.removeprefix("events/")) if "/" in rest else None
+
+        if rest == "events" and method == "GET":
+            return self._list(query)
+        if rest == "events" and method == "POST":
+            return self._insert(json.loads(body))
+        if rest == "events/watch" and method == "POST":
+            return self._watch(calendar_id, json.loads(body))
+        if event_id is not None and method == "PATCH":
+            return self._patch(event_id, json.loads(body))
+        if event_id is not None and method == "DELETE":
+            return self._delete(event_id)
+        return 404, {"error": {"code": 404}}
+
+    def _insert(self, body: dict[str, Any]) -> tuple[int, dict]:
+        event_id = body.get("id") or f"created{self._sequence + 1}"
+        if event_id in self.events:
+            return 409, {
+                "error": {
+                    "code": 409,
+                    "message": "The requested identifier already exists.",
+                }
+            }
+        return 200, self.put(
+            {**body, "id": event_id, "htmlLink": f"https://calendar/{event_id}"}
+        )
+
+    def _patch(self, event_id: str, body: dict[str, Any]) -> tuple[int, dict]:
+        if event_id not in self.events:
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+        return 200, self.put({**self.events[event_id], **body})
+
+    def _delete(self, event_id: str) -> tuple[int, dict | None]:
+        event = self.events.get(event_id)
+        if event is None:
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+        if event["status"] == "cancelled":
+            return 410, {"error": {"code": 410, "message": "Resource has been deleted"}}
+        self.cancel(event_id)
+        return 204, None
+
+    def _watch(self, calendar_id: str, body: dict[str, Any]) -> tuple[int, dict]:
+        if body.get("type") != "web_hook" or not body.get("address"):
+            return 400, {"error": {"code": 400, "message": "Invalid channel"}}
+        if body["id"] in self.channels:
+            return 400, {"error": {"code": 400, "message": "Channel id not unique"}}
+
+        ttl = min(int(body.get("params", {}).get("ttl", 604800)), self.max_channel_ttl)
+        expiration = datetime.now(UTC) + timedelta(seconds=ttl)
+        channel = {
+            "kind": "api#channel",
+            "id": body["id"],
+            "resourceId": f"resource-{calendar_id}",
+            "resourceUri": f"https://www.googleapis.com{EVENTS_PATH}{calendar_id}/events",
+            "token": body.get("token", ""),
+            "expiration": str(int(expiration.timestamp() * 1000)),
+        }
+        self.channels[body["id"]] = {
+            **channel,
+            "calendar_id": calendar_id,
+            "address": body["address"],
+            "expiration_header": format_datetime(expiration, usegmt=True),
+        }
+        return 200, channel
+
+    def _stop(self, body: dict[str, Any]) -> tuple[int, dict | None]:
+        channel = self.channels.get(body.get("id", ""))
+        if channel is None or channel["resourceId"] != body.get("resourceId"):
+            return 404, {"error": {"code": 404, "message": "Channel not found"}}
+        del self.channels[body["id"]]
+        return 204, None
+
+    def _batch(
+        self, body: str, headers: dict[str, str]
+    ) -> tuple[httplib2.Response, bytes]:
+        message = Parser().parsestr(
+            f"content-type: {headers['content-type']}\r\n\r\n{body}"
+        )
+        boundary = "batch_response"
+        parts = []
+        for part in message.get_payload():
+            request_line, _, rest = part.get_payload().partition("\n")
+            method, path, _ = request_line.split(" ")
+            call_body = Parser().parsestr(rest).get_payload().strip()
+            status, payload = self._call(
+                method, f"https://www.googleapis.com{path}", call_body or None
+            )
+            content = "" if payload is None else json.dumps(payload)
+            content_id = part["Content-ID"].strip("<>")
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-ID: <response-{content_id}>\r\n\r\n"
+                f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n\r\n"
+                f"{content}\r\n"
+            )
+        content = "".join(parts) + f"--{boundary}--\r\n"
+        response = httplib2.Response(
+            {
+                "status": 200,
+                "content-type": f"multipart/mixed; boundary={boundary}",
+            }
+        )
+        return response, content.encode()
+
+    def _list(self, query: dict[str, str]) -> tuple[int, dict]:
+        sync_token = query.get("syncToken")
+        if sync_token is not None:
+            since = int(sync_token)
+            if since < self._expired_before:
+                return 410, {"error": {"code": 410, "message": "Gone"}}
+            ids = [i for i, seq in self._changed_at.items() if seq > since]
+        else:
+            since = 0
+            # Like Google, cancelled instances of recurring events are listed
+            # even without showDeleted
+            ids = [
+                i
+                for i, e in self.events.items()
+                if e["status"] != "cancelled" or "recurringEventId" in e
+            ]
+
+        offset = int(query.get("pageToken", "0"))
+        page = ids[offset : offset + self.page_size]
+        response: dict[str, Any] = {"items": [self.events[i] for i in page]}
+        if offset + self.page_size < len(ids):
+            response["nextPageToken"] = str(offset + self.page_size)
+        else:
+            response["nextSyncToken"] = str(self._sequence)
+        return 200, response
+
+    def _respond(
+        self, status: int, payload: dict[str, Any] | None
+    ) -> tuple[httplib2.Response, bytes]:
+        content = b"" if payload is None else json.dumps(payload).encode()
+        return httplib2.Response({"status": status}), content
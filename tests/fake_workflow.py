@@ -0,0 +1,47 @@
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.agent import workflow as workflow_module
+from src.agent.workflow import Workflow
+from src.calendar_manager import CalendarManager
+from src.evaluate_tools import main as evaluate_tools_module
+from src.generate_response import main as generate_response_module
+from src.summarize import main as summarize_module
+from tests.fake_chat_model import FakeChatModel
+
+# The answer of a turn that needs nothing else
+REPLY = {
+    "response": "Hello!",
+    "next_step": "end",
+    "next_step_reason": "Waiting for the user",
+}
+
+
+def build_workflow(
+    monkeypatch,
+    tool_evaluator: FakeChatModel,
+    response_generator: FakeChatModel | None = None,
+    summarizer: FakeChatModel | None = None,
+    calendar_manager: CalendarManager | None = None,
+    vector_manager=None,
+) -> Workflow:
+    """
+    Builds the real workflow, compiled with an in-memory checkpointer, on fake
+    models and without any calendar or vector store configured.
+    """
+    models = {
+        evaluate_tools_module: tool_evaluator,
+        generate_response_module: response_generator or FakeChatModel(reply=REPLY),
+        summarize_module: summarizer or FakeChatModel(reply={"summary": ""}),
+    }
+    for module, model in models.items():
+        monkeypatch.setattr(module, "load_model", lambda *_, model=model, **__: model)
+    monkeypatch.setattr(
+        workflow_module,
+        "CalendarManager",
+        lambda: calendar_manager or CalendarManager(calendars={}, client=object()),
+    )
+    monkeypatch.setattr(workflow_module, "VectorManager", lambda: vector_manager)
+
+    workflow = Workflow()
+    workflow.compiled_graph = workflow.graph.compile(checkpointer=MemorySaver())
+    return workflow
@@ -0,0 +1,143 @@
+import logging
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.calendar_manager import CalendarManager
+from src.calendar_manager.model import DeleteEvent, UpdateEvent
+from src.calendar_manager.model.create_google_event import (
+    CreateGoogleCalendarEvent,
+    GoogleCalendarEventDateTime,
+)
+from src.calendar_manager.model.update_google_event import UpdateGoogleCalendarEvent
+from src.calendar_manager.service.google import execute_google_batch
+from src.config import env
+from tests.fake_google_calendar import FakeGoogleCalendar
+
+logger = logging.getLogger(__name__)
+
+TOMORROW = datetime.now(UTC).replace(
+    hour=9, minute=0, second=0, microsecond=0
+) + timedelta(days=1)
+
+
+def event_time(value: datetime) -> dict[str, str]:
+    return {"dateTime": value.isoformat(), "timeZone": "UTC"}
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGoogleCalendar()
+    for day in range(5):
+        start = TOMORROW + timedelta(days=day)
+        fake.put(
+            {
+                "id": f"standup{day}",
+                "summary": "Standup",
+                "start": event_time(start),
+                "end": event_time(start + timedelta(minutes=15)),
+            }
+        )
+    fake.round_trips = 0
+    return fake
+
+
+@pytest.fixture
+def calendar_manager(fake):
+    return CalendarManager(calendars={}, client=fake.client())
+
+
+def reschedule(event_id: str, start: datetime) -> UpdateEvent:
+    return UpdateEvent(
+        id=event_id,
+        data=UpdateGoogleCalendarEvent(
+            start=GoogleCalendarEventDateTime(dateTime=start),
+            end=GoogleCalendarEventDateTime(dateTime=start + timedelta(minutes=15)),
+        ),
+    )
+
+
+def test_updates_are_patched_in_a_single_batch(calendar_manager, fake):
+    updates = [
+        reschedule(f"standup{day}", TOMORROW + timedelta(days=day, hours=1))
+        for day in range(5)
+    ]
+
+    results = calendar_manager.update_events(updates)
+
+    assert fake.round_trips == 1
+    assert [method for method, _ in fake.requests] == ["PATCH"] * 5
+    assert [r.event_id for r in results] == [f"standup{day}" for day in range(5)]
+    assert all(r.ok for r in results)
+    assert (
+        results[0]
+        .event["start"]["dateTime"]
+        .startswith((TOMORROW + timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%S"))
+    )
+    # Fields that were not sent are kept
+    assert fake.events["standup3"]["summary"] == "Standup"
+
+
+def test_each_item_gets_its_own_result(calendar_manager, fake):
+    results = calendar_manager.delete_events(
+        [
+            DeleteEvent(id="standup0@google.com"),
+            DeleteEvent(id="missing"),
+            DeleteEvent(id="standup1"),
+        ]
+    )
+
+    assert fake.round_trips == 1
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[0].event_id == "standup0"
+    assert "404" in results[1].error
+    assert fake.events["standup0"]["status"] == "cancelled"
+    assert fake.events["standup1"]["status"] == "cancelled"
+
+
+def test_batches_are_split_by_size(calendar_manager, fake, monkeypatch):
+    monkeypatch.setattr(env, "CALENDAR_BATCH_SIZE", 2)
+    events_data = [
+        CreateGoogleCalendarEvent(
+            summary=f"Focus {i}",
+            start=GoogleCalendarEventDateTime(dateTime=TOMORROW + timedelta(hours=i)),
+            end=GoogleCalendarEventDateTime(
+                dateTime=TOMORROW + timedelta(hours=i, minutes=30)
+            ),
+        )
+        for i in range(5)
+    ]
+
+    results = calendar_manager.create_events(events_data)
+
+    assert fake.round_trips == 3
+    assert [r.event["summary"] for r in results] == [f"Focus {i}" for i in range(5)]
+    assert all(r.event_id in fake.events for r in results)
+
+
+class SilentBatch:
+    # Answers only the first request added, like a truncated batch response
+    def __init__(self, callback) -> None:
+        self.callback = callback
+        self.request_ids: list[str] = []
+
+    def add(self, request, request_id: str) -> None:
+        self.request_ids.append(request_id)
+
+    def execute(self) -> None:
+        self.callback(self.request_ids[0], {"id": "standup0"}, None)
+
+
+class SilentClient:
+    def new_batch_http_request(self, callback) -> SilentBatch:
+        return SilentBatch(callback)
+
+
+def test_unanswered_items_are_reported_as_failed():
+    results = execute_google_batch(
+        SilentClient(), "delete", [("standup0", object()), ("standup1", object())]
+    )
+
+    assert [r.event_id for r in results] == ["standup0", "standup1"]
+    assert [r.ok for r in results] == [True, False]
+    assert results[1].error == "No response in batch"
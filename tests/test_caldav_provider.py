@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+
+from src.calendar_manager import CalendarManager
+from src.calendar_manager.model.retrieve_events import RetrieveEvents
+from tests.fake_caldav_server import FakeCalDAVServer
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_URL = "caldav+https://dav.example.com/calendars/ana/work/"
+TODAY = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def ics_time(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def vevent(uid: str, summary: str, start: datetime, rrule: str | None = None) -> str:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{ics_time(TODAY)}",
+        f"DTSTART:{ics_time(start)}",
+        f"DTEND:{ics_time(start + timedelta(hours=1))}",
+        f"SUMMARY:{summary}",
+    ]
+    if rrule:
+        lines.append(f"RRULE:{rrule}")
+    return "\r\n".join([*lines, "END:VEVENT"])
+
+
+@pytest.fixture
+def server():
+    server = FakeCalDAVServer()
+    server.put(
+        "/work/dentist.ics",
+        vevent("dentist", "Dentist", TODAY + timedelta(1, hours=14)),
+    )
+    server.put("/work/trip.ics", vevent("trip", "Trip", TODAY + timedelta(days=90)))
+    server.put(
+        "/work/standup.ics",
+        vevent(
+            "standup", "Standup", TODAY - timedelta(days=30, hours=-9), "FREQ=DAILY"
+        ),
+    )
+    return server
+
+
+@pytest.fixture
+def calendar_manager(server):
+    return CalendarManager(
+        calendars={"work": CALENDAR_URL},
+        client=object(),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(server)),
+    )
+
+
+def test_only_the_window_crosses_the_wire(calendar_manager, server):
+    payload = RetrieveEvents(start_time=TODAY, end_time=TODAY + timedelta(days=3))
+
+    result = asyncio.run(calendar_manager.aretrieve_events(payload))
+
+    assert result.errors == {}
+    assert sorted(server.returned) == ["/work/dentist.ics", "/work/standup.ics"]
+    assert sorted(e.summary for e in result.events["work"]) == [
+        "Dentist",
+        *["Standup"] * 3,
+    ]
+
+    request = server.requests[0]
+    assert request.method == "REPORT"
+    assert request.url == "https://dav.example.com/calendars/ana/work/"
+    assert request.headers["Depth"] == "1"
+    assert f'start="{ics_time(TODAY)}"' in request.content.decode()
+
+
+def test_server_errors_are_reported(calendar_manager, server):
+    payload = RetrieveEvents(start_time=TODAY, end_time=TODAY + timedelta(days=3))
+    server.resources.clear()
+
+    def unavailable(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503)
+
+    calendar_manager.http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(unavailable)
+    )
+
+    result = asyncio.run(calendar_manager.aretrieve_events(payload))
+
+    assert result.events == {}
+    assert "503" in result.errors["work"]
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+
+from src.calendar_manager import CalendarManager
+from src.calendar_manager.model.retrieve_events import RetrieveEvents
+from src.calendar_manager.service.event_store import EventStore
+from src.config import env
+
+logger = logging.getLogger(__name__)
+
+TODAY = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def ics_time(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+ICS_FEED = f"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//Lis//Tests//EN
+BEGIN:VEVENT
+UID:standup@lis
+DTSTAMP:{ics_time(TODAY)}
+DTSTART:{ics_time(TODAY - timedelta(days=3, hours=-9))}
+DTEND:{ics_time(TODAY - timedelta(days=3, hours=-10))}
+RRULE:FREQ=DAILY
+SUMMARY:Standup
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+class FeedServer:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.available = True
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if not self.available:
+            return httpx.Response(503)
+        return httpx.Response(200, text=ICS_FEED)
+
+
+@pytest.fixture
+def server():
+    return FeedServer()
+
+
+@pytest.fixture
+def calendar_manager(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(env, "CALENDAR_CACHE_TTL", 0)
+    return CalendarManager(
+        calendars={"work": "https://calendar.example.com/basic.ics"},
+        client=object(),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(server)),
+        event_store=EventStore(tmp_path / "mirror.db"),
+    )
+
+
+@pytest.fixture
+def payload():
+    return RetrieveEvents(start_time=TODAY, end_time=TODAY + timedelta(days=7))
+
+
+def test_searches_are_served_from_the_mirror(calendar_manager, server, payload):
+    async def run():
+        assert await calendar_manager.sync_mirror() == {}
+        server.available = False
+        return await calendar_manager.aretrieve_events(payload)
+
+    result = asyncio.run(run())
+
+    assert server.requests == 1
+    assert result.errors == {}
+    assert len(result.events["work"]) == 7
+    assert all(e.summary == "Standup" for e in result.events["work"])
+
+
+def test_stale_mirror_falls_back_to_live_fetch(
+    calendar_manager, server, payload, monkeypatch
+):
+    monkeypatch.setattr(env, "CALENDAR_MIRROR_MAX_STALENESS", 0)
+
+    async def run():
+        await calendar_manager.sync_mirror()
+        return await calendar_manager.aretrieve_events(payload)
+
+    result = asyncio.run(run())
+
+    assert server.requests == 2
+    assert len(result.events["work"]) == 7
+
+
+def test_windows_outside_the_mirror_are_fetched_live(calendar_manager, server):
+    far_away = TODAY + timedelta(days=env.CALENDAR_INDEX_FUTURE_DAYS + 30)
+    payload = RetrieveEvents(start_time=far_away, end_time=far_away + timedelta(1))
+
+    async def run():
+        await calendar_manager.sync_mirror()
+        return await calendar_manager.aretrieve_events(payload)
+
+    result = asyncio.run(run())
+
+    assert server.requests == 2
+    assert len(result.events["work"]) == 1
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+import rsa
+from google.auth import crypt
+
+from src.calendar_manager import CalendarManager
+from src.calendar_manager.model import DeleteEvent
+from src.calendar_manager.model.create_google_event import (
+    CreateGoogleCalendarEvent,
+    GoogleCalendarEventDateTime,
+)
+from src.calendar_manager.service.google_async import (
+    GOOGLE_CALENDAR_SCOPES,
+    AsyncGoogleCalendarClient,
+    GoogleServiceAccountToken,
+)
+from src.calendar_outbox import CalendarOutbox
+from src.calendar_outbox.model import CalendarOutboxEntry
+from src.generate_response.model.action_payloads import ActionPayloads
+from tests.fake_google_calendar import TOKEN_URI, FakeGoogleCalendar
+
+logger = logging.getLogger(__name__)
+
+TOMORROW = datetime.now(UTC).replace(
+    hour=9, minute=0, second=0, microsecond=0
+) + timedelta(days=1)
+PUBLIC_KEY, PRIVATE_KEY = rsa.newkeys(1024)
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGoogleCalendar(public_key=PUBLIC_KEY.save_pkcs1())
+    fake.put(
+        {
+            "id": "standup",
+            "summary": "Standup",
+            "start": {"dateTime": TOMORROW.isoformat(), "timeZone": "UTC"},
+            "end": {
+                "dateTime": (TOMORROW + timedelta(minutes=15)).isoformat(),
+                "timeZone": "UTC",
+            },
+        }
+    )
+    return fake
+
+
+def make_outbox(tmp_path, fake: FakeGoogleCalendar) -> CalendarOutbox:
+    token = GoogleServiceAccountToken(
+        crypt.RSASigner.from_string(PRIVATE_KEY.save_pkcs1()),
+        "lis@project.iam.gserviceaccount.com",
+        TOKEN_URI,
+        GOOGLE_CALENDAR_SCOPES,
+    )
+    client = AsyncGoogleCalendarClient(
+        token, httpx.AsyncClient(transport=fake.transport())
+    )
+    calendar_manager = CalendarManager(
+        calendars={}, client=object(), async_client=client
+    )
+    # No backoff so that retries are due at once
+    return CalendarOutbox(
+        tmp_path / "outbox.db", calendar_manager, max_attempts=3, retry_delay=0
+    )
+
+
+def dentist() -> CreateGoogleCalendarEvent:
+    start = TOMORROW + timedelta(hours=5)
+    return CreateGoogleCalendarEvent(
+        summary="Dentist",
+        start=GoogleCalendarEventDateTime(dateTime=start),
+        end=GoogleCalendarEventDateTime(dateTime=start + timedelta(hours=1)),
+    )
+
+
+def test_the_same_modifications_are_queued_once(tmp_path, fake):
+    outbox = make_outbox(tmp_path, fake)
+    payloads = ActionPayloads(create_events=[dentist()])
+
+    first = outbox.enqueue("thread", payloads, key="turn-1")
+    second = outbox.enqueue("thread", payloads, key="turn-1")
+
+    assert first.key == second.key == "turn-1"
+    assert [entry.key for entry in outbox.entries("thread")] == ["turn-1"]
+    assert outbox.entries("other") == []
+
+
+def test_lost_responses_are_retried_without_duplicates(tmp_path, fake):
+    outbox = make_outbox(tmp_path, fake)
+    reports: list[CalendarOutboxEntry] = []
+
+    async def on_finished(entry: CalendarOutboxEntry) -> bool:
+        reports.append(entry)
+        return True
+
+    outbox.on_finished = on_finished
+    outbox.enqueue(
+        "thread",
+        ActionPayloads(
+            create_events=[dentist()], delete_events=[DeleteEvent(id="standup")]
+        ),
+        key="turn-1",
+    )
+    # Both calls take effect but their responses never arrive
+    fake.fail_next(2, after_apply=True)
+
+    async def run():
+        applied = [await outbox.process_due(), await outbox.process_due()]
+        await outbox.calendar_manager.aclose()
+        return applied
+
+    applied = asyncio.run(run())
+
+    (entry,) = outbox.entries("thread")
+    assert applied == [1, 1]
+    assert entry.status == "done" and entry.attempts == 2
+    assert all(result.ok for result in entry.results)
+    assert [e["summary"] for e in fake.events.values() if e["id"] != "standup"] == [
+        "Dentist"
+    ]
+    assert fake.events["standup"]["status"] == "cancelled"
+    # Reported once, when it finished
+    assert [report.status for report in reports] == ["done"]
+    assert entry.reported
+
+
+def test_permanent_failures_are_not_retried(tmp_path, fake):
+    outbox = make_outbox(tmp_path, fake)
+    outbox.enqueue(
+        "thread", ActionPayloads(delete_events=[DeleteEvent(id="missing")]), key="k"
+    )
+
+    async def run():
+        applied = [await outbox.process_due(), await outbox.process_due()]
+        await outbox.calendar_manager.aclose()
+        return applied
+
+    applied = asyncio.run(run())
+
+    (entry,) = outbox.entries("thread")
+    assert applied == [1, 0]
+    assert entry.status == "failed" and entry.attempts == 1
+    assert entry.results[0].status_code == 404
+    # Without a reporter the outcome stays unreported
+    assert not entry.reported
+
+
+def test_transient_failures_give_up_after_max_attempts(tmp_path, fake):
+    outbox = make_outbox(tmp_path, fake)
+    outbox.enqueue("thread", ActionPayloads(create_events=[dentist()]), key="k")
+    fake.fail_next(10)
+
+    async def run():
+        for _ in range(4):
+            await outbox.process_due()
+        await outbox.calendar_manager.aclose()
+
+    asyncio.run(run())
+
+    (entry,) = outbox.entries("thread")
+    assert entry.status == "failed" and entry.attempts == 3
+    assert entry.results[0].status_code == 503
+    assert list(fake.events) == ["standup"]
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import random
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from src.calendar_manager import CalendarManager
+from src.calendar_manager.model import DeleteEvent, UpdateEvent
+from src.calendar_manager.model.create_google_event import (
+    CreateGoogleCalendarEvent,
+    GoogleCalendarEventDateTime,
+)
+from src.calendar_manager.model.retrieve_events import RetrieveEvents
+from src.calendar_manager.model.update_google_event import UpdateGoogleCalendarEvent
+from src.calendar_manager.service.preflight import (
+    feed_event_ids,
+    find_overlaps,
+    is_known_event,
+    preflight_mutations,
+)
+from src.config import env
+from tests.fake_google_calendar import FakeGoogleCalendar
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_ID = "team@group.calendar.google.com"
+TODAY = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+WEEK = RetrieveEvents(start_time=TODAY, end_time=TODAY + timedelta(days=7))
+
+
+def event_time(value: datetime) -> dict[str, str]:
+    return {"dateTime": value.isoformat(), "timeZone": "UTC"}
+
+
+def new_event(
+    summary: str, start: datetime, hours: float = 1
+) -> CreateGoogleCalendarEvent:
+    return CreateGoogleCalendarEvent(
+        summary=summary,
+        start=GoogleCalendarEventDateTime(dateTime=start),
+        end=GoogleCalendarEventDateTime(dateTime=start + timedelta(hours=hours)),
+    )
+
+
+@pytest.fixture(autouse=True)
+def write_target(monkeypatch):
+    monkeypatch.setattr(env, "CALENDAR_ID", CALENDAR_ID)
+    monkeypatch.setattr(env, "CALENDAR_PARSE_WORKERS", 0)
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGoogleCalendar()
+    lunch = TODAY + timedelta(days=1, hours=12)
+    standup = TODAY + timedelta(days=1, hours=9)
+    fake.put(
+        {
+            "id": "lunch",
+            "summary": "Lunch",
+            "start": event_time(lunch),
+            "end": event_time(lunch + timedelta(hours=1)),
+        }
+    )
+    fake.put(
+        {
+            "id": "standup",
+            "summary": "Standup",
+            "start": event_time(standup),
+            "end": event_time(standup + timedelta(minutes=15)),
+            "recurrence": ["RRULE:FREQ=DAILY"],
+        }
+    )
+    return fake
+
+
+@pytest.fixture
+def calendar_manager(fake):
+    calendar_manager = CalendarManager(
+        calendars={"team": f"google://{CALENDAR_ID}"}, client=fake.client()
+    )
+
+    async def read():
+        await calendar_manager.aretrieve_events(WEEK)
+        await calendar_manager.aclose()
+
+    asyncio.run(read())
+    return calendar_manager
+
+
+def test_modifications_are_checked_without_the_provider(calendar_manager, fake):
+    requests = len(fake.requests)
+    second_standup = (TODAY + timedelta(days=2, hours=9)).strftime("%Y%m%dT%H%M%SZ")
+
+    problems = calendar_manager.preflight(
+        [
+            new_event("Call", TODAY + timedelta(days=1, hours=12, minutes=30)),
+            new_event("Dentist", TODAY + timedelta(days=2, hours=15)),
+        ],
+        [
+            UpdateEvent(
+                id="missing", data=UpdateGoogleCalendarEvent(summary="Renamed")
+            ),
+            UpdateEvent(
+                id="lunch",
+                data=UpdateGoogleCalendarEvent(
+                    start=GoogleCalendarEventDateTime(
+                        dateTime=TODAY + timedelta(days=1, hours=13)
+                    ),
+                    end=GoogleCalendarEventDateTime(
+                        dateTime=TODAY + timedelta(days=1, hours=14)
+                    ),
+                ),
+            ),
+        ],
+        [DeleteEvent(id=f"standup_{second_standup}")],
+    )
+
+    assert len(fake.requests) == requests
+    assert [(p.action, p.index, p.kind) for p in problems] == [
+        ("update", 0, "unknown_event"),
+        ("create", 0, "overlap"),
+        ("update", 1, "overlap"),
+    ]
+    # The call overlaps the moved lunch, not its old time
+    assert [c.split(" (")[0] for c in problems[1].conflicts] == ["lunch"]
+    assert [c.split(" (")[0] for c in problems[2].conflicts] == ["Call"]
+
+
+def test_modifications_written_through_lis_are_known(calendar_manager, fake):
+    calendar_manager.create_events([new_event("Dentist", TODAY + timedelta(days=3))])
+    created = next(
+        event_id
+        for event_id, event in fake.events.items()
+        if event["summary"] == "Dentist"
+    )
+    calendar_manager.delete_events([DeleteEvent(id="lunch")])
+
+    problems = calendar_manager.preflight(
+        [],
+        [],
+        [DeleteEvent(id=created), DeleteEvent(id="lunch")],
+    )
+
+    assert [(p.event_id, p.kind) for p in problems] == [("lunch", "unknown_event")]
+
+
+def test_planned_events_overlapping_each_other_are_reported():
+    start = TODAY + timedelta(hours=10)
+
+    problems = preflight_mutations(
+        [new_event("Review", start, 2), new_event("Retro", start + timedelta(hours=1))],
+        [],
+        [],
+        None,
+        [],
+    )
+
+    assert [(p.index, p.conflicts[0].split(" (")[0]) for p in problems] == [
+        (0, "Retro"),
+        (1, "Review"),
+    ]
+
+
+def test_overlaps_match_pairwise_comparison():
+    rng = random.Random(7)
+
+    def intervals(count: int) -> np.ndarray:
+        starts = [rng.uniform(0, 1000) for _ in range(count)]
+        return np.array([(s, s + rng.uniform(0, 50)) for s in starts])
+
+    planned, busy = intervals(20), intervals(300)
+
+    overlaps = find_overlaps(planned, busy)
+
+    for i, (start, end) in enumerate(planned):
+        for j, (busy_start, busy_end) in enumerate(busy):
+            assert overlaps[i, j] == (busy_start < end and busy_end > start)
+
+
+def test_folded_uids_are_read_whole():
+    series_id = "a" * 60
+    content = (
+        b"BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\n"
+        # Folded at 75 octets, as RFC 5545 requires
+        + f"UID:{series_id}_20250101T1\r\n 00000Z@google.com\r\n".encode()
+        + b"END:VEVENT\r\nEND:VCALENDAR\r\n"
+    )
+
+    known_ids = feed_event_ids(content)
+
+    assert f"{series_id}_20250101T100000Z" in known_ids
+    assert is_known_event(f"{series_id}_20250101T100000Z", known_ids)
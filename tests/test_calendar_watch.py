@@ -0,0 +1,186 @@
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+import rsa
+from fastapi import FastAPI, HTTPException, Request
+from google.auth import crypt
+
+from src.calendar_manager import CalendarManager
+from src.calendar_manager.model.retrieve_events import RetrieveEvents
+from src.calendar_manager.service.google_async import (
+    GOOGLE_CALENDAR_SCOPES,
+    AsyncGoogleCalendarClient,
+    GoogleServiceAccountToken,
+)
+from src.calendar_manager.service.google_watch import GoogleCalendarWatch
+from src.config import env
+from tests.fake_google_calendar import TOKEN_URI, FakeGoogleCalendar
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_ID = "team@group.calendar.google.com"
+ADDRESS = "https://lis.example.com/calendars/notifications"
+TODAY = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+WEEK = RetrieveEvents(start_time=TODAY, end_time=TODAY + timedelta(days=7))
+PUBLIC_KEY, PRIVATE_KEY = rsa.newkeys(1024)
+
+HOLIDAYS = """BEGIN:VCALENDAR
+VERSION:2.0
+END:VCALENDAR
+"""
+
+
+def event_time(value: datetime) -> dict[str, str]:
+    return {"dateTime": value.isoformat(), "timeZone": "UTC"}
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    # Unwatched calendars are asked again on every read
+    monkeypatch.setattr(env, "CALENDAR_CACHE_TTL", 0)
+    monkeypatch.setattr(env, "CALENDAR_PARSE_WORKERS", 0)
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGoogleCalendar(public_key=PUBLIC_KEY.save_pkcs1())
+    start = TODAY + timedelta(days=1, hours=12)
+    fake.put(
+        {
+            "id": "lunch",
+            "summary": "Lunch",
+            "start": event_time(start),
+            "end": event_time(start + timedelta(hours=1)),
+        }
+    )
+    return fake
+
+
+@pytest.fixture
+def feed_requests():
+    return []
+
+
+@pytest.fixture
+def calendar_manager(fake, feed_requests):
+    def serve(request: httpx.Request) -> httpx.Response:
+        feed_requests.append(request)
+        return httpx.Response(200, text=HOLIDAYS)
+
+    token = GoogleServiceAccountToken(
+        crypt.RSASigner.from_string(PRIVATE_KEY.save_pkcs1()),
+        "lis@project.iam.gserviceaccount.com",
+        TOKEN_URI,
+        GOOGLE_CALENDAR_SCOPES,
+    )
+    async_client = AsyncGoogleCalendarClient(
+        token, httpx.AsyncClient(transport=fake.transport())
+    )
+    calendar_manager = CalendarManager(
+        calendars={
+            "team": f"google://{CALENDAR_ID}",
+            "holidays": "https://example.com/holidays.ics",
+        },
+        client=fake.client(),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(serve)),
+        async_client=async_client,
+    )
+    calendar_manager.calendar_watch = GoogleCalendarWatch(async_client, ADDRESS)
+    return calendar_manager
+
+
+def notification_receiver(calendar_manager: CalendarManager) -> httpx.AsyncClient:
+    """
+    Client reaching the notification endpoint of an app serving `calendar_manager`.
+    """
+    app = FastAPI()
+
+    @app.post("/calendars/notifications")
+    async def receive(request: Request):
+        if not await calendar_manager.handle_notification(request.headers):
+            raise HTTPException(status_code=404)
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+
+
+def list_requests(fake: FakeGoogleCalendar) -> int:
+    return sum(1 for method, path in fake.requests if path.endswith("/events"))
+
+
+def test_notifications_refresh_only_the_changed_calendar(
+    calendar_manager, fake, feed_requests
+):
+    receiver = notification_receiver(calendar_manager)
+
+    async def run():
+        await calendar_manager.watch_calendars()
+        # Google confirms every new channel with a sync notification
+        confirmed = await fake.notify(receiver, CALENDAR_ID, "sync")
+        assert not calendar_manager._refreshes
+
+        await calendar_manager.aretrieve_events(WEEK)
+        listed, downloaded = list_requests(fake), len(feed_requests)
+
+        fake.put({**fake.events["lunch"], "summary": "Team lunch"})
+        notified = await fake.notify(receiver, CALENDAR_ID)
+        await asyncio.gather(*calendar_manager._refreshes.values())
+        refreshed = list_requests(fake) - listed, len(feed_requests) - downloaded
+
+        result = await calendar_manager.aretrieve_events(WEEK)
+        await calendar_manager.aclose()
+        return confirmed, notified, refreshed, result, listed
+
+    confirmed, notified, refreshed, result, listed = asyncio.run(run())
+
+    assert confirmed == notified == [200]
+    # One incremental sync of the notified calendar, the feed was left alone
+    assert refreshed == (1, 0)
+    assert [event.summary for event in result.events["team"]] == ["Team lunch"]
+    # The watched calendar was not polled by the last read, the other one was
+    assert list_requests(fake) == listed + 1
+    assert len(feed_requests) == 2
+    # Channels are stopped on shutdown
+    assert fake.channels == {}
+
+
+def test_unknown_or_forged_notifications_are_rejected(calendar_manager, fake):
+    receiver = notification_receiver(calendar_manager)
+
+    async def run():
+        await calendar_manager.watch_calendars()
+        (channel,) = fake.channels.values()
+        channel["token"] = "forged"
+        forged = await fake.notify(receiver, CALENDAR_ID)
+        fake.channels["unknown"] = {**channel, "id": "unknown"}
+        unknown = await fake.notify(receiver, CALENDAR_ID)
+        refreshes = len(calendar_manager._refreshes)
+        await calendar_manager.aclose()
+        return forged, unknown, refreshes
+
+    forged, unknown, refreshes = asyncio.run(run())
+
+    assert forged == [404]
+    assert unknown == [404, 404]
+    assert refreshes == 0
+
+
+def test_channels_are_renewed_before_they_expire(calendar_manager, fake):
+    # Google grants less than the renewal margin
+    fake.max_channel_ttl = 60
+
+    async def run():
+        await calendar_manager.watch_calendars()
+        first = set(fake.channels)
+        await calendar_manager.watch_calendars()
+        second = set(fake.channels)
+        await calendar_manager.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert len(first) == len(second) == 1
+    assert first != second
+    assert set(calendar_manager.calendar_watch.channels) == set()
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.agent.model.graph_state import GraphState
+from src.agent.model.steps import Steps
+from src.config import env
+from tests.fake_chat_model import FakeChatModel
+from tests.fake_workflow import REPLY, build_workflow
+
+logger = logging.getLogger(__name__)
+
+TOMORROW = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0) + (
+    timedelta(days=1)
+)
+
+
+def decide_or_answer(prompt: str) -> dict:
+    if "thanks" in prompt.lower() or "All events scheduled between" in prompt:
+        return {"answer": REPLY}
+    return {
+        "tool_request": {
+            "tool": "search_calendars",
+            "search_calendars": {
+                "start_time": TOMORROW.isoformat(),
+                "end_time": (TOMORROW + timedelta(days=1)).isoformat(),
+            },
+            "reason": "The user asks for their meetings",
+        }
+    }
+
+
+@pytest.fixture
+def models(monkeypatch):
+    monkeypatch.setattr(env, "COMBINED_RESPONSE_ENABLED", True)
+    # Thanks would be answered without the tool evaluator
+    monkeypatch.setattr(env, "INTENT_ROUTER_ENABLED", False)
+    return FakeChatModel(reply=decide_or_answer), FakeChatModel(reply=REPLY)
+
+
+def run_turn(workflow, text: str) -> dict:
+    async def run():
+        config: RunnableConfig = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        state = GraphState(input=[HumanMessage(content=text)], top_k=5)
+        return await workflow.compiled_graph.ainvoke(state.model_dump(), config)
+
+    return asyncio.run(run())
+
+
+def test_turns_without_tools_are_answered_in_a_single_call(monkeypatch, models):
+    tool_evaluator, response_generator = models
+    workflow = build_workflow(monkeypatch, tool_evaluator, response_generator)
+
+    result = run_turn(workflow, "Thanks!")
+
+    assert len(tool_evaluator.calls) == 1
+    assert response_generator.calls == []
+    assert result["response"].content[0]["response"] == "Hello!"
+    assert result["step_history"][-2:] == [Steps.evaluate_tools, Steps.summarize]
+
+
+def test_tool_results_are_answered_by_the_next_decision(monkeypatch, models):
+    tool_evaluator, response_generator = models
+    workflow = build_workflow(monkeypatch, tool_evaluator, response_generator)
+
+    result = run_turn(workflow, "What's on tomorrow?")
+
+    assert len(tool_evaluator.calls) == 2
+    assert response_generator.calls == []
+    assert Steps.search_calendars in result["step_history"]
+    assert Steps.generate_response not in result["step_history"]
+    assert result["response"].content[0]["response"] == "Hello!"
@@ -0,0 +1,176 @@
+import logging
+from datetime import UTC, date, datetime, timedelta
+
+import icalendar
+import recurring_ical_events
+import tiktoken
+
+from src.calendar_manager.model.calendar_search_result import CalendarSearchResult
+from src.calendar_manager.model.compact_event import CompactEvent
+from src.calendar_manager.service.compact_events import (
+    compact_event,
+    describe_recurrence,
+    format_events,
+    page_events,
+)
+from src.common import count_tokens
+
+logger = logging.getLogger(__name__)
+
+MONDAY = datetime(2030, 1, 7, tzinfo=UTC)
+
+ICS_FEED = """BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//Lis//Tests//EN
+BEGIN:VEVENT
+UID:standup@lis
+DTSTAMP:20300101T000000Z
+DTSTART:20300107T090000Z
+DTEND:20300107T091500Z
+RRULE:FREQ=DAILY;COUNT=3
+SUMMARY:Standup
+DESCRIPTION:A very long description that the LLM does not need to read.
+ATTENDEE;CN=Ana:mailto:ana@example.com
+END:VEVENT
+BEGIN:VEVENT
+UID:dentist@lis
+DTSTAMP:20300101T000000Z
+DTSTART:20300108T140000Z
+DTEND:20300108T150000Z
+SUMMARY:Dentist | checkup
+LOCATION:Main street\\, 42
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def event(uid: str, start: datetime | date) -> CompactEvent:
+    return CompactEvent(uid=uid, summary=uid.title(), start=start, end=start)
+
+
+def test_components_are_projected():
+    calendar = icalendar.Calendar.from_ical(ICS_FEED)
+    occurrences = recurring_ical_events.of(
+        calendar, keep_recurrence_attributes=True
+    ).between(MONDAY, MONDAY + timedelta(days=7))
+
+    compact = sorted(
+        (compact_event(occurrence) for occurrence in occurrences),
+        key=lambda e: e.start,
+    )
+
+    assert [(e.uid, e.recurring) for e in compact] == [
+        ("standup@lis", True),
+        ("standup@lis", True),
+        ("dentist@lis", False),
+        ("standup@lis", True),
+    ]
+    assert compact[2].location == "Main street, 42"
+    assert compact[2].end == MONDAY + timedelta(days=1, hours=15)
+
+
+def test_calendars_are_merged_into_one_table():
+    table = format_events(
+        {
+            "work": [event("review", MONDAY + timedelta(hours=15))],
+            "home": [
+                event("holiday", MONDAY.date()),
+                event("gym", MONDAY + timedelta(hours=7)),
+            ],
+        }
+    )
+
+    assert table.splitlines() == [
+        "calendar|uid|summary|start|end|location|recurring",
+        "home|holiday|Holiday|2030-01-07|2030-01-07||",
+        "home|gym|Gym|2030-01-07T07:00+00:00|2030-01-07T07:00+00:00||",
+        "work|review|Review|2030-01-07T15:00+00:00|2030-01-07T15:00+00:00||",
+    ]
+    assert format_events({"work": []}) == "No events."
+
+
+def test_output_is_truncated_to_the_budget():
+    events = {
+        "work": [event(f"meeting{i}", MONDAY + timedelta(hours=i)) for i in range(100)]
+    }
+
+    table = format_events(events, token_budget=200)
+    lines = table.splitlines()
+
+    assert count_tokens(table) <= 200
+    assert lines[1].startswith("work|meeting0|")
+    assert lines[-1].startswith(f"({100 - (len(lines) - 2)} more events omitted")
+    assert format_events(events, token_budget=100_000).count("\n") == 100
+
+
+def test_tokens_are_counted_without_loading_the_tokenizer(monkeypatch):
+    loaded = []
+    monkeypatch.setattr(tiktoken, "get_encoding", loaded.append)
+
+    rows = [
+        CompactEvent(uid="standup", summary="Standup", start=MONDAY, end=MONDAY)
+    ] * 50
+    format_events({"work": rows}, token_budget=100)
+
+    # Loading may download the tokenizer, which is only done at startup
+    assert loaded == []
+
+
+def test_series_are_collapsed_over_wide_windows():
+    calendar = icalendar.Calendar.from_ical(ICS_FEED)
+    occurrences = [
+        compact_event(occurrence)
+        for occurrence in recurring_ical_events.of(
+            calendar, keep_recurrence_attributes=True
+        ).between(MONDAY, MONDAY + timedelta(days=7))
+    ]
+    result = CalendarSearchResult(events={"work": occurrences})
+
+    week = page_events(result, 1, 100, timedelta(days=14), timedelta(days=7))
+    year = page_events(result, 1, 100, timedelta(days=14), timedelta(days=365))
+
+    assert len(week.events["work"]) == 4
+    assert [(e.uid, e.repeats) for e in year.events["work"]] == [
+        ("standup@lis", "daily at 09:00, 3 times"),
+        ("dentist@lis", None),
+    ]
+    assert "|daily at 09:00, 3 times" in format_events(year.events)
+
+
+def test_recurrences_are_described():
+    def describe(rrule: str, start: datetime | date = MONDAY) -> str:
+        return describe_recurrence(
+            CompactEvent(
+                uid="series", start=start, end=start, recurring=True, rrule=rrule
+            )
+        )
+
+    assert describe("FREQ=WEEKLY;BYDAY=MO,WE", MONDAY + timedelta(hours=9)) == (
+        "weekly on MO,WE at 09:00"
+    )
+    assert describe("FREQ=DAILY;INTERVAL=2;UNTIL=20301231T000000Z") == (
+        "every 2 days at 00:00 until 2030-12-31"
+    )
+    assert describe("FREQ=YEARLY", MONDAY.date()) == "yearly"
+
+
+def test_events_are_paginated_across_calendars():
+    result = CalendarSearchResult(
+        events={
+            "work": [
+                event(f"meeting{i}", MONDAY + timedelta(hours=2 * i)) for i in range(5)
+            ],
+            "home": [
+                event(f"chore{i}", MONDAY + timedelta(hours=2 * i + 1))
+                for i in range(5)
+            ],
+        }
+    )
+
+    pages = [page_events(result, page, 4) for page in (1, 2, 3)]
+
+    assert [page.pages for page in pages] == [3, 3, 3]
+    assert [e.uid for e in pages[0].events["work"]] == ["meeting0", "meeting1"]
+    assert [e.uid for e in pages[0].events["home"]] == ["chore0", "chore1"]
+    assert [e.uid for e in pages[2].events["home"]] == ["chore4"]
+    assert sum(len(events) for page in pages for events in page.events.values()) == 10
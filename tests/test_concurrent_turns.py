@@ -0,0 +1,55 @@
+import asyncio
+import logging
+import time
+import uuid
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.agent.model.graph_state import GraphState
+from src.config import env
+from tests.fake_chat_model import FakeChatModel
+from tests.fake_workflow import REPLY, build_workflow
+
+logger = logging.getLogger(__name__)
+
+LATENCY = 0.3
+TURNS = 5
+
+
+@pytest.fixture
+def workflow(monkeypatch):
+    # Greetings would be answered without the tool evaluator
+    monkeypatch.setattr(env, "INTENT_ROUTER_ENABLED", False)
+    return build_workflow(
+        monkeypatch,
+        FakeChatModel(
+            reply={"tool": "generate_response", "reason": "Greeting"},
+            latency=LATENCY,
+        ),
+        FakeChatModel(reply=REPLY, latency=LATENCY),
+        FakeChatModel(reply={"summary": ""}, latency=LATENCY),
+    )
+
+
+def test_concurrent_turns_do_not_wait_for_each_other(workflow):
+    async def turn() -> dict:
+        config: RunnableConfig = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        state = GraphState(input=[HumanMessage(content="Hi!")], top_k=5)
+        return await workflow.compiled_graph.ainvoke(state.model_dump(), config)
+
+    async def run() -> tuple[float, list[dict]]:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(turn() for _ in range(TURNS)))
+        return time.perf_counter() - started, results
+
+    elapsed, results = asyncio.run(run())
+
+    # Two LLM calls per turn: deciding the next step and answering
+    assert all(
+        result["response"].content[0]["response"] == "Hello!" for result in results
+    )
+    assert elapsed >= 2 * LATENCY
+    # Sequential turns would take TURNS times as long
+    assert elapsed < 2 * LATENCY * 2
@@ -30,7 +30,8 @@ def test_create_event_tomorrow(calendar_manager):
     )
 
     created_events = calendar_manager.create_events([event_data])
-    created_event = created_events[0]  # get the first (and only) event
+    assert created_events[0].error is None
+    created_event = created_events[0].event  # get the first (and only) event
 
     logger.info(f"Event created: {created_event}")
 
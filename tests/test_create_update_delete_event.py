@@ -43,7 +43,8 @@ def test_create_update_delete_event(calendar_manager):
     # --- Create event ---
     logger.info("Creating event...")
     created_events = calendar_manager.create_events([event_data])
-    created_event = created_events[0]
+    assert created_events[0].error is None
+    created_event = created_events[0].event
     event_id = created_event["id"]
     logger.info(f"Event created successfully: {event_id} ({created_event['htmlLink']})")
 
@@ -58,7 +59,8 @@ def test_create_update_delete_event(calendar_manager):
     logger.info(f"Updating event {event_id}...")
     update = UpdateEvent(id=event_id, data=updated_data)
     updated_events = calendar_manager.update_events([update])
-    updated_event = updated_events[0]
+    assert updated_events[0].error is None
+    updated_event = updated_events[0].event
     logger.info(f"Event updated: new summary -> {updated_event['summary']}")
 
     assert updated_event["summary"] == updated_summary
@@ -66,7 +68,8 @@ def test_create_update_delete_event(calendar_manager):
     # --- Delete event ---
     logger.info(f"Deleting event {event_id}...")
     delete = DeleteEvent(id=event_id)
-    calendar_manager.delete_events([delete])
+    deleted_events = calendar_manager.delete_events([delete])
+    assert deleted_events[0].error is None
     logger.info("Event deleted successfully.")
 
     logger.info("=== Test completed successfully ===")
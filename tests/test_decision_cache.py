@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import uuid
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.agent.model.graph_state import GraphState
+from src.agent.model.steps import Steps
+from src.config import env
+from src.error_handler import ERROR_MESSAGE_NAME
+from src.evaluate_tools.model import ToolConfig
+from src.evaluate_tools.service import DecisionCache, decision_key
+from tests.fake_chat_model import FakeChatModel
+from tests.fake_workflow import build_workflow
+
+logger = logging.getLogger(__name__)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FlakyVectorManager:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def aretrieve(self, query, top_k=5, metadata_filter=None):
+        self.calls += 1
+        if self.calls == 1:
+            raise RuntimeError("Vector store unavailable")
+        return [Document(page_content="PTO is 30 days a year.")]
+
+
+def decision(tool: str = "get_current_date") -> ToolConfig:
+    return ToolConfig(tool=tool, reason="Needed")
+
+
+def ask_knowledge_base(prompt: str) -> dict:
+    if "Knowledge base documents" in prompt:
+        return {"tool": "generate_response", "reason": "The policy is known"}
+    return {"tool": "rag", "rag_query": "PTO policy", "reason": "A policy question"}
+
+
+def test_decisions_are_evicted_by_age_and_by_use():
+    clock = Clock()
+    cache = DecisionCache(size=2, ttl=60, clock=clock)
+    cache.put("a", decision())
+    cache.put("b", decision("rag"))
+    # "a" becomes the most recently used, "b" is evicted by "c"
+    assert cache.get("a") is not None
+    cache.put("c", decision())
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    clock.now = 61
+    assert cache.get("a") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_key_ignores_decisions_errors_and_whitespace():
+    conversation = [
+        SystemMessage(content="Today is Sunday."),
+        HumanMessage(content="What is the  PTO policy?"),
+    ]
+    retried = [
+        *conversation,
+        BaseMessage(type="reasoning", content=[decision("rag").model_dump()]),
+        SystemMessage(content="The tool failed.", name=ERROR_MESSAGE_NAME),
+    ]
+
+    assert decision_key(retried) == decision_key(
+        [conversation[0], HumanMessage(content="What is the PTO\npolicy? ")]
+    )
+    assert decision_key(conversation) != decision_key(
+        [*conversation, AIMessage(content="30 days.")]
+    )
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(env, "DECISION_CACHE_ENABLED", True)
+    monkeypatch.setattr(env, "TOOL_EVALUATOR_LLM_TEMPERATURE", 0)
+    monkeypatch.setattr(env, "TOOL_PREFETCH_ENABLED", False)
+
+
+@pytest.mark.parametrize(
+    "enabled, temperature, calls", [(True, 0, 1), (True, 0.7, 2), (False, 0, 2)]
+)
+def test_repeated_decisions_are_reused(monkeypatch, enabled, temperature, calls):
+    monkeypatch.setattr(env, "DECISION_CACHE_ENABLED", enabled)
+    monkeypatch.setattr(env, "TOOL_EVALUATOR_LLM_TEMPERATURE", temperature)
+    tool_evaluator = FakeChatModel(reply=ask_knowledge_base)
+    workflow = build_workflow(monkeypatch, tool_evaluator)
+    messages = [HumanMessage(content="What is the PTO policy?")]
+
+    async def run():
+        return [
+            await workflow.tool_evaluator.adecide_next_step(None, messages)
+            for _ in range(2)
+        ]
+
+    first, second = asyncio.run(run())
+
+    assert first == second
+    assert first is not second
+    assert len(tool_evaluator.calls) == calls
+
+
+def test_failed_tools_are_retried_without_deciding_again(monkeypatch):
+    tool_evaluator = FakeChatModel(reply=ask_knowledge_base)
+    vector_manager = FlakyVectorManager()
+    workflow = build_workflow(
+        monkeypatch, tool_evaluator, vector_manager=vector_manager
+    )
+
+    async def run():
+        config: RunnableConfig = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        state = GraphState(
+            input=[HumanMessage(content="What is the PTO policy?")],
+            top_k=5,
+            max_retries=1,
+        )
+        return await workflow.compiled_graph.ainvoke(state.model_dump(), config)
+
+    result = asyncio.run(run())
+
+    assert result["step_history"].count(Steps.rag) == 2
+    assert vector_manager.calls == 2
+    # The retry replays the first decision, the tool failed on its own
+    assert len(tool_evaluator.calls) == 2
+    assert "Vector store unavailable" in tool_evaluator.calls[-1]
+    assert "Knowledge base documents" in tool_evaluator.calls[-1]
+
+
+@pytest.mark.parametrize("rejected, calls", [(False, 1), (True, 2)])
+def test_rejected_decisions_are_made_again(monkeypatch, rejected, calls):
+    tool_evaluator = FakeChatModel(reply=ask_knowledge_base)
+    workflow = build_workflow(monkeypatch, tool_evaluator)
+    question = HumanMessage(content="What is the PTO policy?")
+
+    async def run():
+        first = await workflow.decide_next_step(
+            GraphState(input=[question], messages=[question], top_k=5)
+        )
+        # Back from the error handler, the decision and the error in the history
+        retried = GraphState(
+            input=[question],
+            messages=[
+                question,
+                *first.messages,
+                SystemMessage(content="The payload failed.", name=ERROR_MESSAGE_NAME),
+            ],
+            step_history=[Steps.evaluate_tools, Steps.rag, Steps.error_handler],
+            decision_rejected=rejected,
+            top_k=5,
+        )
+        return await workflow.decide_next_step(retried)
+
+    result = asyncio.run(run())
+
+    assert result.next_step == Steps.rag
+    assert not result.decision_rejected
+    assert len(tool_evaluator.calls) == calls
@@ -0,0 +1,165 @@
+import logging
+import random
+from datetime import UTC, datetime, timedelta
+
+import icalendar
+import pytest
+import recurring_ical_events
+
+from src.calendar_manager.service import event_index
+from src.calendar_manager.service.event_index import EventIndex
+from src.calendar_manager.service.worker_pool import CalendarWorkerPool
+from src.common import to_timestamp
+
+logger = logging.getLogger(__name__)
+
+TODAY = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def ics_time(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def build_calendar(standup_summary: str = "Standup") -> icalendar.Calendar:
+    start = TODAY - timedelta(days=10)
+    events = [
+        f"""BEGIN:VEVENT
+UID:standup@lis
+DTSTAMP:{ics_time(datetime.now(UTC))}
+DTSTART:{ics_time(start + timedelta(hours=9))}
+DTEND:{ics_time(start + timedelta(hours=9, minutes=15))}
+RRULE:FREQ=DAILY
+SUMMARY:{standup_summary}
+END:VEVENT""",
+        f"""BEGIN:VEVENT
+UID:review@lis
+DTSTAMP:{ics_time(datetime.now(UTC))}
+DTSTART:{ics_time(start + timedelta(hours=15))}
+DTEND:{ics_time(start + timedelta(hours=16))}
+RRULE:FREQ=WEEKLY;COUNT=20
+SUMMARY:Review
+END:VEVENT""",
+        f"""BEGIN:VEVENT
+UID:offsite@lis
+DTSTAMP:{ics_time(datetime.now(UTC))}
+DTSTART;VALUE=DATE:{(TODAY + timedelta(days=3)).strftime("%Y%m%d")}
+DTEND;VALUE=DATE:{(TODAY + timedelta(days=6)).strftime("%Y%m%d")}
+SUMMARY:Offsite
+END:VEVENT""",
+    ]
+    body = "\n".join(events)
+    return icalendar.Calendar.from_ical(
+        f"BEGIN:VCALENDAR\nVERSION:2.0\nPRODID:-//Lis//Tests//EN\n{body}\nEND:VCALENDAR\n"
+    )
+
+
+def occurrence_keys(events) -> list[tuple[str, str]]:
+    return sorted((e.uid, str(e.start)) for e in events)
+
+
+def expected_keys(calendar, start, end) -> list[tuple[str, str]]:
+    expected = recurring_ical_events.of(calendar).between(start, end)
+    return sorted((str(e["UID"]), str(e.start)) for e in expected)
+
+
+@pytest.fixture
+def expanded_uids(monkeypatch):
+    expanded: list[str] = []
+    original = event_index.expand_calendar
+
+    def spy(*args):
+        expansion = original(*args)
+        expanded.extend(expansion.expanded)
+        return expansion
+
+    monkeypatch.setattr(event_index, "expand_calendar", spy)
+    return expanded
+
+
+def test_queries_match_direct_expansion():
+    calendar = build_calendar()
+    index = EventIndex(past_days=30, future_days=90)
+    rng = random.Random(42)
+
+    for _ in range(50):
+        start = TODAY + timedelta(hours=rng.randint(-24 * 20, 24 * 60))
+        end = start + timedelta(hours=rng.randint(1, 24 * 10))
+
+        assert occurrence_keys(index.query(calendar.to_ical(), start, end)) == (
+            expected_keys(calendar, start, end)
+        ), f"Mismatch for window {start} - {end}"
+
+
+def test_windows_outside_the_horizon_are_expanded_directly():
+    calendar = build_calendar()
+    index = EventIndex(past_days=1, future_days=1)
+    start, end = TODAY + timedelta(days=5), TODAY + timedelta(days=12)
+
+    events = index.query(calendar.to_ical(), start, end)
+
+    assert occurrence_keys(events) == expected_keys(calendar, start, end)
+
+
+def test_only_changed_events_are_expanded_again(expanded_uids):
+    index = EventIndex(past_days=30, future_days=90)
+    window = (TODAY, TODAY + timedelta(days=7))
+
+    index.query(build_calendar().to_ical(), *window)
+    assert sorted(expanded_uids) == ["offsite@lis", "review@lis", "standup@lis"]
+
+    # A new download of the same feed only differs in DTSTAMP
+    expanded_uids.clear()
+    index.query(build_calendar().to_ical(), *window)
+    assert expanded_uids == []
+
+    expanded_uids.clear()
+    events = index.query(
+        build_calendar(standup_summary="Daily sync").to_ical(), *window
+    )
+    assert expanded_uids == ["standup@lis"]
+    summaries = {e.summary for e in events}
+    assert "Daily sync" in summaries and "Standup" not in summaries
+
+
+def test_worker_processes_return_the_same_occurrences():
+    calendar = build_calendar()
+    worker_pool = CalendarWorkerPool(workers=1)
+    index = EventIndex(past_days=30, future_days=90, worker_pool=worker_pool)
+    start, end = TODAY, TODAY + timedelta(days=7)
+
+    try:
+        events = index.query(calendar.to_ical(), start, end)
+        # Outside of the horizon, expanded directly by a worker
+        far_away = index.query(
+            calendar.to_ical(), start - timedelta(days=60), end - timedelta(days=60)
+        )
+    finally:
+        worker_pool.shutdown()
+
+    assert occurrence_keys(events) == expected_keys(calendar, start, end)
+    assert occurrence_keys(far_away) == expected_keys(
+        calendar, start - timedelta(days=60), end - timedelta(days=60)
+    )
+    stats = worker_pool.stats()
+    assert (stats.workers, stats.tasks, stats.failed) == (1, 2, 0)
+    assert 0 <= stats.queue_wait_avg <= stats.queue_wait_max
+    assert 0 < stats.run_time_avg <= stats.run_time_max
+
+
+def test_wide_windows_are_capped_per_series_and_per_call():
+    calendar = build_calendar()
+    index = EventIndex(past_days=1, future_days=1)
+    # A whole year, expanded directly
+    start, end = TODAY - timedelta(days=5), TODAY + timedelta(days=360)
+
+    capped = index.query(calendar.to_ical(), start, end, series_limit=5)
+    earliest = index.query(calendar.to_ical(), start, end, limit=4)
+
+    uids = [e.uid for e in capped]
+    assert (uids.count("standup@lis"), uids.count("review@lis")) == (5, 5)
+    assert uids.count("offsite@lis") == 1
+    expected = sorted(
+        to_timestamp(e.start)
+        for e in recurring_ical_events.of(calendar).between(start, end)
+    )
+    assert [to_timestamp(e.start) for e in earliest] == expected[:4]
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+
+import httpx
+import pytest
+
+from src.calendar_manager.service.feed_cache import FeedCache
+
+logger = logging.getLogger(__name__)
+
+FEED_URL = "https://calendar.example.com/basic.ics"
+ETAG = '"v1"'
+ICS_FEED = """BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//Lis//Tests//EN
+BEGIN:VEVENT
+UID:dentist@lis
+DTSTAMP:20250101T000000Z
+DTSTART:20250108T140000Z
+DTEND:20250108T150000Z
+SUMMARY:Dentist
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+class FeedServer:
+    """Serves a single feed and honours If-None-Match."""
+
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        await asyncio.sleep(0.05)
+        if request.headers.get("If-None-Match") == ETAG:
+            return httpx.Response(304)
+        return httpx.Response(200, text=ICS_FEED, headers={"ETag": ETAG})
+
+
+@pytest.fixture
+def server():
+    return FeedServer()
+
+
+def test_fresh_feed_is_served_from_memory(server):
+    cache = FeedCache(ttl=300)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+            first = await cache.get(client, FEED_URL)
+            second = await cache.get(client, FEED_URL)
+            return first, second
+
+    first, second = asyncio.run(run())
+
+    assert len(server.requests) == 1
+    assert second.content is first.content
+    stats = cache.stats()
+    assert (stats.misses, stats.hits, stats.entries) == (1, 1, 1)
+
+
+def test_stale_feed_is_revalidated(server):
+    cache = FeedCache(ttl=0)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+            first = await cache.get(client, FEED_URL)
+            second = await cache.get(client, FEED_URL)
+            return first, second
+
+    first, second = asyncio.run(run())
+
+    assert len(server.requests) == 2
+    assert server.requests[1].headers["If-None-Match"] == ETAG
+    assert second.content is first.content
+    assert cache.stats().revalidations == 1
+
+
+def test_concurrent_requests_share_one_download(server):
+    cache = FeedCache(ttl=300)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+            return await asyncio.gather(
+                *(cache.get(client, FEED_URL) for _ in range(5))
+            )
+
+    feeds = asyncio.run(run())
+
+    assert len(server.requests) == 1
+    assert all(feed.content is feeds[0].content for feed in feeds)
+    assert cache.stats().shared == 4
+
+
+def test_disk_copy_survives_restart(server, tmp_path):
+    async def run(cache: FeedCache):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+            return await cache.get(client, FEED_URL)
+
+    asyncio.run(run(FeedCache(ttl=300, cache_dir=tmp_path)))
+    restarted = FeedCache(ttl=300, cache_dir=tmp_path)
+    feed = asyncio.run(run(restarted))
+
+    assert len(server.requests) == 1
+    assert feed.etag == ETAG
+    assert feed.content == ICS_FEED.encode()
+    assert restarted.stats().hits == 1
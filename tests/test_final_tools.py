@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.agent.model.graph_state import GraphState
+from src.agent.model.steps import Steps
+from tests.fake_chat_model import FakeChatModel
+from tests.fake_workflow import REPLY, build_workflow
+
+logger = logging.getLogger(__name__)
+
+TOMORROW = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0) + (
+    timedelta(days=1)
+)
+
+
+def search_tomorrow(final: bool):
+    def decide(prompt: str) -> dict:
+        if "All events scheduled between" in prompt:
+            return {"tool": "generate_response", "reason": "The events are known"}
+        return {
+            "tool": "search_calendars",
+            "search_calendars": {
+                "start_time": TOMORROW.isoformat(),
+                "end_time": (TOMORROW + timedelta(days=1)).isoformat(),
+            },
+            "final": final,
+            "reason": "The user asks for their meetings",
+        }
+
+    return decide
+
+
+@pytest.mark.parametrize("final", [False, True])
+def test_final_tool_results_are_answered_without_deciding_again(monkeypatch, final):
+    tool_evaluator = FakeChatModel(reply=search_tomorrow(final))
+    response_generator = FakeChatModel(reply=REPLY)
+    workflow = build_workflow(monkeypatch, tool_evaluator, response_generator)
+
+    async def run():
+        config: RunnableConfig = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        state = GraphState(input=[HumanMessage(content="What's on tomorrow?")], top_k=5)
+        return await workflow.compiled_graph.ainvoke(state.model_dump(), config)
+
+    result = asyncio.run(run())
+
+    steps = [Steps.search_calendars, Steps.generate_response]
+    if not final:
+        steps.insert(1, Steps.evaluate_tools)
+    assert result["step_history"][-len(steps) - 2 : -1] == [
+        Steps.evaluate_tools,
+        *steps,
+    ]
+    assert len(tool_evaluator.calls) == (1 if final else 2)
+    # The response is generated from the events either way
+    assert "All events scheduled between" in response_generator.calls[0]
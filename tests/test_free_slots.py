@@ -0,0 +1,91 @@
+import logging
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import icalendar
+
+from src.calendar_manager.model.compact_event import CompactEvent
+from src.calendar_manager.model.find_free_slots import FindFreeSlots
+from src.calendar_manager.service.compact_events import compact_event
+from src.calendar_manager.service.free_busy import find_free_slots, merge_busy
+
+logger = logging.getLogger(__name__)
+
+ZONE = ZoneInfo("America/Sao_Paulo")
+# A Thursday
+THURSDAY = datetime(2030, 1, 10, tzinfo=ZONE)
+
+
+def event(
+    start: datetime | date,
+    end: datetime | date,
+    transparent: bool = False,
+) -> CompactEvent:
+    component = icalendar.Event()
+    component.add("DTSTART", start)
+    component.add("DTEND", end)
+    if transparent:
+        component.add("TRANSP", "TRANSPARENT")
+    return compact_event(component)
+
+
+def at(hour: int, minute: int = 0, days: int = 0) -> datetime:
+    return THURSDAY + timedelta(days=days, hours=hour, minutes=minute)
+
+
+def slots(free_busy) -> list[tuple[datetime, datetime]]:
+    return [(slot.start, slot.end) for slot in free_busy.free_slots]
+
+
+def test_overlapping_and_adjacent_intervals_are_merged():
+    assert merge_busy([(5, 7), (1, 3), (2, 4), (4, 5), (9, 10)]) == [(1, 7), (9, 10)]
+    assert merge_busy([]) == []
+
+
+def test_free_slots_are_found_across_calendars():
+    events = {
+        "work": [event(at(9), at(10)), event(at(13), at(14, 30))],
+        "home": [
+            event(at(9, 30), at(11)),
+            event(at(11, 30), at(11, 45)),
+            # Marked as free, does not block time
+            event(at(15), at(17), transparent=True),
+        ],
+    }
+    payload = FindFreeSlots(
+        start_time=at(0),
+        end_time=at(0, days=1),
+        duration_minutes=60,
+        timezone="America/Sao_Paulo",
+    )
+
+    free_busy = find_free_slots(events, payload)
+
+    assert slots(free_busy) == [(at(11, 45), at(13)), (at(14, 30), at(18))]
+    assert [(block.start, block.end) for block in free_busy.busy] == [
+        (at(9), at(11)),
+        (at(11, 30), at(11, 45)),
+        (at(13), at(14, 30)),
+    ]
+
+
+def test_working_hours_weekends_and_limits_are_applied():
+    events = {
+        # All-day event blocks the whole Friday
+        "home": [event(at(0, days=1).date(), at(0, days=2).date())],
+    }
+    payload = FindFreeSlots(
+        start_time=at(12),
+        end_time=at(12, days=5),
+        duration_minutes=30,
+        timezone="America/Sao_Paulo",
+        work_day_start=time(8),
+        work_day_end=time(12, 30),
+        max_slots=1,
+    )
+
+    free_busy = find_free_slots(events, payload)
+
+    # Thursday starts after the request, Friday is busy, the weekend is skipped
+    assert slots(free_busy) == [(at(12), at(12, 30))]
+    assert free_busy.omitted_slots == 2
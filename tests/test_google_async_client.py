@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+import rsa
+from google.auth import crypt
+
+from src.calendar_manager import CalendarManager
+from src.calendar_manager.model import DeleteEvent, UpdateEvent
+from src.calendar_manager.model.create_google_event import (
+    CreateGoogleCalendarEvent,
+    GoogleCalendarEventDateTime,
+)
+from src.calendar_manager.model.update_google_event import UpdateGoogleCalendarEvent
+from src.calendar_manager.service.google_async import (
+    GOOGLE_CALENDAR_SCOPES,
+    AsyncGoogleCalendarClient,
+    GoogleServiceAccountToken,
+)
+from src.config import env
+from tests.fake_google_calendar import TOKEN_URI, FakeGoogleCalendar
+
+logger = logging.getLogger(__name__)
+
+TOMORROW = datetime.now(UTC).replace(
+    hour=9, minute=0, second=0, microsecond=0
+) + timedelta(days=1)
+PUBLIC_KEY, PRIVATE_KEY = rsa.newkeys(1024)
+
+
+def event_time(value: datetime) -> dict[str, str]:
+    return {"dateTime": value.isoformat(), "timeZone": "UTC"}
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGoogleCalendar(public_key=PUBLIC_KEY.save_pkcs1())
+    for day in range(3):
+        start = TOMORROW + timedelta(days=day)
+        fake.put(
+            {
+                "id": f"standup{day}",
+                "summary": "Standup",
+                "start": event_time(start),
+                "end": event_time(start + timedelta(minutes=15)),
+            }
+        )
+    return fake
+
+
+def make_client(fake: FakeGoogleCalendar) -> AsyncGoogleCalendarClient:
+    token = GoogleServiceAccountToken(
+        crypt.RSASigner.from_string(PRIVATE_KEY.save_pkcs1()),
+        "lis@project.iam.gserviceaccount.com",
+        TOKEN_URI,
+        GOOGLE_CALENDAR_SCOPES,
+    )
+    return AsyncGoogleCalendarClient(
+        token, httpx.AsyncClient(transport=fake.transport())
+    )
+
+
+def test_modifications_go_through_the_async_client(fake):
+    calendar_manager = CalendarManager(
+        calendars={}, client=object(), async_client=make_client(fake)
+    )
+    start = TOMORROW + timedelta(hours=5)
+
+    async def run():
+        created = await calendar_manager.acreate_events(
+            [
+                CreateGoogleCalendarEvent(
+                    summary="Dentist",
+                    start=GoogleCalendarEventDateTime(dateTime=start),
+                    end=GoogleCalendarEventDateTime(
+                        dateTime=start + timedelta(hours=1)
+                    ),
+                )
+            ]
+        )
+        updated = await calendar_manager.aupdate_events(
+            [
+                UpdateEvent(
+                    id="standup0@google.com",
+                    data=UpdateGoogleCalendarEvent(summary="Daily sync"),
+                )
+            ]
+        )
+        deleted = await calendar_manager.adelete_events(
+            [DeleteEvent(id="standup1"), DeleteEvent(id="missing")]
+        )
+        await calendar_manager.aclose()
+        return created, updated, deleted
+
+    created, updated, deleted = asyncio.run(run())
+
+    assert created[0].ok and fake.events[created[0].event_id]["summary"] == "Dentist"
+    assert updated[0].event_id == "standup0"
+    assert fake.events["standup0"]["summary"] == "Daily sync"
+    assert [result.event_id for result in deleted] == ["standup1", "missing"]
+    assert deleted[0].ok and fake.events["standup1"]["status"] == "cancelled"
+    assert "404" in deleted[1].error
+    # One access token for every call
+    assert fake.token_grants == 1
+
+
+def test_access_tokens_are_shared_and_refreshed(fake, monkeypatch):
+    monkeypatch.setattr(env, "CALENDAR_API_CONCURRENCY", 2)
+    client = make_client(fake)
+    summary = UpdateGoogleCalendarEvent(summary="Standup")
+
+    async def run():
+        await asyncio.gather(
+            *(
+                client.patch_event(env.CALENDAR_ID, f"standup{day}", {})
+                for day in range(3)
+            )
+        )
+        # Google revokes the token before it expires, the call is retried once
+        fake.revoke_access_token()
+        event = await client.patch_event(
+            env.CALENDAR_ID, "standup2", summary.model_dump(exclude_unset=True)
+        )
+        await client.aclose()
+        return event
+
+    event = asyncio.run(run())
+
+    assert event["summary"] == "Standup"
+    assert fake.token_grants == 2
+    assert client.token.refreshes == 2
+
+
+def test_expired_access_tokens_are_refreshed_before_use(fake):
+    # Shorter than the expiry margin, every call needs a new token
+    fake.token_lifetime = 30
+    client = make_client(fake)
+
+    async def run():
+        for day in range(2):
+            await client.delete_event(env.CALENDAR_ID, f"standup{day}")
+        await client.aclose()
+
+    asyncio.run(run())
+
+    assert fake.token_grants == 2
+    # No request was rejected
+    assert fake.round_trips == 4
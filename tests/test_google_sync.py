@@ -0,0 +1,139 @@
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import recurring_ical_events
+
+from src.calendar_manager import CalendarManager
+from src.calendar_manager.model.retrieve_events import RetrieveEvents
+from src.calendar_manager.service.google_sync import GoogleCalendarSync
+from tests.fake_google_calendar import FakeGoogleCalendar
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_ID = "team@group.calendar.google.com"
+TODAY = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def event_time(value: datetime) -> dict[str, str]:
+    return {"dateTime": value.isoformat(), "timeZone": "UTC"}
+
+
+def timed_event(event_id: str, summary: str, start: datetime) -> dict:
+    return {
+        "id": event_id,
+        "summary": summary,
+        "start": event_time(start),
+        "end": event_time(start + timedelta(hours=1)),
+    }
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGoogleCalendar(page_size=2)
+    fake.put(timed_event("dentist", "Dentist", TODAY + timedelta(days=1, hours=14)))
+    fake.put(timed_event("lunch", "Lunch", TODAY + timedelta(days=2, hours=12)))
+    fake.put(timed_event("gym", "Gym", TODAY + timedelta(days=3, hours=7)))
+    return fake
+
+
+def list_requests(fake: FakeGoogleCalendar) -> int:
+    return sum(1 for _, path in fake.requests if path.endswith("/events"))
+
+
+def test_first_sync_lists_every_page(fake):
+    google_sync = GoogleCalendarSync(fake.client(), CALENDAR_ID)
+
+    assert google_sync.sync() == 3
+    assert list_requests(fake) == 2
+    assert set(google_sync.events) == {"dentist", "lunch", "gym"}
+    assert google_sync.sync_token is not None
+
+
+def test_incremental_sync_applies_only_changes(fake):
+    google_sync = GoogleCalendarSync(fake.client(), CALENDAR_ID)
+    google_sync.sync()
+
+    fake.put({**fake.events["lunch"], "summary": "Team lunch"})
+    fake.cancel("gym")
+
+    assert google_sync.sync() == 2
+    assert set(google_sync.events) == {"dentist", "lunch"}
+    assert google_sync.events["lunch"]["summary"] == "Team lunch"
+
+    assert google_sync.sync() == 0
+
+
+def test_expired_sync_token_triggers_full_resync(fake):
+    google_sync = GoogleCalendarSync(fake.client(), CALENDAR_ID)
+    google_sync.sync()
+
+    fake.cancel("dentist")
+    fake.expire_sync_tokens()
+
+    assert google_sync.sync() == 2
+    assert set(google_sync.events) == {"lunch", "gym"}
+
+
+def test_recurring_series_with_exceptions_are_expanded(fake):
+    first = TODAY + timedelta(days=1, hours=9)
+    fake.put(
+        {
+            **timed_event("standup", "Standup", first),
+            "recurrence": ["RRULE:FREQ=DAILY;COUNT=5"],
+        }
+    )
+    fake.put(
+        {
+            "id": "standup_2",
+            "recurringEventId": "standup",
+            "status": "cancelled",
+            "originalStartTime": event_time(first + timedelta(days=1)),
+        }
+    )
+    fake.put(
+        {
+            **timed_event(
+                "standup_3", "Late standup", first + timedelta(days=2, hours=1)
+            ),
+            "recurringEventId": "standup",
+            "originalStartTime": event_time(first + timedelta(days=2)),
+        }
+    )
+    google_sync = GoogleCalendarSync(fake.client(), CALENDAR_ID)
+
+    calendar = google_sync.calendar(max_age=60)
+    occurrences = recurring_ical_events.of(calendar).between(
+        TODAY, TODAY + timedelta(days=10)
+    )
+
+    standups = sorted(
+        (e.start, str(e["SUMMARY"]))
+        for e in occurrences
+        if str(e["UID"]) == "standup@google.com"
+    )
+    assert standups == [
+        (first, "Standup"),
+        (first + timedelta(days=2, hours=1), "Late standup"),
+        (first + timedelta(days=3), "Standup"),
+        (first + timedelta(days=4), "Standup"),
+    ]
+    # Unchanged mirrors are not rebuilt
+    assert google_sync.calendar(max_age=60) is calendar
+
+
+def test_google_calendars_are_searched_through_the_mirror(fake):
+    calendar_manager = CalendarManager(
+        calendars={"team": f"google://{CALENDAR_ID}"}, client=fake.client()
+    )
+    payload = RetrieveEvents(start_time=TODAY, end_time=TODAY + timedelta(days=7))
+
+    result = asyncio.run(calendar_manager.aretrieve_events(payload))
+
+    assert result.errors == {}
+    assert sorted(e.summary for e in result.events["team"]) == [
+        "Dentist",
+        "Gym",
+        "Lunch",
+    ]
@@ -0,0 +1,112 @@
+import logging
+from datetime import UTC, datetime, timedelta
+
+import icalendar
+
+from src.calendar_manager.service.ics_stream import (
+    IcsStreamParser,
+    iter_ics_components,
+    parse_ics_stream,
+)
+
+logger = logging.getLogger(__name__)
+
+MONDAY = datetime(2030, 1, 7, tzinfo=UTC)
+
+ICS_FEED = """BEGIN:VCALENDAR\r
+VERSION:2.0\r
+PRODID:-//Lis//Tests//EN\r
+X-WR-CALNAME:Équipe\r
+BEGIN:VTIMEZONE\r
+TZID:America/Sao_Paulo\r
+BEGIN:STANDARD\r
+DTSTART:19700101T000000\r
+TZOFFSETFROM:-0300\r
+TZOFFSETTO:-0300\r
+END:STANDARD\r
+END:VTIMEZONE\r
+BEGIN:VEVENT\r
+UID:standup@lis\r
+DTSTART;TZID=America/Sao_Paulo:20291201T090000\r
+DTEND;TZID=America/Sao_Paulo:20291201T091500\r
+RRULE:FREQ=DAILY\r
+SUMMARY:Daily standup with a summary long enough to be folded by the se\r
+ rver, ça va\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:standup@lis\r
+RECURRENCE-ID;TZID=America/Sao_Paulo:20300108T090000\r
+DTSTART;TZID=America/Sao_Paulo:20300301T100000\r
+DTEND;TZID=America/Sao_Paulo:20300301T101500\r
+SUMMARY:Moved standup\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:dentist@lis\r
+DTSTART:20300108T140000Z\r
+DURATION:PT1H\r
+SUMMARY:Dentist\r
+BEGIN:VALARM\r
+ACTION:DISPLAY\r
+TRIGGER:-PT10M\r
+END:VALARM\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:holiday@lis\r
+DTSTART;VALUE=DATE:20300106\r
+SUMMARY:Holiday\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:trip@lis\r
+DTSTART:20300601T080000Z\r
+DTEND:20300610T080000Z\r
+SUMMARY:Trip\r
+END:VEVENT\r
+END:VCALENDAR\r
+"""
+
+
+def chunks(size: int) -> list[bytes]:
+    data = ICS_FEED.encode("utf-8")
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def test_stream_matches_the_full_parser_for_any_chunk_size():
+    expected = icalendar.Calendar.from_ical(ICS_FEED).to_ical()
+
+    for size in (1, 3, 64, 100_000):
+        assert parse_ics_stream(chunks(size)).to_ical() == expected
+
+
+def test_components_are_yielded_one_by_one():
+    parser = IcsStreamParser()
+    data = ICS_FEED.encode("utf-8")
+    # A line is complete once the next one starts, it could be folded
+    end_of_first_event = data.index(b"END:VEVENT") + len(b"END:VEVENT\r\nB")
+
+    first = parser.feed(data[:end_of_first_event])
+    rest = parser.feed(data[end_of_first_event:]) + parser.close()
+
+    assert [c.name for c in first] == ["VTIMEZONE", "VEVENT"]
+    assert [str(c["UID"]) for c in rest] == [
+        "standup@lis",
+        "dentist@lis",
+        "holiday@lis",
+        "trip@lis",
+    ]
+
+
+def test_events_outside_the_window_are_dropped_before_parsing():
+    components = list(
+        iter_ics_components(chunks(50), MONDAY, MONDAY + timedelta(days=5))
+    )
+
+    kept = [
+        (str(c["UID"]), "RECURRENCE-ID" in c) for c in components if c.name == "VEVENT"
+    ]
+    # The series and its override are kept, the trip is months away
+    assert kept == [
+        ("standup@lis", False),
+        ("standup@lis", True),
+        ("dentist@lis", False),
+        ("holiday@lis", False),
+    ]
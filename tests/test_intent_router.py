@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.agent.model.graph_state import GraphState
+from src.agent.model.steps import Steps
+from src.config import env
+from src.intent_router import IntentRouter
+from src.intent_router.model import Intent
+from tests.fake_chat_model import FakeChatModel
+from tests.fake_workflow import REPLY, build_workflow
+
+logger = logging.getLogger(__name__)
+
+PROPOSAL = {
+    "response": "Shall I book the dentist on Friday at 3PM?",
+    "action_payloads": {
+        "create_events": [
+            {
+                "summary": "Dentist",
+                "start": {"dateTime": "2030-05-10T15:00:00"},
+                "end": {"dateTime": "2030-05-10T16:00:00"},
+            }
+        ],
+        "delete_events": None,
+        "update_events": None,
+    },
+    "next_step": "end",
+    "next_step_reason": "Waiting for the confirmation",
+}
+
+
+TOMORROW = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0) + (
+    timedelta(days=1)
+)
+TOMORROW_WINDOW = {
+    "start_time": TOMORROW.isoformat(),
+    "end_time": (TOMORROW + timedelta(days=1)).isoformat(),
+}
+OFFER = {
+    "response": "You have a standup at 9. Shall I look for a free hour for the dentist?",
+    "next_step": "end",
+    "next_step_reason": "Waiting for the answer",
+}
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(env, "INTENT_ROUTER_ENABLED", True)
+    monkeypatch.setattr(env, "TOOL_PREFETCH_ENABLED", False)
+
+
+@pytest.fixture(scope="module")
+def router():
+    return IntentRouter(threshold=0.8, max_words=8)
+
+
+@pytest.mark.parametrize(
+    "text, intent",
+    [
+        ("Hi!", Intent.greeting),
+        ("good morning lis", Intent.greeting),
+        ("Thanks a lot!", Intent.acknowledgement),
+        ("Thank you, that's great", Intent.acknowledgement),
+        ("Yes, book it.", Intent.confirmation),
+        ("yes please go ahead", Intent.confirmation),
+    ],
+)
+def test_short_messages_without_tools_are_routed(router, text, intent):
+    route = router.classify(text)
+    assert route is not None and route.intent == intent
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "What's on my calendar tomorrow?",
+        "yes but make it 4pm",
+        "ok, and am I free on Friday?",
+        "good morning, do I have meetings today?",
+        "Please move every meeting I have on Monday to Tuesday afternoon",
+    ],
+)
+def test_other_messages_are_left_to_the_tool_evaluator(router, text):
+    assert router.classify(text) is None
+
+
+def run_turns(workflow, *texts: str) -> dict:
+    async def run():
+        config: RunnableConfig = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        for text in texts:
+            state = GraphState(input=[HumanMessage(content=text)], top_k=5)
+            result = await workflow.compiled_graph.ainvoke(state.model_dump(), config)
+        return result
+
+    return asyncio.run(run())
+
+
+def test_routed_turns_skip_the_tool_evaluator(monkeypatch):
+    tool_evaluator = FakeChatModel(reply={"tool": "generate_response", "reason": "-"})
+    response_generator = FakeChatModel(reply=REPLY)
+    workflow = build_workflow(monkeypatch, tool_evaluator, response_generator)
+
+    result = run_turns(workflow, "Thanks!")
+
+    assert tool_evaluator.calls == []
+    assert len(response_generator.calls) == 1
+    assert result["step_history"][-3:] == [
+        Steps.evaluate_tools,
+        Steps.generate_response,
+        Steps.summarize,
+    ]
+
+
+def test_confirmations_are_routed_only_after_a_proposed_change(monkeypatch):
+    tool_evaluator = FakeChatModel(reply={"tool": "generate_response", "reason": "-"})
+    workflow = build_workflow(monkeypatch, tool_evaluator, FakeChatModel(reply=REPLY))
+    # Nothing was proposed yet
+    run_turns(workflow, "yes, book it")
+    assert len(tool_evaluator.calls) == 1
+
+    messages = [AIMessage(content=[PROPOSAL]), HumanMessage(content="yes, book it")]
+    assert workflow._proposes_changes(messages)
+    assert (
+        workflow._route_intent(
+            GraphState(input=messages[-1:], messages=messages, top_k=5)
+        ).tool
+        == "generate_response"
+    )
+
+
+def test_routes_are_only_logged_by_default(monkeypatch):
+    monkeypatch.setattr(env, "INTENT_ROUTER_ENABLED", False)
+    monkeypatch.setattr(env, "INTENT_ROUTER_LOG_ONLY", True)
+    tool_evaluator = FakeChatModel(reply={"tool": "generate_response", "reason": "-"})
+    workflow = build_workflow(monkeypatch, tool_evaluator, FakeChatModel(reply=REPLY))
+    routes = []
+    monkeypatch.setattr(
+        workflow,
+        "_route_intent",
+        lambda state, route=workflow._route_intent: routes.append(route(state)),
+    )
+
+    run_turns(workflow, "Thanks!")
+
+    assert [route.tool for route in routes] == ["generate_response"]
+    assert len(tool_evaluator.calls) == 1
+
+
+def test_acknowledging_an_offer_keeps_the_tool_it_needs(monkeypatch):
+    decisions = iter(
+        [
+            {
+                "tool": "search_calendars",
+                "search_calendars": TOMORROW_WINDOW,
+                "final": True,
+                "reason": "The user asks for tomorrow",
+            },
+            {
+                "tool": "find_free_slots",
+                "find_free_slots": {**TOMORROW_WINDOW, "duration_minutes": 60},
+                "final": True,
+                "reason": "The user accepted the offer",
+            },
+        ]
+    )
+    tool_evaluator = FakeChatModel(reply=lambda prompt: next(decisions))
+    responses = iter([OFFER, REPLY])
+    workflow = build_workflow(
+        monkeypatch, tool_evaluator, FakeChatModel(reply=lambda prompt: next(responses))
+    )
+
+    result = run_turns(workflow, "What's on tomorrow?", "ok")
+
+    # "ok" answers the offer, the evaluator still decides and finds the slots
+    assert len(tool_evaluator.calls) == 2
+    assert Steps.find_free_slots in result["step_history"]
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+import uuid
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.agent.model.graph_state import GraphState
+from src.agent.model.steps import Steps
+from src.calendar_manager import CalendarManager
+from src.calendar_manager.model.calendar_mutation_result import (
+    CalendarMutationResult,
+)
+from src.calendar_manager.model.calendar_preflight_problem import (
+    CalendarPreflightProblem,
+)
+from src.config import env
+from tests.fake_chat_model import FakeChatModel
+from tests.fake_workflow import REPLY, build_workflow
+
+logger = logging.getLogger(__name__)
+
+
+def booking(summary: str) -> dict:
+    return {
+        "summary": summary,
+        "start": {"dateTime": "2030-05-10T15:00:00"},
+        "end": {"dateTime": "2030-05-10T16:00:00"},
+    }
+
+
+BOOK = {
+    "response": "Done, both are booked.",
+    "action_payloads": {
+        "create_events": [booking("Dentist"), booking("Gym")],
+        "delete_events": None,
+        "update_events": None,
+    },
+    "next_step": "modify_calendar",
+    "next_step_reason": "The user confirmed",
+}
+
+
+class PartlyFailingCalendarManager(CalendarManager):
+    def __init__(self) -> None:
+        super().__init__(calendars={}, client=object())
+
+    async def acreate_events(self, events_data, event_ids=None):
+        return [
+            CalendarMutationResult(
+                action="create", event_id="dentist", event={"id": "dentist"}
+            ),
+            CalendarMutationResult(
+                action="create", error="Rate limit exceeded", status_code=429
+            ),
+        ]
+
+
+CANCEL = {
+    "response": "Done, the meeting is cancelled.",
+    "action_payloads": {
+        "create_events": None,
+        "delete_events": [{"id": "standup"}],
+        "update_events": None,
+    },
+    "next_step": "modify_calendar",
+    "next_step_reason": "The user confirmed",
+}
+
+
+class UnknownEventCalendarManager(CalendarManager):
+    def __init__(self) -> None:
+        super().__init__(calendars={}, client=object())
+        self.deleted = []
+
+    def preflight(self, create_events, update_events, delete_events):
+        return [
+            CalendarPreflightProblem(
+                action="delete",
+                index=0,
+                kind="unknown_event",
+                event_id=event.id,
+                message=f"There is no event with ID '{event.id}' in the calendar.",
+            )
+            for event in delete_events
+        ]
+
+    async def adelete_events(self, events):
+        self.deleted.extend(events)
+        return []
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(env, "CALENDAR_PREFLIGHT_ENABLED", False)
+    monkeypatch.setattr(env, "INTENT_ROUTER_ENABLED", False)
+    monkeypatch.setattr(env, "TOOL_PREFETCH_ENABLED", False)
+
+
+def run_turn(workflow, text: str) -> dict:
+    async def run():
+        config: RunnableConfig = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        state = GraphState(input=[HumanMessage(content=text)], top_k=5, max_retries=1)
+        return await workflow.compiled_graph.ainvoke(state.model_dump(), config)
+
+    return asyncio.run(run())
+
+
+def test_failed_items_reach_the_error_handler(monkeypatch):
+    tool_evaluator = FakeChatModel(reply={"tool": "generate_response", "reason": "-"})
+    response_generator = FakeChatModel(
+        reply=lambda prompt: REPLY if "Rate limit exceeded" in prompt else BOOK
+    )
+    workflow = build_workflow(
+        monkeypatch,
+        tool_evaluator,
+        response_generator,
+        calendar_manager=PartlyFailingCalendarManager(),
+    )
+
+    result = run_turn(workflow, "Yes, book both.")
+
+    steps = result["step_history"]
+    assert steps[steps.index(Steps.modify_calendar) + 1] == Steps.error_handler
+    assert "create of 'a new event': Rate limit exceeded" in result["error"]
+    # The retry sees which creation succeeded, so it is not made again
+    assert "Rate limit exceeded" in tool_evaluator.calls[-1]
+    assert "event_id='dentist'" in tool_evaluator.calls[-1]
+
+
+def test_refused_modifications_are_planned_again(monkeypatch):
+    monkeypatch.setattr(env, "CALENDAR_PREFLIGHT_ENABLED", True)
+    tool_evaluator = FakeChatModel(reply={"tool": "generate_response", "reason": "-"})
+    response_generator = FakeChatModel(
+        reply=lambda prompt: REPLY if "unknown_event" in prompt else CANCEL
+    )
+    calendar_manager = UnknownEventCalendarManager()
+    workflow = build_workflow(
+        monkeypatch,
+        tool_evaluator,
+        response_generator,
+        calendar_manager=calendar_manager,
+    )
+
+    result = run_turn(workflow, "Yes, cancel it.")
+
+    steps = result["step_history"]
+    assert steps[steps.index(Steps.modify_calendar) + 1] == Steps.error_handler
+    assert calendar_manager.deleted == []
+    # The evaluator and the response see the structured problems
+    assert "There is no event with ID 'standup'" in tool_evaluator.calls[-1]
+    assert "unknown_event" in response_generator.calls[-1]
+    assert result["response"].content[0]["response"] == REPLY["response"]
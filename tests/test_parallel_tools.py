@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from langchain_core.documents import Document
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.agent.model.graph_state import GraphState
+from src.agent.model.steps import Steps
+from src.calendar_manager import CalendarManager
+from src.calendar_manager.model import CalendarSearchResult
+from tests.fake_chat_model import FakeChatModel
+from tests.fake_workflow import build_workflow
+
+logger = logging.getLogger(__name__)
+
+LATENCY = 0.3
+TOMORROW = datetime.now(UTC).replace(hour=0, minute=0, second=0) + timedelta(days=1)
+
+
+class SlowCalendarManager(CalendarManager):
+    def __init__(self, fail: bool = False) -> None:
+        super().__init__(calendars={}, client=object())
+        self.fail = fail
+
+    async def aretrieve_events(self, payload, series_limit=None):
+        await asyncio.sleep(LATENCY)
+        if self.fail:
+            raise RuntimeError("Calendar unavailable")
+        return CalendarSearchResult()
+
+
+class SlowVectorManager:
+    async def aretrieve(self, query, top_k=5, metadata_filter=None):
+        await asyncio.sleep(LATENCY)
+        return [Document(page_content="PTO is 30 days a year.")]
+
+
+def plan(prompt: str) -> dict:
+    if "Knowledge base documents" in prompt:
+        return {"tool": "generate_response", "reason": "Everything is known"}
+    return {
+        "tool": "search_calendars",
+        "tools": ["search_calendars", "rag"],
+        "search_calendars": {
+            "start_time": TOMORROW.isoformat(),
+            "end_time": (TOMORROW + timedelta(days=1)).isoformat(),
+        },
+        "rag_query": "PTO policy",
+        "reason": "Both are needed and independent",
+    }
+
+
+def run_turn(workflow) -> tuple[float, dict]:
+    async def run():
+        config: RunnableConfig = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        state = GraphState(
+            input=[HumanMessage(content="Am I free tomorrow? What about PTO?")],
+            top_k=5,
+            max_retries=1,
+        )
+        started = time.perf_counter()
+        result = await workflow.compiled_graph.ainvoke(state.model_dump(), config)
+        return time.perf_counter() - started, result
+
+    return asyncio.run(run())
+
+
+def test_independent_tools_run_at_the_same_time(monkeypatch):
+    tool_evaluator = FakeChatModel(reply=plan)
+    workflow = build_workflow(
+        monkeypatch,
+        tool_evaluator,
+        calendar_manager=SlowCalendarManager(),
+        vector_manager=SlowVectorManager(),
+    )
+
+    elapsed, result = run_turn(workflow)
+
+    # One decision for both tools, and one with both of their results
+    assert len(tool_evaluator.calls) == 2
+    assert "PTO is 30 days" in tool_evaluator.calls[1]
+    assert "All events scheduled between" in tool_evaluator.calls[1]
+    assert {Steps.run_tools, Steps.search_calendars, Steps.rag} <= set(
+        result["step_history"]
+    )
+    assert elapsed < 2 * LATENCY
+
+
+def test_a_failing_tool_keeps_the_results_of_the_others(monkeypatch):
+    tool_evaluator = FakeChatModel(reply=plan)
+    workflow = build_workflow(
+        monkeypatch,
+        tool_evaluator,
+        calendar_manager=SlowCalendarManager(fail=True),
+        vector_manager=SlowVectorManager(),
+    )
+
+    _, result = run_turn(workflow)
+
+    assert Steps.error_handler in result["step_history"]
+    assert "Calendar unavailable" in tool_evaluator.calls[1]
+    assert "PTO is 30 days" in tool_evaluator.calls[1]
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+
+from src.calendar_manager import CalendarManager
+from src.calendar_manager.model.retrieve_events import RetrieveEvents
+from src.config import env
+
+logger = logging.getLogger(__name__)
+
+ICS_FEED = """BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//Lis//Tests//EN
+BEGIN:VEVENT
+UID:standup@lis
+DTSTAMP:20250101T000000Z
+DTSTART:20250106T090000Z
+DTEND:20250106T091500Z
+RRULE:FREQ=DAILY;COUNT=10
+SUMMARY:Standup
+END:VEVENT
+BEGIN:VEVENT
+UID:dentist@lis
+DTSTAMP:20250101T000000Z
+DTSTART:20250108T140000Z
+DTEND:20250108T150000Z
+SUMMARY:Dentist
+END:VEVENT
+END:VCALENDAR
+"""
+
+FEED_DELAY = 0.3
+
+
+async def handler(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(FEED_DELAY)
+    if request.url.host == "broken.example.com":
+        return httpx.Response(500)
+    if request.url.host == "slow.example.com":
+        await asyncio.sleep(60)
+    return httpx.Response(200, text=ICS_FEED)
+
+
+@pytest.fixture(autouse=True)
+def parse_in_threads(monkeypatch):
+    # Timing-sensitive, keep the start-up of worker processes out of it
+    monkeypatch.setattr(env, "CALENDAR_PARSE_WORKERS", 0)
+
+
+@pytest.fixture
+def payload():
+    return RetrieveEvents(
+        start_time=datetime(2025, 1, 6, tzinfo=UTC),
+        end_time=datetime(2025, 1, 9, tzinfo=UTC),
+    )
+
+
+def make_calendar_manager(calendars: dict[str, str]) -> CalendarManager:
+    return CalendarManager(
+        calendars=calendars,
+        client=object(),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+def test_feeds_are_fetched_concurrently(payload, monkeypatch):
+    monkeypatch.setattr(env, "CALENDAR_FETCH_CONCURRENCY", 5)
+    calendars = {
+        f"calendar-{i}": f"https://feed{i}.example.com/basic.ics" for i in range(5)
+    }
+    calendar_manager = make_calendar_manager(calendars)
+
+    started = time.perf_counter()
+    result = asyncio.run(calendar_manager.aretrieve_events(payload))
+    elapsed = time.perf_counter() - started
+
+    logger.info(f"Fetched {len(calendars)} feeds in {elapsed:.2f}s")
+    assert result.errors == {}
+    assert set(result.events) == set(calendars)
+    for events in result.events.values():
+        # 3 standups + 1 dentist appointment within the window
+        assert len(events) == 4
+    assert elapsed < FEED_DELAY * len(calendars) / 2
+
+
+def test_concurrency_cap_is_respected(payload, monkeypatch):
+    monkeypatch.setattr(env, "CALENDAR_FETCH_CONCURRENCY", 1)
+    calendars = {
+        f"calendar-{i}": f"https://feed{i}.example.com/basic.ics" for i in range(3)
+    }
+    calendar_manager = make_calendar_manager(calendars)
+
+    started = time.perf_counter()
+    result = asyncio.run(calendar_manager.aretrieve_events(payload))
+    elapsed = time.perf_counter() - started
+
+    assert len(result.events) == 3
+    assert elapsed >= FEED_DELAY * len(calendars)
+
+
+def test_failing_feeds_return_partial_results(payload, monkeypatch):
+    monkeypatch.setattr(env, "CALENDAR_FETCH_TIMEOUT", FEED_DELAY * 3)
+    calendar_manager = make_calendar_manager(
+        {
+            "healthy": "https://feed.example.com/basic.ics",
+            "broken": "https://broken.example.com/basic.ics",
+            "slow": "https://slow.example.com/basic.ics",
+        }
+    )
+
+    result = asyncio.run(calendar_manager.aretrieve_events(payload))
+
+    logger.info(f"Errors by calendar: {result.errors}")
+    assert list(result.events) == ["healthy"]
+    assert set(result.errors) == {"broken", "slow"}
+    assert "Timed out" in result.errors["slow"]
+
+
+@pytest.mark.parametrize("max_occurrences, truncated", [(4, False), (3, True)])
+def test_calendars_are_truncated_only_past_the_limit(
+    payload, monkeypatch, max_occurrences, truncated
+):
+    # Three standups and the dentist fall within the window
+    monkeypatch.setattr(env, "CALENDAR_MAX_OCCURRENCES", max_occurrences)
+    calendar_manager = make_calendar_manager({"work": "https://feed.example.com/a.ics"})
+
+    result = asyncio.run(calendar_manager.aretrieve_events(payload))
+
+    assert len(result.events["work"]) == max_occurrences
+    assert result.truncated == (["work"] if truncated else [])
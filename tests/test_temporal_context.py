@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import re
+import uuid
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.agent.model.graph_state import GraphState
+from src.agent.model.steps import Steps
+from src.calendar_manager.service.relative_dates import resolve_relative_dates
+from src.config import env
+from tests.fake_chat_model import FakeChatModel
+from tests.fake_workflow import REPLY, build_workflow
+
+logger = logging.getLogger(__name__)
+
+ZONE = ZoneInfo("America/Sao_Paulo")
+# A Sunday
+NOW = datetime(2026, 10, 18, 14, 3, tzinfo=ZONE)
+
+
+def window(text: str) -> list[tuple[str, str, str]]:
+    return [
+        (
+            r.expression,
+            r.start.isoformat(timespec="minutes"),
+            r.end.isoformat(timespec="minutes"),
+        )
+        for r in resolve_relative_dates(text, NOW)
+    ]
+
+
+def test_relative_dates_are_resolved_in_the_user_time_zone():
+    assert window("Do I have meetings tomorrow?") == [
+        ("tomorrow", "2026-10-19T00:00-03:00", "2026-10-20T00:00-03:00")
+    ]
+    assert window("Am I free next Monday afternoon or on Friday?") == [
+        ("next Monday afternoon", "2026-10-19T12:00-03:00", "2026-10-19T18:00-03:00"),
+        ("Friday", "2026-10-23T00:00-03:00", "2026-10-24T00:00-03:00"),
+    ]
+    assert window("What did I do last Friday and this week?") == [
+        ("last Friday", "2026-10-16T00:00-03:00", "2026-10-17T00:00-03:00"),
+        ("this week", "2026-10-12T00:00-03:00", "2026-10-19T00:00-03:00"),
+    ]
+    assert window("tonight, next weekend, next month, in two days") == [
+        ("tonight", "2026-10-18T18:00-03:00", "2026-10-19T00:00-03:00"),
+        ("next weekend", "2026-10-24T00:00-03:00", "2026-10-26T00:00-03:00"),
+        ("next month", "2026-11-01T00:00-03:00", "2026-12-01T00:00-03:00"),
+        ("in two days", "2026-10-20T00:00-03:00", "2026-10-21T00:00-03:00"),
+    ]
+    assert window("Hello! Can you help me?") == []
+
+
+def decide(prompt: str) -> dict:
+    """
+    Tool evaluator following the prompt: it searches as soon as it knows the window
+    of "tomorrow" and asks for the date otherwise.
+    """
+    if "All events scheduled between" in prompt:
+        return {"tool": "generate_response", "reason": "The events are known"}
+    if resolved := re.search(r'"tomorrow": (\S+) to ([\d:T+-]+)', prompt):
+        start, end = resolved.groups()
+    elif today := re.search(r"Current date and time: \w+, (\d{4}-\d\d-\d\d)", prompt):
+        start = (date.fromisoformat(today.group(1)) + timedelta(days=1)).isoformat()
+        end = (date.fromisoformat(start) + timedelta(days=1)).isoformat()
+    else:
+        return {"tool": "get_current_date", "reason": "Tomorrow depends on today"}
+    return {
+        "tool": "search_calendars",
+        "search_calendars": {"start_time": start, "end_time": end},
+        "reason": "The user asks for their meetings",
+    }
+
+
+@pytest.mark.parametrize("enabled", [False, True])
+def test_temporal_context_saves_the_date_round_trip(monkeypatch, enabled):
+    monkeypatch.setattr(env, "TEMPORAL_CONTEXT_ENABLED", enabled)
+    monkeypatch.setattr(env, "USER_TIMEZONE", "America/Sao_Paulo")
+    tool_evaluator = FakeChatModel(reply=decide)
+    response_generator = FakeChatModel(reply=REPLY)
+    workflow = build_workflow(monkeypatch, tool_evaluator, response_generator)
+
+    async def run():
+        config: RunnableConfig = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        state = GraphState(
+            input=[HumanMessage(content="Do I have meetings tomorrow?")], top_k=5
+        )
+        return await workflow.compiled_graph.ainvoke(state.model_dump(), config)
+
+    result = asyncio.run(run())
+
+    llm_calls = len(tool_evaluator.calls) + len(response_generator.calls)
+    logger.info(f"LLM calls with temporal context {enabled}: {llm_calls}")
+    # Deciding, searching and answering, plus a decision for the date without it
+    assert llm_calls == (3 if enabled else 4)
+    assert (Steps.get_current_date in result["step_history"]) is not enabled
+    tomorrow = datetime.now(ZONE).date() + timedelta(days=1)
+    assert result["tool_payloads"].search_calendars.start_time.date() == tomorrow
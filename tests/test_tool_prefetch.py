@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import re
+import time
+import uuid
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.agent.model.graph_state import GraphState
+from src.calendar_manager import CalendarManager
+from src.calendar_manager.model import CalendarSearchResult, CompactEvent
+from src.config import env
+from tests.fake_chat_model import FakeChatModel
+from tests.fake_workflow import REPLY, build_workflow
+
+logger = logging.getLogger(__name__)
+
+LATENCY = 0.3
+TOMORROW = datetime.now(ZoneInfo("UTC")).replace(
+    hour=0, minute=0, second=0, microsecond=0
+) + timedelta(days=1)
+
+
+class SlowCalendarManager(CalendarManager):
+    def __init__(self) -> None:
+        super().__init__(calendars={}, client=object())
+        self.searches = []
+
+    async def aretrieve_events(self, payload, series_limit=None):
+        self.searches.append(payload)
+        await asyncio.sleep(LATENCY)
+        return CalendarSearchResult(
+            events={
+                "work": [
+                    CompactEvent(
+                        uid=f"{name}@lis",
+                        summary=name,
+                        start=start,
+                        end=start + timedelta(hours=1),
+                    )
+                    for name, start in [
+                        ("Standup", TOMORROW + timedelta(hours=9)),
+                        ("Review", TOMORROW + timedelta(days=2, hours=15)),
+                    ]
+                    if payload.start_time <= start < payload.end_time
+                ]
+            }
+        )
+
+
+def search_tomorrow(prompt: str) -> dict:
+    if "All events scheduled between" in prompt:
+        return {"tool": "generate_response", "reason": "The events are known"}
+    start, end = re.search(r'"tomorrow": (\S+) to ([\d:T+-]+)', prompt).groups()
+    return {
+        "tool": "search_calendars",
+        "search_calendars": {"start_time": start, "end_time": end},
+        "reason": "The user asks for their meetings",
+    }
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    monkeypatch.setattr(env, "USER_TIMEZONE", "UTC")
+    monkeypatch.setattr(env, "TOOL_PREFETCH_DAYS", 7)
+    monkeypatch.setattr(env, "TOOL_PREFETCH_ENABLED", True)
+
+
+def run_turn(workflow, text: str) -> float:
+    async def run():
+        config: RunnableConfig = {"configurable": {"thread_id": str(uuid.uuid4())}}
+        state = GraphState(input=[HumanMessage(content=text)], top_k=5)
+        started = time.perf_counter()
+        await workflow.compiled_graph.ainvoke(state.model_dump(), config)
+        return time.perf_counter() - started
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("enabled", [False, True])
+def test_calendar_search_runs_while_the_next_step_is_decided(monkeypatch, enabled):
+    monkeypatch.setattr(env, "TOOL_PREFETCH_ENABLED", enabled)
+    tool_evaluator = FakeChatModel(reply=search_tomorrow, latency=LATENCY)
+    calendar_manager = SlowCalendarManager()
+    workflow = build_workflow(
+        monkeypatch, tool_evaluator, calendar_manager=calendar_manager
+    )
+
+    elapsed = run_turn(workflow, "Do I have meetings tomorrow?")
+
+    stats = workflow.prefetcher.stats()
+    logger.info(f"Turn with prefetch {enabled}: {elapsed:.2f}s, {stats}")
+    # The week was searched once, then narrowed to tomorrow
+    assert len(calendar_manager.searches) == 1
+    assert "Standup" in tool_evaluator.calls[1]
+    assert "Review" not in tool_evaluator.calls[1]
+    if enabled:
+        assert (stats.started, stats.hits, stats.hit_rate) == (1, 1, 1.0)
+        assert stats.time_saved > LATENCY / 2
+        # Two decisions, the search hidden behind the first one
+        assert elapsed < 3 * LATENCY - LATENCY / 2
+    else:
+        assert stats.started == 0
+        assert elapsed >= 3 * LATENCY
+
+
+def test_prefetch_is_discarded_when_another_tool_is_chosen(monkeypatch):
+    tool_evaluator = FakeChatModel(
+        reply={"tool": "generate_response", "reason": "Asking which calendar"}
+    )
+    calendar_manager = SlowCalendarManager()
+    workflow = build_workflow(
+        monkeypatch,
+        tool_evaluator,
+        FakeChatModel(reply=REPLY),
+        calendar_manager=calendar_manager,
+    )
+
+    run_turn(workflow, "Am I busy next week?")
+
+    stats = workflow.prefetcher.stats()
+    assert (stats.started, stats.hits, stats.misses, stats.hit_rate) == (1, 0, 1, 0.0)
+    assert stats.time_saved == 0
@@ -0,0 +1,186 @@
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+
+from src.calendar_manager import CalendarManager
+from src.calendar_manager.model import DeleteEvent, UpdateEvent
+from src.calendar_manager.model.create_google_event import (
+    CreateGoogleCalendarEvent,
+    GoogleCalendarEventDateTime,
+)
+from src.calendar_manager.model.retrieve_events import RetrieveEvents
+from src.calendar_manager.model.update_google_event import UpdateGoogleCalendarEvent
+from src.calendar_manager.service.calendar_worker import expand_window
+from src.calendar_manager.service.event_store import EventStore
+from src.calendar_manager.service.google_sync import GoogleCalendarSync
+from src.config import env
+from tests.fake_google_calendar import FakeGoogleCalendar
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_ID = "team@group.calendar.google.com"
+FEED_URL = "https://calendar.google.com/calendar/ical/team%40group.calendar.google.com/private-key/basic.ics"
+TODAY = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+WEEK = RetrieveEvents(start_time=TODAY, end_time=TODAY + timedelta(days=7))
+
+
+def event_time(value: datetime) -> dict[str, str]:
+    return {"dateTime": value.isoformat(), "timeZone": "UTC"}
+
+
+def ics_time(value: datetime) -> str:
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def timed_event(event_id: str, summary: str, start: datetime) -> dict:
+    return {
+        "id": event_id,
+        "summary": summary,
+        "start": event_time(start),
+        "end": event_time(start + timedelta(hours=1)),
+    }
+
+
+def dentist() -> CreateGoogleCalendarEvent:
+    start = TODAY + timedelta(days=2, hours=15)
+    return CreateGoogleCalendarEvent(
+        summary="Dentist",
+        start=GoogleCalendarEventDateTime(dateTime=start),
+        end=GoogleCalendarEventDateTime(dateTime=start + timedelta(hours=1)),
+    )
+
+
+@pytest.fixture(autouse=True)
+def write_target(monkeypatch):
+    monkeypatch.setattr(env, "CALENDAR_ID", CALENDAR_ID)
+    # Every read within the test is served from the local copies
+    monkeypatch.setattr(env, "CALENDAR_CACHE_TTL", 3600)
+    monkeypatch.setattr(env, "CALENDAR_PARSE_WORKERS", 0)
+
+
+@pytest.fixture
+def fake():
+    fake = FakeGoogleCalendar()
+    fake.put(timed_event("lunch", "Lunch", TODAY + timedelta(days=1, hours=12)))
+    fake.put(timed_event("gym", "Gym", TODAY + timedelta(days=3, hours=7)))
+    return fake
+
+
+def list_requests(fake: FakeGoogleCalendar) -> int:
+    return sum(1 for method, _ in fake.requests if method == "GET")
+
+
+def modify(calendar_manager: CalendarManager) -> None:
+    calendar_manager.create_events([dentist()])
+    calendar_manager.update_events(
+        [UpdateEvent(id="lunch", data=UpdateGoogleCalendarEvent(summary="Team lunch"))]
+    )
+    calendar_manager.delete_events([DeleteEvent(id="gym")])
+
+
+def summaries_by_calendar(calendar_manager: CalendarManager) -> dict[str, list[str]]:
+    async def run():
+        result = await calendar_manager.aretrieve_events(WEEK)
+        await calendar_manager.aclose()
+        return result
+
+    result = asyncio.run(run())
+    assert not result.errors
+    return {
+        name: sorted(event.summary for event in events)
+        for name, events in result.events.items()
+    }
+
+
+@pytest.mark.parametrize("mirrored", [False, True])
+def test_google_mirror_is_patched_in_place(fake, tmp_path, mirrored):
+    calendar_manager = CalendarManager(
+        calendars={"team": f"google://{CALENDAR_ID}"},
+        client=fake.client(),
+        event_store=EventStore(tmp_path / "mirror.db") if mirrored else None,
+    )
+    if mirrored:
+        asyncio.run(calendar_manager.sync_mirror())
+    assert summaries_by_calendar(calendar_manager) == {"team": ["Gym", "Lunch"]}
+    listed = list_requests(fake)
+
+    modify(calendar_manager)
+
+    assert summaries_by_calendar(calendar_manager) == {
+        "team": ["Dentist", "Team lunch"]
+    }
+    # Neither the mirror nor the index asked Google again
+    assert list_requests(fake) == listed
+    # The next sync confirms the same events
+    google_sync = calendar_manager.google_syncs[CALENDAR_ID]
+    google_sync.sync()
+    assert sorted(e["summary"] for e in google_sync.events.values()) == [
+        "Dentist",
+        "Team lunch",
+    ]
+
+
+def test_ics_feed_index_is_patched_in_place(fake):
+    feed_requests = []
+
+    def serve(request: httpx.Request) -> httpx.Response:
+        feed_requests.append(request)
+        start = TODAY + timedelta(days=3, hours=7)
+        return httpx.Response(
+            200,
+            text=f"""BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+UID:gym@google.com
+DTSTART:{ics_time(start)}
+DTEND:{ics_time(start + timedelta(hours=1))}
+SUMMARY:Gym
+END:VEVENT
+END:VCALENDAR
+""",
+        )
+
+    calendar_manager = CalendarManager(
+        calendars={"team": FEED_URL, "other": "https://example.com/basic.ics"},
+        client=fake.client(),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(serve)),
+    )
+    assert summaries_by_calendar(calendar_manager) == {
+        "team": ["Gym"],
+        "other": ["Gym"],
+    }
+
+    calendar_manager.create_events([dentist()])
+    calendar_manager.delete_events([DeleteEvent(id="gym")])
+
+    # Only the calendar written to changed, and without downloading it again
+    assert summaries_by_calendar(calendar_manager) == {
+        "team": ["Dentist"],
+        "other": ["Gym"],
+    }
+    assert len(feed_requests) == 2
+
+
+def test_deleted_instances_are_excluded_from_their_series(fake):
+    first = TODAY + timedelta(days=1, hours=9)
+    fake.put(
+        {**timed_event("standup", "Standup", first), "recurrence": ["RRULE:FREQ=DAILY"]}
+    )
+    google_sync = GoogleCalendarSync(fake.client(), CALENDAR_ID)
+    google_sync.sync()
+
+    skipped = first + timedelta(days=1)
+    uids = google_sync.apply([], [f"standup_{ics_time(skipped)}"])
+
+    starts = [
+        event.start
+        for event in expand_window(
+            google_sync.ics(3600), first, first + timedelta(days=3)
+        )
+        if event.summary == "Standup"
+    ]
+    assert uids == {"standup@google.com"}
+    assert skipped not in starts and first in starts